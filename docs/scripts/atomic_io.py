@@ -0,0 +1,43 @@
+"""Atomic file replacement, shared by the image and documentation scripts.
+
+Files are written to a temporary sibling, flushed to disk and renamed over
+the target, so readers (and interrupted runs) only ever see the old or the
+new contents, never a partial write.
+
+The scripts are run from their own directories, so they add this directory
+to ``sys.path`` before importing it.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` in a single rename.
+
+    The permissions of an existing file are kept; new files get the default
+    permissions for the current umask.
+
+    Args:
+        path: File to write
+        data: New file contents
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            shutil.copymode(path, tmp_name)
+        else:
+            # mkstemp creates files as 0600; give new files the usual umask-based mode
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_name, 0o666 & ~umask)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
@@ -3,10 +3,22 @@
 This package provides tools for validating documentation:
 1. Reference validation - check links between documents
 2. Health checks - verify required sections and metadata
+3. Link graph - inbound links, orphan pages and clusters of linked pages
+4. External links - opt-in check that http(s) links still resolve
+
+Checkers are registered in ``checkers.CHECKERS``, which the runner reads
+instead of hard-coding them; other packages add checkers through entry points.
+
+All checkers share a single DocumentIndex, so each file is read once per run.
 """
 
+from .document_index import Document, DocumentIndex
+from .external_links import ExternalLinkChecker
 from .health_checker import HealthChecker
+from .link_graph import LinkGraph
 from .ref_validator import RefValidator
+from .report_history import ReportHistory
+from .validation_cache import ValidationCache
 from .validation_types import Severity, ValidationIssue, ValidationResult
 
 __all__ = [
@@ -15,4 +27,10 @@ __all__ = [
     "Severity",
     "RefValidator",
     "HealthChecker",
+    "Document",
+    "DocumentIndex",
+    "ValidationCache",
+    "LinkGraph",
+    "ExternalLinkChecker",
+    "ReportHistory",
 ]
@@ -0,0 +1,230 @@
+"""
+Checker registry.
+
+Every check run by ``validate_docs`` is registered here instead of being
+hard-coded in the runner. A registration declares:
+
+1. The checker's name (the ``checker`` of the issues it reports)
+2. How to create it for a docs root
+3. Which ``Document`` fields it consumes from the shared document index;
+   the index only parses the fields the selected checkers consume
+4. Whether its results depend only on the documents, so they can be cached
+   per document, or also on something else (e.g. the network)
+5. Whether it runs by default
+
+The built-in checkers are registered below. Other packages add checkers
+through the ``doc_validation.checkers`` entry point group, and checkers can
+also be loaded from ``module:attribute`` paths (``--checker-plugin``); both
+name a ``CheckerSpec`` and are registered by ``load_plugins``.
+
+Every checker implements ``validate(index, documents, result)``, adding its
+issues to ``result``. ``run_checker`` calls it and measures what it cost.
+"""
+
+import importlib
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, fields
+from functools import partial
+from importlib.metadata import entry_points
+from typing import Optional
+
+from .document_index import Document, DocumentIndex
+from .external_links import ExternalLinkChecker
+from .health_checker import HealthChecker
+from .ref_validator import RefValidator
+from .validation_types import ValidationResult
+
+# Fields a checker can consume from the document index
+DOCUMENT_FIELDS = frozenset(f.name for f in fields(Document))
+
+# Entry point group other packages register checkers under
+ENTRY_POINT_GROUP = "doc_validation.checkers"
+
+
+@dataclass(frozen=True)
+class CheckerSpec:
+    """Registration of a checker.
+
+    Attributes:
+        name: Checker name, also used for the issues it reports
+        factory: Creates the checker from the docs root
+        consumes: ``Document`` fields the checker reads
+        description: One-line description, used in listings and SARIF rules
+        cacheable: Whether results depend only on the documents, so they can be
+            kept in the validation cache and only changed documents re-checked
+        default: Whether the checker runs when no checkers are selected
+    """
+
+    name: str
+    factory: Callable[[str], object]
+    consumes: frozenset[str]
+    description: str
+    cacheable: bool = True
+    default: bool = True
+
+
+# Registered checkers, in the order they run
+CHECKERS: dict[str, CheckerSpec] = {}
+
+
+def register(spec: CheckerSpec) -> CheckerSpec:
+    """Register a checker.
+
+    Args:
+        spec: Checker registration
+
+    Returns:
+        The registration, unchanged
+
+    Raises:
+        ValueError: If the name is taken or the checker consumes unknown document fields
+    """
+    if spec.name in CHECKERS:
+        raise ValueError(f"Checker '{spec.name}' is already registered")
+    unknown = spec.consumes - DOCUMENT_FIELDS
+    if unknown:
+        raise ValueError(
+            f"Checker '{spec.name}' consumes unknown document fields: {', '.join(sorted(unknown))}"
+        )
+    CHECKERS[spec.name] = spec
+    return spec
+
+
+def load_plugins(paths: Iterable[str] = ()) -> list[CheckerSpec]:
+    """Register the checkers of installed packages and of the given module paths.
+
+    Loading the same registration twice is harmless, so this can be called
+    more than once.
+
+    Args:
+        paths: ``module:attribute`` paths of ``CheckerSpec`` objects
+
+    Returns:
+        Registrations loaded, in the order they were registered
+
+    Raises:
+        ValueError: If a plugin cannot be loaded, is not a ``CheckerSpec``
+            or cannot be registered
+    """
+    plugins = []
+    installed = entry_points()
+    if hasattr(installed, "select"):
+        installed = installed.select(group=ENTRY_POINT_GROUP)
+    else:
+        # Python 3.9 returns a dict of groups
+        installed = installed.get(ENTRY_POINT_GROUP, [])
+    for entry_point in installed:
+        plugins.append((entry_point.value, entry_point.load))
+    for path in paths:
+        plugins.append((path, partial(_import_attribute, path)))
+
+    loaded = []
+    for path, load in plugins:
+        try:
+            spec = load()
+        except (ImportError, AttributeError, ValueError) as e:
+            raise ValueError(f"Could not load checker plugin '{path}': {str(e)}") from e
+        if not isinstance(spec, CheckerSpec):
+            raise ValueError(f"Checker plugin '{path}' is not a CheckerSpec")
+        if CHECKERS.get(spec.name) is not spec:
+            register(spec)
+        loaded.append(spec)
+    return loaded
+
+
+def _import_attribute(path: str) -> object:
+    """Import the object a ``module:attribute`` path names."""
+    module_name, separator, attribute = path.partition(":")
+    if not separator or not module_name or not attribute:
+        raise ValueError("expected 'module:attribute'")
+    obj = importlib.import_module(module_name)
+    for name in attribute.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def consumed_fields(specs: Iterable[CheckerSpec]) -> frozenset[str]:
+    """Return the ``Document`` fields consumed by any of the given checkers."""
+    return frozenset().union(*(spec.consumes for spec in specs))
+
+
+def resolve_checkers(names: Optional[Iterable[str]] = None) -> list[CheckerSpec]:
+    """Look up checkers by name.
+
+    Args:
+        names: Checker names (default: every checker registered as default)
+
+    Returns:
+        Registrations in registry order, which is the order they run in
+
+    Raises:
+        ValueError: If a name is not registered
+    """
+    if names is None:
+        return [spec for spec in CHECKERS.values() if spec.default]
+    selected = set(names)
+    unknown = selected - CHECKERS.keys()
+    if unknown:
+        raise ValueError(
+            f"Unknown checkers: {', '.join(sorted(unknown))} (available: {', '.join(CHECKERS)})"
+        )
+    return [spec for spec in CHECKERS.values() if spec.name in selected]
+
+
+def run_checker(
+    checker: object,
+    index: DocumentIndex,
+    documents: Optional[set[str]],
+    result: ValidationResult,
+) -> dict[str, any]:
+    """Run one checker and measure its cost.
+
+    Args:
+        checker: Checker created by its registration's factory
+        index: Shared document index
+        documents: Relative paths of the documents to check (None for all)
+        result: Result to add issues to
+
+    Returns:
+        Wall and CPU time in seconds, number of files checked and number of
+        issues the checker reported
+    """
+    issues_before = len(result.issues)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    checker.validate(index, documents, result)
+    return {
+        "wall_time": round(time.perf_counter() - wall_start, 6),
+        "cpu_time": round(time.process_time() - cpu_start, 6),
+        "files": len(index) if documents is None else len(documents),
+        "issues": len(result.issues) - issues_before,
+    }
+
+
+register(
+    CheckerSpec(
+        name="health",
+        factory=HealthChecker,
+        consumes=frozenset({"front_matter", "front_matter_error", "error"}),
+        description="Documentation health (readable files, front matter and required metadata)",
+    )
+)
+register(
+    CheckerSpec(
+        name="references",
+        factory=RefValidator,
+        consumes=frozenset({"links", "anchors", "error"}),
+        description="Links between documentation pages, including anchors",
+    )
+)
+register(
+    CheckerSpec(
+        name="external_links",
+        factory=lambda docs_root: ExternalLinkChecker(),
+        consumes=frozenset({"links"}),
+        description="External http(s) links that no longer resolve",
+        cacheable=False,
+        default=False,
+    )
+)
@@ -0,0 +1,379 @@
+"""
+Shared in-memory index of documentation files.
+
+Builds everything the validators need from a single traversal of the docs
+root, reading each markdown file exactly once:
+
+1. Raw bytes and decoded text of every markdown file
+2. Parsed YAML front matter
+3. Headings, their anchor slugs and link targets
+4. The set of all files and directories under the docs root (markdown or not)
+
+Every checker receives the same index, so adding a checker adds no file
+system work. Front matter, headings, anchors and links are only parsed when
+a checker consumes them. Reading and parsing can be spread over worker processes; the
+index is always in path order regardless of the number of workers.
+"""
+
+import os
+import posixpath
+import re
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import cache, partial
+from pathlib import Path, PurePosixPath
+from typing import Optional
+
+import markdown
+import yaml
+
+from .markdown_tokens import FRONT_MATTER_PATTERN, Heading, Link, tokenize
+
+# Footnote references, which the ``toc`` extension leaves out of heading names
+FOOTNOTE_REF_PATTERN = re.compile(r"\[\^[^\]]+\]")
+
+# Extensions that decide heading ids in the mkdocs configuration
+HEADING_EXTENSIONS = ["attr_list", "toc"]
+
+# Document fields filled in by parsing, and the parsing steps that fill them
+FRONT_MATTER_FIELDS = frozenset({"front_matter", "front_matter_error"})
+TOKEN_FIELDS = frozenset({"headings", "anchors", "links"})
+PARSED_FIELDS = FRONT_MATTER_FIELDS | TOKEN_FIELDS
+
+# Documents handed to a worker per task, per worker
+CHUNKS_PER_WORKER = 4
+
+
+@dataclass
+class Document:
+    """A parsed markdown document.
+
+    Attributes:
+        path: Absolute path to the file
+        rel_path: Path relative to the docs root
+        raw: File contents as read from disk
+        text: Decoded file contents
+        front_matter: Parsed YAML front matter (empty if missing or invalid)
+        front_matter_error: Why the front matter could not be parsed, if it couldn't
+        headings: Headings in document order
+        anchors: Fragment identifiers the page defines (heading slugs and explicit ids)
+        links: Links and images in document order, outside code and comments
+        error: Why the file could not be read or decoded, if it couldn't
+        size: File size when it was read
+        mtime_ns: File modification time when it was read
+        cached: Restored from the validation cache without reading the file
+            (``raw`` and ``text`` are empty)
+        formatted: Known to be formatted by ``format_docs`` in its current state
+    """
+
+    path: Path
+    rel_path: str
+    raw: bytes = b""
+    text: str = ""
+    front_matter: dict = field(default_factory=dict)
+    front_matter_error: Optional[str] = None
+    headings: list[Heading] = field(default_factory=list)
+    anchors: set[str] = field(default_factory=set)
+    links: list[Link] = field(default_factory=list)
+    error: Optional[str] = None
+    size: int = 0
+    mtime_ns: int = 0
+    cached: bool = False
+    formatted: bool = False
+
+    @classmethod
+    def parse(
+        cls, path: Path, rel_path: str, raw: bytes, fields: frozenset[str] = PARSED_FIELDS
+    ) -> "Document":
+        """Parse a markdown document from its raw contents.
+
+        Args:
+            path: Absolute path to the file
+            rel_path: Path relative to the docs root
+            raw: File contents
+            fields: Parsed fields to fill in; the others are left empty
+
+        Returns:
+            Parsed document
+        """
+        doc = cls(path=path, rel_path=rel_path, raw=raw)
+        try:
+            doc.text = raw.decode("utf-8")
+        except UnicodeDecodeError as e:
+            doc.error = str(e)
+            return doc
+
+        match = FRONT_MATTER_PATTERN.match(doc.text) if fields & FRONT_MATTER_FIELDS else None
+        if match:
+            try:
+                front_matter = yaml.safe_load(match.group(1))
+            except yaml.YAMLError as e:
+                doc.front_matter_error = str(e)
+            else:
+                if isinstance(front_matter, dict):
+                    doc.front_matter = front_matter
+                elif front_matter is not None:
+                    doc.front_matter_error = "Front matter is not a mapping"
+
+        if not fields & TOKEN_FIELDS:
+            return doc
+        tokens = tokenize(doc.text)
+        doc.headings = tokens.headings
+        doc.links = tokens.links
+        if "anchors" in fields:
+            doc.anchors = set(heading_anchors([heading.title for heading in tokens.headings]))
+            doc.anchors.update(tokens.html_ids)
+        return doc
+
+
+def load_document(
+    docs_root: Path, rel_path: str, fields: frozenset[str] = PARSED_FIELDS
+) -> Document:
+    """Read and parse one markdown file.
+
+    Args:
+        docs_root: Root directory containing documentation files
+        rel_path: Path relative to the docs root
+        fields: Parsed fields to fill in; the others are left empty
+
+    Returns:
+        Parsed document, with ``error`` set if the file could not be read
+    """
+    path = docs_root / rel_path
+    try:
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            raw = f.read()
+    except OSError as e:
+        return Document(path=path, rel_path=rel_path, error=str(e))
+    doc = Document.parse(path, rel_path, raw, fields)
+    doc.size = stat.st_size
+    doc.mtime_ns = stat.st_mtime_ns
+    return doc
+
+
+@cache
+def _heading_renderer() -> markdown.Markdown:
+    """Return the Markdown instance this process renders headings with."""
+    return markdown.Markdown(extensions=HEADING_EXTENSIONS)
+
+
+def heading_anchors(headings: list[str]) -> list[str]:
+    """Compute the anchor of each heading of a page.
+
+    The headings are rendered by Python-Markdown with the ``attr_list`` and
+    ``toc`` extensions, so anchors follow the same rules as the built site:
+    explicit ``{#id}`` attributes win, other headings are slugified from
+    their rendered text and de-duplicated with ``_1``, ``_2``... suffixes.
+
+    Only the heading lines are rendered, so markup that depends on the rest
+    of the page (reference-style links) or on other extensions is slugified
+    as written, and footnote references are dropped.
+
+    Args:
+        headings: Raw heading titles in document order
+
+    Returns:
+        Anchor of each heading, in document order
+    """
+    md = _heading_renderer().reset()
+    md.convert("\n\n".join(f"# {FOOTNOTE_REF_PATTERN.sub('', title)}" for title in headings))
+    return [token["id"] for token in md.toc_tokens]
+
+
+def outside_docs_root(rel_path: str) -> bool:
+    """Return whether a path relative to the docs root points outside of it."""
+    return rel_path == ".." or rel_path.startswith("../") or posixpath.isabs(rel_path)
+
+
+def walk_order(rel_path: str) -> tuple:
+    """Sort key putting paths in the order ``DocumentIndex.build`` walks them.
+
+    Within a directory, files come before subdirectories, each sorted by name.
+    """
+    *directories, name = PurePosixPath(rel_path).parts
+    return (*((1, part) for part in directories), (0, name))
+
+
+class DocumentIndex:
+    """All markdown documents and files under a docs root."""
+
+    def __init__(self, docs_root: Path, fields: Optional[Iterable[str]] = None):
+        """Initialize an empty index.
+
+        Args:
+            docs_root: Root directory containing documentation files
+            fields: Parsed ``Document`` fields documents need (default: all);
+                e.g. anchors, which render every heading, are skipped when no
+                checker consumes them
+        """
+        self.docs_root = docs_root
+        self.fields = PARSED_FIELDS if fields is None else PARSED_FIELDS & frozenset(fields)
+        self.documents: dict[str, Document] = {}
+        self.files: set[str] = set()
+        self.directories: set[str] = set()
+
+    @classmethod
+    def build(
+        cls,
+        docs_root: str,
+        jobs: int = 1,
+        cache=None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> "DocumentIndex":
+        """Walk the docs root once, reading and parsing every markdown file.
+
+        Files whose size and modification time match the validation cache
+        are restored from it instead of being read.
+
+        Args:
+            docs_root: Root directory containing documentation files
+            jobs: Number of worker processes used to read and parse documents
+            cache: Optional ValidationCache to restore unchanged documents from
+                (it must have been loaded for the same fields)
+            fields: Parsed ``Document`` fields documents need (default: all)
+
+        Returns:
+            Populated index
+        """
+        index = cls(Path(docs_root), fields)
+        markdown_files = []
+        for dirpath, dirnames, filenames in os.walk(index.docs_root):
+            dirnames.sort()
+            rel_dir = Path(dirpath).relative_to(index.docs_root)
+            index.directories.add(rel_dir.as_posix())
+            for name in sorted(filenames):
+                rel_path = (rel_dir / name).as_posix()
+                index.files.add(rel_path)
+                if name.endswith(".md"):
+                    markdown_files.append(rel_path)
+
+        documents = {}
+        to_read = []
+        for rel_path in markdown_files:
+            doc = None
+            if cache is not None:
+                try:
+                    doc = cache.restore(index.docs_root / rel_path, rel_path)
+                except OSError:
+                    pass
+            if doc is not None:
+                documents[rel_path] = doc
+            else:
+                to_read.append(rel_path)
+
+        load = partial(load_document, index.docs_root, fields=index.fields)
+        if jobs > 1 and len(to_read) > 1:
+            chunksize = max(1, len(to_read) // (jobs * CHUNKS_PER_WORKER))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                loaded = list(executor.map(load, to_read, chunksize=chunksize))
+        else:
+            loaded = [load(rel_path) for rel_path in to_read]
+        documents.update((doc.rel_path, doc) for doc in loaded)
+
+        index.documents = {rel_path: documents[rel_path] for rel_path in markdown_files}
+        return index
+
+    def load(self, rel_path: str) -> Document:
+        """Read and parse one markdown file into the index.
+
+        Args:
+            rel_path: Path relative to the docs root
+
+        Returns:
+            Parsed document
+        """
+        doc = load_document(self.docs_root, rel_path, self.fields)
+        self.documents[rel_path] = doc
+        self.files.add(rel_path)
+        return doc
+
+    def update(self, rel_path: str, raw: bytes) -> Document:
+        """Replace a document with contents just written to it, without re-reading it.
+
+        Args:
+            rel_path: Path relative to the docs root
+            raw: New file contents
+
+        Returns:
+            Parsed document
+        """
+        doc = Document.parse(self.docs_root / rel_path, rel_path, raw, self.fields)
+        stat = doc.path.stat()
+        doc.size = stat.st_size
+        doc.mtime_ns = stat.st_mtime_ns
+        self.documents[rel_path] = doc
+        self.files.add(rel_path)
+        return doc
+
+    def refresh(self, rel_paths: Iterable[str]) -> set[str]:
+        """Bring the index up to date with paths that changed on disk.
+
+        Changed files are re-read, deleted ones dropped, and directories
+        (created, moved in or out, or deleted) are re-walked as a whole.
+
+        Args:
+            rel_paths: Paths relative to the docs root of files or directories
+                that were created, modified, deleted or moved
+
+        Returns:
+            Relative paths of the markdown documents that were re-read or removed
+        """
+        changed = set()
+        added = False
+        for rel_path in rel_paths:
+            rel_path = PurePosixPath(rel_path).as_posix()
+            path = self.docs_root / rel_path
+
+            # A directory that was deleted, moved or replaced: forget everything in it
+            if rel_path in self.directories:
+                prefix = "" if rel_path == "." else f"{rel_path}/"
+                self.directories = {
+                    d for d in self.directories if d != rel_path and not d.startswith(prefix)
+                }
+                self.files = {f for f in self.files if not f.startswith(prefix)}
+                removed = [d for d in self.documents if d.startswith(prefix)]
+                for doc_path in removed:
+                    del self.documents[doc_path]
+                changed.update(removed)
+
+            if path.is_file():
+                self.files.add(rel_path)
+                if rel_path.endswith(".md"):
+                    # Documents already indexed are replaced in place, keeping their position
+                    added |= rel_path not in self.documents
+                    self.load(rel_path)
+                    changed.add(rel_path)
+            elif path.is_dir():
+                self.files.discard(rel_path)
+                if self.documents.pop(rel_path, None) is not None:
+                    changed.add(rel_path)
+                for dirpath, _, filenames in os.walk(path):
+                    rel_dir = Path(dirpath).relative_to(self.docs_root)
+                    self.directories.add(rel_dir.as_posix())
+                    for name in filenames:
+                        file_path = (rel_dir / name).as_posix()
+                        self.files.add(file_path)
+                        if name.endswith(".md"):
+                            self.load(file_path)
+                            changed.add(file_path)
+                            added = True
+            else:
+                self.files.discard(rel_path)
+                if self.documents.pop(rel_path, None) is not None:
+                    changed.add(rel_path)
+                continue
+            self.directories.update(p.as_posix() for p in PurePosixPath(rel_path).parents)
+
+        if added:
+            self.documents = dict(sorted(self.documents.items(), key=lambda d: walk_order(d[0])))
+        return changed
+
+    def __iter__(self):
+        """Iterate over documents in path order."""
+        return iter(self.documents.values())
+
+    def __len__(self) -> int:
+        """Return the number of markdown documents."""
+        return len(self.documents)
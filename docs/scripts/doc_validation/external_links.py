@@ -0,0 +1,532 @@
+"""
+External link checker.
+
+Checks that ``http://`` and ``https://`` links in the documentation still
+resolve. Checking is opt-in (it needs the network) and built on asyncio and
+the standard library only:
+
+1. Each URL is requested with ``HEAD``, falling back to ``GET`` when the
+   server answers ``HEAD`` with an error (many servers do not implement it)
+2. Redirects are followed up to a limit
+3. Connections are pooled and kept alive per host, with a cap on concurrent
+   connections and requests per second to each host, and on the total number
+   of requests in flight
+4. Results are cached on disk with a time to live, so repeated runs do not
+   hit the network for links checked recently
+
+Only the status line and headers of a response are read; ``GET`` responses
+are not downloaded. Plain ``http://`` URLs work the same way as ``https://``,
+so the checker can be pointed at a local stand-in server.
+"""
+
+import asyncio
+import json
+import logging
+import ssl
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote, urljoin, urlsplit
+
+from atomic_io import write_atomic
+
+from .document_index import DocumentIndex
+from .markdown_tokens import UNDEFINED_REFERENCE
+from .validation_types import Severity, ValidationResult
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored result format changes
+CACHE_VERSION = 1
+
+# Default cache file name, created in the reports directory
+DEFAULT_CACHE_NAME = "external_links.json"
+
+# How long results are reused, in seconds; answers from a server are kept
+# longer than failures to reach it, which are often transient
+DEFAULT_TTL = 24 * 60 * 60
+ERROR_TTL = 60 * 60
+
+# Request limits
+DEFAULT_CONCURRENCY = 16
+DEFAULT_CONNECTIONS_PER_HOST = 2
+DEFAULT_REQUESTS_PER_SECOND = 4.0
+DEFAULT_TIMEOUT = 10.0
+MAX_REDIRECTS = 5
+
+EXTERNAL_SCHEMES = ("http", "https")
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+TOO_MANY_REQUESTS = 429
+USER_AGENT = "thepath-doc-validation/1.0 (+https://github.com/MaterDev/thepath-ai_pi)"
+
+# Characters left as they are when a request target is percent-encoded
+SAFE_TARGET_CHARS = "/?=&%:@!$'()*+,;~[]"
+
+
+def is_external(url: str) -> bool:
+    """Check if a link is an ``http://`` or ``https://`` URL (the scheme in any case)."""
+    scheme, separator, _ = url.partition("://")
+    return bool(separator) and scheme.lower() in EXTERNAL_SCHEMES
+
+
+@dataclass
+class LinkStatus:
+    """Outcome of checking one URL.
+
+    Attributes:
+        url: URL that was checked (without fragment)
+        status: Final HTTP status code, if the server answered
+        error: Why the server could not be reached or answered, if it couldn't
+        final_url: Where redirects ended up, if the URL was redirected
+        checked_at: When the URL was checked (seconds since the epoch)
+    """
+
+    url: str
+    status: Optional[int] = None
+    error: Optional[str] = None
+    final_url: Optional[str] = None
+    checked_at: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the link resolves."""
+        return self.status is not None and self.status < 400
+
+    @property
+    def broken(self) -> bool:
+        """Whether the server answered that the link is dead (rather than not answering)."""
+        return self.status is not None and self.status >= 400 and self.status != TOO_MANY_REQUESTS
+
+
+class ExternalLinkCache:
+    """On-disk cache of external link results with a time to live."""
+
+    def __init__(self, path: Path, ttl: float = DEFAULT_TTL, error_ttl: float = ERROR_TTL):
+        """Initialize an empty cache.
+
+        Args:
+            path: Location of the cache file
+            ttl: Seconds a server's answer is reused for
+            error_ttl: Seconds a failure to get an answer is reused for
+        """
+        self.path = path
+        self.ttl = ttl
+        self.error_ttl = min(error_ttl, ttl)
+        self.entries: dict[str, LinkStatus] = {}
+
+    @classmethod
+    def load(
+        cls, path: Path, ttl: float = DEFAULT_TTL, error_ttl: float = ERROR_TTL
+    ) -> "ExternalLinkCache":
+        """Load a cache from disk, starting empty if it is missing or stale.
+
+        Args:
+            path: Location of the cache file
+            ttl: Seconds a server's answer is reused for
+            error_ttl: Seconds a failure to get an answer is reused for
+
+        Returns:
+            Loaded cache
+        """
+        cache = cls(path, ttl, error_ttl)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cache
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable external link cache {path}: {str(e)}")
+            return cache
+
+        if data.get("version") != CACHE_VERSION:
+            return cache
+
+        cache.entries = {url: LinkStatus(**entry) for url, entry in data.get("entries", {}).items()}
+        return cache
+
+    def _expired(self, status: LinkStatus, now: float) -> bool:
+        """Check if a cached result is too old to be reused."""
+        ttl = self.ttl if status.status is not None else self.error_ttl
+        return now - status.checked_at >= ttl
+
+    def get(self, url: str, now: Optional[float] = None) -> Optional[LinkStatus]:
+        """Return the cached result for a URL if it has not expired.
+
+        Args:
+            url: URL without fragment
+            now: Current time (default: the system clock)
+
+        Returns:
+            Cached result, or None if the URL must be checked again
+        """
+        status = self.entries.get(url)
+        if status is None or self._expired(status, time.time() if now is None else now):
+            return None
+        return status
+
+    def put(self, status: LinkStatus) -> None:
+        """Store the result of checking a URL."""
+        self.entries[status.url] = status
+
+    def save(self) -> None:
+        """Write the unexpired results to disk, replacing the old cache."""
+        now = time.time()
+        data = {
+            "version": CACHE_VERSION,
+            "entries": {
+                url: asdict(status)
+                for url, status in sorted(self.entries.items())
+                if not self._expired(status, now)
+            },
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps(data, indent=1).encode("utf-8"))
+
+
+class _HostPool:
+    """Idle keep-alive connections and request limits for one host."""
+
+    def __init__(self, connections: int, requests_per_second: float):
+        """Initialize the pool; must be called from a running event loop.
+
+        Args:
+            connections: Maximum number of concurrent connections to the host
+            requests_per_second: Maximum rate of requests to the host (0 for no limit)
+        """
+        self.semaphore = asyncio.Semaphore(connections)
+        self.idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self.next_start = 0.0
+
+    async def wait_turn(self) -> None:
+        """Wait until the rate limit allows another request to the host."""
+        now = asyncio.get_running_loop().time()
+        start = max(now, self.next_start)
+        self.next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+
+class ExternalLinkChecker:
+    """Checks external links over HTTP, with pooling, rate limits and caching."""
+
+    def __init__(
+        self,
+        cache: Optional[ExternalLinkCache] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        connections_per_host: int = DEFAULT_CONNECTIONS_PER_HOST,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_redirects: int = MAX_REDIRECTS,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        """Initialize the checker.
+
+        Args:
+            cache: Optional result cache, updated with every URL checked
+            concurrency: Maximum number of URLs checked at the same time
+            connections_per_host: Maximum number of concurrent connections to one host
+            requests_per_second: Maximum rate of requests to one host (0 for no limit)
+            timeout: Seconds allowed for each request to connect, send and get the
+                response headers (time spent waiting for a connection slot or
+                the rate limit does not count)
+            max_redirects: Maximum number of redirects followed per URL
+            ssl_context: TLS settings for ``https://`` URLs (default: system defaults)
+        """
+        self.cache = cache
+        self.concurrency = concurrency
+        self.connections_per_host = connections_per_host
+        self.requests_per_second = requests_per_second
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.ssl_context = ssl_context
+        self._pools: dict[tuple[str, str, int], _HostPool] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Number of URLs requested over the network by the last check()
+        self.requested = 0
+
+    def check(self, urls: Iterable[str]) -> dict[str, LinkStatus]:
+        """Check URLs, reusing unexpired cached results.
+
+        Args:
+            urls: URLs without fragments
+
+        Returns:
+            Result for each URL
+        """
+        results = {}
+        pending = []
+        for url in sorted(set(urls)):
+            cached = self.cache.get(url) if self.cache is not None else None
+            if cached is not None:
+                results[url] = cached
+            else:
+                pending.append(url)
+
+        self.requested = len(pending)
+        if pending:
+            logger.info(f"Checking {len(pending)} external links...")
+            checked = asyncio.run(self._check_all(pending))
+            results.update(checked)
+            if self.cache is not None:
+                for status in checked.values():
+                    self.cache.put(status)
+        return results
+
+    async def _check_all(self, urls: list[str]) -> dict[str, LinkStatus]:
+        """Check URLs concurrently and close all connections afterwards."""
+        self._pools = {}
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        try:
+            statuses = await asyncio.gather(*(self._check_url(url) for url in urls))
+        finally:
+            for pool in self._pools.values():
+                pool.close()
+            self._pools = {}
+        return dict(zip(urls, statuses))
+
+    async def _check_url(self, url: str) -> LinkStatus:
+        """Check one URL with HEAD, falling back to GET if HEAD gets an error status."""
+        async with self._semaphore:
+            status = await self._follow("HEAD", url)
+            if status.status is not None and not status.ok:
+                status = await self._follow("GET", url)
+        status.checked_at = time.time()
+        return status
+
+    async def _follow(self, method: str, url: str) -> LinkStatus:
+        """Request a URL, following redirects.
+
+        Args:
+            method: ``HEAD`` or ``GET``
+            url: URL without fragment
+
+        Returns:
+            Result for the URL
+        """
+        current = url
+        for _ in range(self.max_redirects + 1):
+            try:
+                code, headers = await self._request(method, current)
+            except asyncio.TimeoutError:
+                return LinkStatus(url, error=f"Timed out after {self.timeout:g}s")
+            except (OSError, EOFError, ValueError, UnicodeError) as e:
+                return LinkStatus(url, error=str(e) or type(e).__name__)
+
+            location = headers.get("location")
+            if code in REDIRECT_STATUSES and location:
+                current = urljoin(current, location).partition("#")[0]
+                if is_external(current):
+                    continue
+            return LinkStatus(url, status=code, final_url=current if current != url else None)
+        return LinkStatus(url, error=f"More than {self.max_redirects} redirects")
+
+    def _pool(self, key: tuple[str, str, int]) -> _HostPool:
+        """Return the connection pool of a host, creating it on first use."""
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = _HostPool(self.connections_per_host, self.requests_per_second)
+            self._pools[key] = pool
+        return pool
+
+    async def _connect(
+        self, scheme: str, host: str, port: int
+    ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Open a new connection to a host."""
+        if scheme == "https":
+            if self.ssl_context is None:
+                # Loading the system certificates is slow, so it is done once per checker
+                self.ssl_context = ssl.create_default_context()
+            return await asyncio.open_connection(
+                host, port, ssl=self.ssl_context, server_hostname=host
+            )
+        return await asyncio.open_connection(host, port)
+
+    async def _request(self, method: str, url: str) -> tuple[int, dict[str, str]]:
+        """Send one request and read the status and headers of the response.
+
+        Waits for a free connection slot and the host's rate limit first; the
+        timeout only starts once the request can be sent.
+
+        Args:
+            method: ``HEAD`` or ``GET``
+            url: Absolute ``http://`` or ``https://`` URL
+
+        Returns:
+            Status code and headers (names lowercased)
+
+        Raises:
+            ValueError: If the URL cannot be requested
+            OSError: If the connection fails
+            asyncio.TimeoutError: If the server takes longer than the timeout
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL '{url}'")
+        default_port = 443 if parts.scheme == "https" else 80
+        port = parts.port or default_port
+        host = parts.hostname.encode("idna").decode("ascii")
+        host_header = f"[{host}]" if ":" in host else host
+        if port != default_port:
+            host_header = f"{host_header}:{port}"
+
+        target = quote(parts.path or "/", safe=SAFE_TARGET_CHARS)
+        if parts.query:
+            target += "?" + quote(parts.query, safe=SAFE_TARGET_CHARS)
+        request = (
+            f"{method} {target} HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            f"User-Agent: {USER_AGENT}\r\n"
+            "Accept: */*\r\n"
+            "Connection: keep-alive\r\n"
+            "\r\n"
+        ).encode("ascii")
+
+        pool = self._pool((parts.scheme, host, port))
+        async with pool.semaphore:
+            await pool.wait_turn()
+            return await asyncio.wait_for(
+                self._exchange(pool, method, request, (parts.scheme, host, port)), self.timeout
+            )
+
+    async def _exchange(
+        self, pool: _HostPool, method: str, request: bytes, address: tuple[str, str, int]
+    ) -> tuple[int, dict[str, str]]:
+        """Send a request over a pooled or new connection and read the response head.
+
+        Idle connections to the host are reused. The connection goes back to
+        the pool after a ``HEAD`` if the server keeps it alive; after a ``GET``
+        it is closed, so the body is never downloaded.
+
+        Args:
+            pool: Connection pool of the host, whose slot the caller holds
+            method: ``HEAD`` or ``GET``
+            request: Encoded request
+            address: Scheme, host and port to connect to
+
+        Returns:
+            Status code and headers (names lowercased)
+        """
+        # A kept-alive connection may have been closed by the server in the
+        # meantime, in which case the request is retried on a new one
+        while True:
+            reused = bool(pool.idle)
+            if reused:
+                reader, writer = pool.idle.pop()
+            else:
+                reader, writer = await self._connect(*address)
+            try:
+                writer.write(request)
+                await writer.drain()
+                version, code, headers = await self._read_head(reader)
+            except ConnectionError:
+                writer.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            break
+
+        keep_alive = (
+            method == "HEAD"
+            and version == "HTTP/1.1"
+            and headers.get("connection", "").lower() != "close"
+        )
+        if keep_alive:
+            pool.idle.append((reader, writer))
+        else:
+            writer.close()
+        return code, headers
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader) -> tuple[str, int, dict[str, str]]:
+        """Read the status line and headers of a response.
+
+        Returns:
+            HTTP version, status code and headers (names lowercased)
+
+        Raises:
+            ConnectionResetError: If the server closed the connection
+            ValueError: If the response is not HTTP
+        """
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by server")
+        fields = status_line.decode("latin-1").split(None, 2)
+        if len(fields) < 2 or not fields[0].startswith("HTTP/") or not fields[1].isdigit():
+            raise ValueError(f"Invalid HTTP response: {status_line[:80]!r}")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return fields[0], int(fields[1]), headers
+
+    def validate(
+        self,
+        index: DocumentIndex,
+        documents: Optional[set[str]] = None,
+        result: Optional[ValidationResult] = None,
+    ) -> ValidationResult:
+        """Check the external links in the documentation.
+
+        Args:
+            index: Shared document index
+            documents: Relative paths of the documents to check (default: all)
+            result: Result to add issues to (default: a new one)
+
+        Returns:
+            ValidationResult with an error for each occurrence of a link the
+            server reports as dead, and a warning for each occurrence of a link
+            that could not be checked
+        """
+        occurrences: dict[str, list[tuple[str, int]]] = {}
+        for doc in index:
+            if documents is not None and doc.rel_path not in documents:
+                continue
+            for link in doc.links:
+                if link.kind != UNDEFINED_REFERENCE and is_external(link.target):
+                    url = link.target.partition("#")[0]
+                    occurrences.setdefault(url, []).append((doc.rel_path, link.line))
+
+        statuses = self.check(occurrences)
+
+        if result is None:
+            result = ValidationResult()
+        result.add_stat("total_external_links", len(occurrences))
+        for url, places in occurrences.items():
+            status = statuses[url]
+            if status.ok:
+                continue
+            if status.broken:
+                message = f"Broken external link '{url}' (HTTP {status.status})"
+                severity = Severity.ERROR
+                context = f"Redirected to '{status.final_url}'" if status.final_url else None
+            else:
+                message = f"Could not check external link '{url}'"
+                severity = Severity.WARNING
+                context = status.error or f"HTTP {status.status}"
+            for rel_path, line in places:
+                result.add_issue(
+                    message=message,
+                    file=rel_path,
+                    line=line,
+                    severity=severity,
+                    context=context,
+                    checker="external_links",
+                )
+        result.add_stat("requested_external_links", self.requested)
+        return result
@@ -1,116 +1,338 @@
 #!/usr/bin/env python3
 
+import argparse
 import logging
 import re
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Optional
+
+# atomic_io is shared with the image scripts, one directory up
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from atomic_io import write_atomic
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Fenced code block delimiters, at any indentation (e.g. inside admonitions)
+FENCE_PATTERN = re.compile(r"^\s*(`{3,}(?=[^`]*$)|~{3,})")
 
-def fix_trailing_whitespace(content: str) -> str:
-    """Remove trailing whitespace from each line."""
-    lines = content.splitlines()
-    return "\n".join(line.rstrip() for line in lines)
+# Spacing rules, in the order they are tried on a pair of adjacent lines
+RULE_BEFORE_LIST = "before_list"
+RULE_AFTER_LIST = "after_list"
+RULE_BEFORE_HEADING = "before_heading"
+RULE_AFTER_HEADING = "after_heading"
+RULE_BEFORE_CODE = "before_code"
+RULE_AFTER_CODE = "after_code"
+RULE_BEFORE_ADMONITION = "before_admonition"
 
 
-def fix_consecutive_blank_lines(content: str) -> str:
-    """Ensure no more than one consecutive blank line."""
-    return re.sub(r"\n{3,}", "\n\n", content)
+def _starts_heading(line: str, has_next: bool) -> bool:
+    """Check if a line starts with ``#`` characters followed by whitespace or a line break."""
+    rest = line.lstrip("#")
+    if rest == line:
+        return False
+    return rest[0].isspace() if rest else has_next
 
 
-def fix_list_spacing(content: str) -> str:
-    """Ensure proper spacing around lists."""
-    # Add blank line before lists if not present
-    content = re.sub(r"([^\n])\n([-*])", r"\1\n\n\2", content)
-    # Add blank line after lists if not present
-    content = re.sub(r"([-*][^\n]+)\n([^-*\n])", r"\1\n\n\2", content)
-    return content
+def _spacing_rule(
+    previous: str, line: str, has_next: bool, blocked: Optional[str]
+) -> Optional[str]:
+    """Find the first spacing rule asking for a blank line between two adjacent lines.
 
+    The rules are line-level equivalents of the project's original regular
+    expressions, quirks included (e.g. a blank line after any line with a
+    ``-``, ``*`` or ``#`` before its last character).
 
-def fix_heading_spacing(content: str) -> str:
-    """Ensure proper spacing around headings."""
-    # Add blank line before headings if not present
-    content = re.sub(r"([^\n])\n(#+\s)", r"\1\n\n\2", content)
-    # Add blank line after headings if not present
-    content = re.sub(r"(#+[^\n]+)\n([^#\n])", r"\1\n\n\2", content)
-    return content
+    Args:
+        previous: Non-blank line before ``line``
+        line: Non-blank line
+        has_next: Whether another line (even a blank one) follows ``line``
+        blocked: Rule that cannot apply to this pair because it applied to
+            the previous pair and used up all of ``previous``
 
+    Returns:
+        Name of the rule that applies, or None
+    """
+    if line[0] in "-*" and blocked != RULE_BEFORE_LIST:
+        return RULE_BEFORE_LIST
+    if line[0] not in "-*" and ("-" in previous[:-1] or "*" in previous[:-1]):
+        return RULE_AFTER_LIST
+    if _starts_heading(line, has_next) and blocked != RULE_BEFORE_HEADING:
+        return RULE_BEFORE_HEADING
+    if line[0] != "#" and "#" in previous[:-1]:
+        return RULE_AFTER_HEADING
+    if line.startswith("```") and blocked != RULE_BEFORE_CODE:
+        return RULE_BEFORE_CODE
+    if previous.endswith("```") and blocked != RULE_AFTER_CODE:
+        return RULE_AFTER_CODE
+    if line.startswith("!!! "):
+        return RULE_BEFORE_ADMONITION
+    return None
 
-def fix_code_block_spacing(content: str) -> str:
-    """Ensure proper spacing around code blocks."""
-    # Add blank line before code blocks if not present
-    content = re.sub(r"([^\n])\n(```)", r"\1\n\n\2", content)
-    # Add blank line after code blocks if not present
-    content = re.sub(r"(```)\n([^\n])", r"\1\n\n\2", content)
-    return content
 
+def _blocked_rule(rule: Optional[str], line: str) -> Optional[str]:
+    """Return the rule that cannot apply to the pair starting with ``line``.
 
-def fix_admonition_spacing(content: str) -> str:
-    """Ensure proper spacing around admonitions."""
-    # Add blank line before admonitions if not present
-    content = re.sub(r"([^\n])\n(!!! )", r"\1\n\n\2", content)
-    # Add blank line after admonitions if not present
-    content = re.sub(r"(!!!.*\n.*)\n([^!\n])", r"\1\n\n\2", content)
-    return content
+    A rule that matched all of ``line`` cannot match it again as the first
+    line of the next pair (e.g. a lone ``-`` directly after a paragraph).
+    """
+    if rule == RULE_BEFORE_LIST and len(line) == 1:
+        return rule
+    if rule == RULE_BEFORE_HEADING and not line.strip("#"):
+        return rule
+    if rule in (RULE_BEFORE_CODE, RULE_AFTER_CODE) and line == "```":
+        return rule
+    return None
 
 
-def format_markdown_file(file_path: Path) -> bool:
-    """Format a markdown file according to project standards."""
-    try:
-        content = file_path.read_text()
-        original_content = content
+def format_content(content: str) -> str:
+    """Apply all formatting rules to markdown content in a single scan.
+
+    1. Removes trailing whitespace and collapses runs of blank lines
+    2. Adds blank lines around lists, headings, code blocks and admonitions
+    3. Adds a blank line after the end of an admonition block
+    4. Ends the content with a single newline
+
+    Fenced code blocks are copied verbatim; only their delimiter lines are
+    spaced from the surrounding text.
+
+    Args:
+        content: Markdown text
+
+    Returns:
+        Formatted markdown text
+    """
+    lines = content.splitlines()
+    output: list[str] = []
+    blanks = 0
+    blocked: Optional[str] = None
+    fence: Optional[str] = None
+    in_admonition = False
 
-        # Apply formatting fixes
-        content = fix_trailing_whitespace(content)
-        content = fix_consecutive_blank_lines(content)
-        content = fix_list_spacing(content)
-        content = fix_heading_spacing(content)
-        content = fix_code_block_spacing(content)
-        content = fix_admonition_spacing(content)
+    for number, raw_line in enumerate(lines):
+        if fence is not None:
+            stripped = raw_line.strip()
+            if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                fence = None
+                blocked = None
+                output.append(raw_line.rstrip())
+            else:
+                output.append(raw_line)
+            continue
 
-        # Ensure file ends with a single newline
-        content = content.rstrip() + "\n"
+        line = raw_line.rstrip()
+        if not line:
+            blanks += 1
+            continue
+
+        if not output or blanks:
+            # Up to two leading blank lines are kept, other runs become one
+            output.extend([""] * (min(blanks, 2) if not output else 1))
+            blocked = None
+        else:
+            rule = _spacing_rule(output[-1], line, number + 1 < len(lines), blocked)
+            blocked = _blocked_rule(rule, line)
+            if rule is not None or (in_admonition and not line[0].isspace()):
+                output.append("")
+        blanks = 0
+        output.append(line)
+
+        if line.startswith("!!! "):
+            in_admonition = True
+        elif not line[0].isspace():
+            in_admonition = False
+
+        opening = FENCE_PATTERN.match(line)
+        if opening:
+            fence = opening.group(1)
+
+    # Ensure file ends with a single newline
+    return "\n".join(output).rstrip() + "\n"
+
+
+def format_markdown_file(file_path: Path, check: bool = False) -> Optional[bool]:
+    """Format a markdown file according to project standards.
+
+    Args:
+        file_path: Markdown file to format
+        check: Only report whether the file needs formatting, without writing it
+
+    Returns:
+        True if the file was (or, in check mode, would be) changed, False if it
+        is already formatted, None if it could not be formatted
+    """
+    try:
+        original_content = file_path.read_text(encoding="utf-8")
+        content = format_content(original_content)
 
         # Only write if changes were made
-        if content != original_content:
-            file_path.write_text(content)
-            logger.info(f"Formatted {file_path}")
-            return True
-        return False
+        if content == original_content:
+            return False
+        if not check:
+            write_atomic(file_path, content.encode("utf-8"))
+        return True
 
     except Exception as e:
         logger.error(f"Error formatting {file_path}: {str(e)}")
-        return False
+        return None
 
 
 def find_markdown_files(directory: Path) -> list[Path]:
     """Find all markdown files in directory recursively."""
-    return list(directory.rglob("*.md"))
+    return sorted(directory.rglob("*.md"))
+
+
+def changed_markdown_files(directory: Path, ref: str) -> list[Path]:
+    """Find markdown files under a directory that differ from a git ref.
+
+    Includes files modified or added since ``ref`` (committed or not) and
+    untracked files that are not ignored. Deleted files are left out.
+
+    Args:
+        directory: Directory inside a git work tree
+        ref: Any git revision, e.g. ``HEAD`` or ``origin/main``
+
+    Returns:
+        Changed markdown files, sorted
+
+    Raises:
+        RuntimeError: If git fails, e.g. because ``ref`` does not exist
+    """
+    commands = [
+        ["git", "diff", "--name-only", "--relative", "--diff-filter=d", ref, "--", "."],
+        ["git", "ls-files", "--others", "--exclude-standard", "--", "."],
+    ]
+    names = set()
+    for command in commands:
+        completed = subprocess.run(command, cwd=directory, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip() or f"{' '.join(command)} failed")
+        names.update(name for name in completed.stdout.splitlines() if name.endswith(".md"))
+    return sorted(directory / name for name in names)
+
+
+def collect_markdown_files(paths: list[Path]) -> list[Path]:
+    """Expand files and directories given on the command line into markdown files.
+
+    Args:
+        paths: Markdown files and directories to search recursively
+
+    Returns:
+        Markdown files, sorted and without duplicates
+    """
+    files = set()
+    for path in paths:
+        if path.is_dir():
+            files.update(find_markdown_files(path))
+        elif path.suffix == ".md":
+            files.add(path)
+        else:
+            logger.warning(f"Skipping {path}: not a markdown file or directory")
+    return sorted(files)
+
+
+def format_files(files: list[Path], check: bool = False, jobs: int = 1) -> list[Optional[bool]]:
+    """Format markdown files, optionally in parallel.
+
+    Args:
+        files: Markdown files to format
+        check: Only report which files need formatting, without writing them
+        jobs: Number of worker processes (1 formats everything in-process)
+
+    Returns:
+        Result of ``format_markdown_file`` for each file, in input order
+    """
+    format_file = partial(format_markdown_file, check=check)
+    workers = min(jobs, len(files))
+    if workers <= 1:
+        return [format_file(path) for path in files]
+
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(format_file, files, chunksize=chunksize))
 
 
 def main():
-    """Main function to format all markdown files."""
+    """Main function to format markdown files."""
     # Get the project root directory
     project_root = Path(__file__).resolve().parents[3]
     docs_dir = project_root / "docs"
 
-    if not docs_dir.exists():
-        logger.error(f"Docs directory not found at {docs_dir}")
-        return
+    parser = argparse.ArgumentParser(description="Format markdown documentation")
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="Markdown files or directories to format (default: the docs directory)",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report files that need formatting and exit with status 1 if any do",
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        default=None,
+        help="Only format markdown files changed since this git ref (e.g. HEAD, origin/main)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to format files (default: 1)",
+    )
+    args = parser.parse_args()
+
+    roots = args.paths or [docs_dir]
+    missing = [path for path in roots if not path.exists()]
+    if missing:
+        for path in missing:
+            logger.error(f"Path not found: {path}")
+        sys.exit(1)
+
+    if args.changed_since:
+        changed = set()
+        for root in roots:
+            directory = root if root.is_dir() else root.parent
+            try:
+                changed.update(changed_markdown_files(directory, args.changed_since))
+            except RuntimeError as e:
+                logger.error(f"Could not list files changed since {args.changed_since}: {str(e)}")
+                sys.exit(1)
+        # Files given explicitly must also have changed to be formatted
+        changed = {path.resolve() for path in changed}
+        markdown_files = [
+            path for path in collect_markdown_files(roots) if path.resolve() in changed
+        ]
+    else:
+        markdown_files = collect_markdown_files(roots)
 
-    markdown_files = find_markdown_files(docs_dir)
     if not markdown_files:
         logger.info("No markdown files found")
         return
 
-    formatted_count = 0
-    for file_path in markdown_files:
-        if format_markdown_file(file_path):
-            formatted_count += 1
+    results = format_files(markdown_files, check=args.check, jobs=args.jobs)
+    changed_files = [path for path, changed in zip(markdown_files, results) if changed]
+    failed = results.count(None)
+
+    if args.check:
+        for path in changed_files:
+            logger.error(f"Would format {path}")
+        logger.info(f"{len(changed_files)} of {len(markdown_files)} files need formatting")
+    else:
+        for path in changed_files:
+            logger.info(f"Formatted {path}")
+        logger.info(f"Formatted {len(changed_files)} of {len(markdown_files)} files")
 
-    logger.info(f"Formatted {formatted_count} of {len(markdown_files)} files")
+    if failed or (args.check and changed_files):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -7,12 +7,11 @@ Validates documentation health by:
 3. Validating metadata presence
 """
 
-import re
 from pathlib import Path
+from typing import Optional
 
-import yaml
-
-from .validation_types import Severity, ValidationIssue, ValidationResult
+from .document_index import Document, DocumentIndex
+from .validation_types import Severity, ValidationResult
 
 
 class HealthChecker:
@@ -46,25 +45,6 @@ class HealthChecker:
                 return parts[0]
         return "other"
 
-    def _extract_metadata(self, content: str) -> dict[str, str]:
-        """Extract YAML metadata from content.
-
-        Args:
-            content: Document content
-
-        Returns:
-            Dictionary of metadata fields
-        """
-        metadata = {}
-
-        # Extract YAML front matter
-        match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-        if match:
-            yaml_content = match.group(1)
-            metadata = yaml.safe_load(yaml_content)
-
-        return metadata
-
     def _calculate_coverage(self, sections: set[str], required: set[str]) -> float:
         """Calculate section coverage percentage.
 
@@ -79,40 +59,55 @@ class HealthChecker:
             return 100.0
         return len(sections.intersection(required)) / len(required) * 100
 
-    def validate(self) -> ValidationResult:
+    def check_document(self, doc: Document, result: ValidationResult) -> None:
+        """Run health checks on a single document.
+
+        Args:
+            doc: Parsed document
+            result: Result to add issues to
+        """
+        error = doc.error or doc.front_matter_error
+        if error:
+            result.add_issue(
+                message=f"Error processing file: {error}",
+                file=doc.rel_path,
+                severity=Severity.ERROR,
+                checker="health",
+            )
+            return
+
+        # Check metadata
+        missing_meta = self.required_metadata - set(doc.front_matter.keys())
+        if missing_meta:
+            result.add_issue(
+                message=f'Missing metadata fields: {", ".join(sorted(missing_meta))}',
+                file=doc.rel_path,
+                severity=Severity.WARNING,
+                checker="health",
+            )
+
+    def validate(
+        self,
+        index: Optional[DocumentIndex] = None,
+        documents: Optional[set[str]] = None,
+        result: Optional[ValidationResult] = None,
+    ) -> ValidationResult:
         """Run health validation checks.
 
+        Args:
+            index: Shared document index (built from the docs root if not given)
+            documents: Relative paths of the documents to check (default: all)
+            result: Result to add issues to as they are found (default: a new one)
+
         Returns:
             Validation result with any issues found
         """
-        result = ValidationResult()
-
-        for md_file in self.docs_root.rglob("*.md"):
-            try:
-                content = md_file.read_text()
-                rel_path = str(md_file.relative_to(self.docs_root))
-
-                # Check metadata
-                metadata = self._extract_metadata(content)
-                missing_meta = self.required_metadata - set(metadata.keys())
-                if missing_meta:
-                    result.issues.append(
-                        ValidationIssue(
-                            message=f'Missing metadata fields: {", ".join(missing_meta)}',
-                            file=rel_path,
-                            severity=Severity.WARNING,
-                            checker="health",
-                        )
-                    )
-
-            except Exception as e:
-                result.issues.append(
-                    ValidationIssue(
-                        message=f"Error processing file: {str(e)}",
-                        file=rel_path,
-                        severity=Severity.ERROR,
-                        checker="health",
-                    )
-                )
-
+        if index is None:
+            index = DocumentIndex.build(self.docs_root)
+
+        if result is None:
+            result = ValidationResult()
+        for doc in index:
+            if documents is None or doc.rel_path in documents:
+                self.check_document(doc, result)
         return result
@@ -0,0 +1,267 @@
+"""
+Link graph of documentation pages.
+
+Keeps the links between markdown pages found by reference validation as a
+compact adjacency structure and answers questions about the structure of
+the documentation as a whole:
+
+1. Inbound link counts and the pages linking to each page
+2. Orphan pages, not reachable from ``index.md`` or the mkdocs navigation
+3. Clusters of pages that all link to each other (strongly connected components)
+
+Pages are numbered in path order and edges are stored in compressed sparse
+row form (one offsets array and one targets array per direction), so the
+graph takes a few bytes per link. Every query is a single linear pass over
+the nodes and edges.
+"""
+
+import logging
+import posixpath
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Page every visitor starts from
+ROOT_PAGE = "index.md"
+
+
+class _MkDocsLoader(yaml.SafeLoader):
+    """Safe YAML loader that ignores the tags mkdocs configs use (e.g. ``!!python/name``)."""
+
+
+_MkDocsLoader.add_multi_constructor("", lambda loader, suffix, node: None)
+
+
+def nav_pages(mkdocs_path: Path) -> list[str]:
+    """List the markdown pages in the ``nav`` of an mkdocs configuration.
+
+    Args:
+        mkdocs_path: Path to ``mkdocs.yml``
+
+    Returns:
+        Page paths relative to the docs root, in navigation order (empty if
+        the file is missing, unreadable or has no ``nav``)
+    """
+    try:
+        config = yaml.load(mkdocs_path.read_text(encoding="utf-8"), Loader=_MkDocsLoader)
+    except FileNotFoundError:
+        return []
+    except (OSError, yaml.YAMLError) as e:
+        logger.warning(f"Ignoring unreadable mkdocs config {mkdocs_path}: {str(e)}")
+        return []
+
+    pages = []
+    pending = [config.get("nav")] if isinstance(config, dict) else []
+    while pending:
+        entry = pending.pop()
+        if isinstance(entry, str):
+            if entry.endswith(".md") and "://" not in entry:
+                pages.append(posixpath.normpath(entry.lstrip("/")))
+        elif isinstance(entry, dict):
+            pending.extend(reversed(list(entry.values())))
+        elif isinstance(entry, list):
+            pending.extend(reversed(entry))
+    return pages
+
+
+class LinkGraph:
+    """Directed graph of links between documentation pages."""
+
+    def __init__(self, pages: list[str], links: dict[str, set[str]]):
+        """Build the graph.
+
+        Args:
+            pages: Paths of all pages relative to the docs root
+            links: Pages each page links to; links to pages not in ``pages``
+                and links from a page to itself are ignored
+        """
+        self.pages = sorted(pages)
+        self._ids = {page: node for node, page in enumerate(self.pages)}
+
+        successors = [[] for _ in self.pages]
+        predecessors = [[] for _ in self.pages]
+        for source, targets in links.items():
+            node = self._ids.get(source)
+            if node is None:
+                continue
+            for target in targets:
+                target_node = self._ids.get(target)
+                if target_node is not None and target_node != node:
+                    successors[node].append(target_node)
+        for node, targets in enumerate(successors):
+            targets.sort()
+            for target in targets:
+                predecessors[target].append(node)
+
+        self._offsets, self._targets = self._compress(successors)
+        self._reverse_offsets, self._sources = self._compress(predecessors)
+
+    @staticmethod
+    def _compress(adjacency: list[list[int]]) -> tuple[array, array]:
+        """Pack adjacency lists into compressed sparse row arrays.
+
+        Returns:
+            Offsets (the neighbours of node ``n`` are at
+            ``offsets[n]:offsets[n + 1]``) and the concatenated neighbours
+        """
+        offsets = array("I", [0])
+        neighbours = array("I")
+        for nodes in adjacency:
+            neighbours.extend(nodes)
+            offsets.append(len(neighbours))
+        return offsets, neighbours
+
+    def __len__(self) -> int:
+        """Return the number of pages."""
+        return len(self.pages)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of distinct links between different pages."""
+        return len(self._targets)
+
+    def links_from(self, page: str) -> list[str]:
+        """Return the pages a page links to, in path order."""
+        node = self._ids[page]
+        targets = self._targets[self._offsets[node] : self._offsets[node + 1]]
+        return [self.pages[target] for target in targets]
+
+    def links_to(self, page: str) -> list[str]:
+        """Return the pages linking to a page, in path order."""
+        node = self._ids[page]
+        sources = self._sources[self._reverse_offsets[node] : self._reverse_offsets[node + 1]]
+        return [self.pages[source] for source in sources]
+
+    def inbound_counts(self) -> dict[str, int]:
+        """Return the number of pages linking to each page."""
+        offsets = self._reverse_offsets
+        return {page: offsets[node + 1] - offsets[node] for node, page in enumerate(self.pages)}
+
+    def reachable(self, roots: Iterable[str]) -> set[str]:
+        """Find the pages reachable by following links from a set of pages.
+
+        Args:
+            roots: Starting pages; those not in the graph are ignored
+
+        Returns:
+            Reachable pages, including the roots
+        """
+        seen = bytearray(len(self.pages))
+        queue = deque()
+        for root in roots:
+            node = self._ids.get(root)
+            if node is not None and not seen[node]:
+                seen[node] = 1
+                queue.append(node)
+
+        offsets, targets = self._offsets, self._targets
+        while queue:
+            node = queue.popleft()
+            for target in targets[offsets[node] : offsets[node + 1]]:
+                if not seen[target]:
+                    seen[target] = 1
+                    queue.append(target)
+        return {page for node, page in enumerate(self.pages) if seen[node]}
+
+    def orphans(self, roots: Iterable[str]) -> list[str]:
+        """Find the pages a reader cannot get to from the given entry points.
+
+        Args:
+            roots: Entry pages, e.g. ``index.md`` and the pages in the navigation
+
+        Returns:
+            Unreachable pages, in path order
+        """
+        reachable = self.reachable(roots)
+        return [page for page in self.pages if page not in reachable]
+
+    def clusters(self, min_size: int = 2) -> list[list[str]]:
+        """Find groups of pages that can all reach each other by following links.
+
+        Uses an iterative version of Tarjan's strongly connected components
+        algorithm, so deep link chains cannot exhaust the recursion limit.
+
+        Args:
+            min_size: Smallest component to return (single pages are trivially
+                connected to themselves)
+
+        Returns:
+            Components as sorted page lists, largest first, then by first page
+        """
+        offsets, targets = self._offsets, self._targets
+        count = len(self.pages)
+        order = [-1] * count
+        low = [0] * count
+        on_stack = bytearray(count)
+        stack: list[int] = []
+        components = []
+        counter = 0
+
+        for root in range(count):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            # Each frame is a node and the position of its next edge to follow
+            work = [(root, offsets[root])]
+
+            while work:
+                node, edge = work[-1]
+                if edge < offsets[node + 1]:
+                    work[-1] = (node, edge + 1)
+                    target = targets[edge]
+                    if order[target] == -1:
+                        order[target] = low[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack[target] = 1
+                        work.append((target, offsets[target]))
+                    elif on_stack[target]:
+                        low[node] = min(low[node], order[target])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) >= min_size:
+                        components.append(sorted(self.pages[member] for member in component))
+
+        components.sort(key=lambda component: (-len(component), component[0]))
+        return components
+
+    def report(self, roots: Optional[Iterable[str]] = None) -> dict[str, any]:
+        """Summarize the graph for the validation report.
+
+        Args:
+            roots: Entry pages for orphan detection (default: ``index.md``)
+
+        Returns:
+            Page and link counts, inbound counts, reverse links, orphan pages
+            and clusters
+        """
+        roots = [ROOT_PAGE] if roots is None else list(roots)
+        return {
+            "total_pages": len(self.pages),
+            "total_links": self.edge_count,
+            "inbound_counts": self.inbound_counts(),
+            "linked_from": {page: self.links_to(page) for page in self.pages},
+            "orphans": self.orphans(roots),
+            "clusters": self.clusters(),
+        }
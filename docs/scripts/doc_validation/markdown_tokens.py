@@ -0,0 +1,410 @@
+"""
+Code-aware markdown tokenizer.
+
+Walks a markdown document once, line by line, and emits the tokens the
+validators care about, each with its line number:
+
+1. Headings (ATX ``#`` and setext ``===``/``---`` styles)
+2. Inline links and images, including nested images in link text
+3. Reference-style links and images, resolved against the reference
+   definitions of the document (definitions may appear after their use)
+4. Explicit HTML ``id``/``name`` attributes
+
+Front matter, fenced and indented code blocks, inline code spans and HTML
+comments are tracked as they are scanned, so nothing inside them produces a
+token. A line indented by four or more columns is only an indented code block
+when it starts a block outside lists, admonitions and content tabs, whose
+content is indented the same way.
+Inline constructs are scanned per paragraph, which lets link text wrap
+across lines like it does in rendered markdown.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import NamedTuple, Optional
+
+FRONT_MATTER_PATTERN = re.compile(r"^---\n(.*?)\n---", re.DOTALL)
+
+# Block-level constructs, matched at the start of a line
+FENCE_PATTERN = re.compile(r"^\s*(`{3,}|~{3,})([^`]*)$")
+ATX_HEADING_PATTERN = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+SETEXT_UNDERLINE_PATTERN = re.compile(r"^ {0,3}(=+|-+)[ \t]*$")
+DEFINITION_PATTERN = re.compile(r"^\s*\[([^\]^][^\]]*)\]:[ \t]*<?([^\s>]+)>?")
+LIST_ITEM_PATTERN = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s")
+CONTAINER_PATTERN = re.compile(r"^\s*(?:!!!|\?\?\?\+?|===)[ \t]")
+HTML_ID_PATTERN = re.compile(r"<[a-zA-Z][^>]*?\s(?:id|name)=[\"']([^\"']+)[\"']")
+
+# Characters that can start an inline construct
+INLINE_START_PATTERN = re.compile(r"[\\`\[<]")
+BACKTICK_RUN_PATTERN = re.compile(r"`+")
+AUTOLINK_PATTERN = re.compile(r"<([a-zA-Z][a-zA-Z0-9+.-]{1,31}:[^\s<>]*)>")
+LINK_TITLE_PATTERN = re.compile(r"""\s+("[^"]*"|'[^']*'|\([^)]*\))\s*$""")
+
+# Columns of indentation that make a line an indented code block
+CODE_INDENT = 4
+
+# Link token kinds
+LINK = "link"
+IMAGE = "image"
+UNDEFINED_REFERENCE = "undefined_reference"
+
+
+class Heading(NamedTuple):
+    """A heading and where it starts."""
+
+    line: int
+    level: int
+    title: str
+
+
+class Link(NamedTuple):
+    """A link or image reference and where it occurs.
+
+    ``target`` is the destination, or the missing label for an
+    ``UNDEFINED_REFERENCE``.
+    """
+
+    line: int
+    kind: str
+    target: str
+
+
+@dataclass
+class MarkdownTokens:
+    """Tokens of one markdown document.
+
+    Attributes:
+        headings: Headings in document order
+        links: Links and images in document order
+        definitions: Reference definitions by normalized label
+        html_ids: Explicit ``id``/``name`` attributes of HTML elements
+    """
+
+    headings: list[Heading] = field(default_factory=list)
+    links: list[Link] = field(default_factory=list)
+    definitions: dict[str, str] = field(default_factory=dict)
+    html_ids: list[str] = field(default_factory=list)
+
+
+def normalize_label(label: str) -> str:
+    """Normalize a reference label for case- and whitespace-insensitive matching."""
+    return " ".join(label.split()).casefold()
+
+
+def _skip_code_span(text: str, pos: int, end: int) -> int:
+    """Return the position after the code span opening at ``pos``.
+
+    An opening backtick run without a matching closing run is literal text,
+    in which case only the run itself is skipped.
+    """
+    run = BACKTICK_RUN_PATTERN.match(text, pos)
+    length = run.end() - pos
+    for closing in BACKTICK_RUN_PATTERN.finditer(text, run.end(), end):
+        if closing.end() - closing.start() == length:
+            return closing.end()
+    return run.end()
+
+
+def _find_bracket_end(text: str, pos: int, end: int) -> int:
+    """Find the ``]`` matching the ``[`` at ``pos``, or -1 if there is none."""
+    depth = 0
+    i = pos
+    while i < end:
+        char = text[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "`":
+            i = _skip_code_span(text, i, end)
+            continue
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return -1
+
+
+def _parse_destination(text: str, pos: int, end: int) -> Optional[tuple[str, int]]:
+    """Parse an inline link destination starting at the ``(`` at ``pos``.
+
+    Like Python-Markdown, the destination runs to the matching ``)`` on the
+    same line and may contain spaces; a trailing quoted title is dropped.
+
+    Returns:
+        The destination and the position after the closing ``)``, or None
+    """
+    depth = 0
+    i = pos
+    while i < end:
+        char = text[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "\n":
+            return None
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                inner = text[pos + 1 : i]
+                inner = LINK_TITLE_PATTERN.sub("", inner).strip()
+                if inner.startswith("<") and inner.endswith(">"):
+                    inner = inner[1:-1]
+                return inner, i + 1
+        i += 1
+    return None
+
+
+class _Tokenizer:
+    """State machine behind ``tokenize``."""
+
+    def __init__(self):
+        self.tokens = MarkdownTokens()
+        # Reference uses are resolved once all definitions have been seen
+        self.references: list[tuple[int, int, str, bool]] = []
+        self.paragraph: list[str] = []
+        self.paragraph_line = 0
+        # Inside a list, admonition or content tab, where indented lines are content
+        self.in_container = False
+
+    def scan_inline(self, text: str, first_line: int, start: int = 0, end: int = -1) -> None:
+        """Emit the links and images in ``text[start:end]``.
+
+        Args:
+            text: Paragraph text
+            first_line: Line number of the first line of ``text``
+            start: Position to start scanning at
+            end: Position to stop scanning at (default: end of text)
+        """
+        if end < 0:
+            end = len(text)
+        pos = start
+        while True:
+            match = INLINE_START_PATTERN.search(text, pos, end)
+            if match is None:
+                return
+            pos = match.start()
+            char = text[pos]
+
+            if char == "\\":
+                pos += 2
+                continue
+            if char == "`":
+                pos = _skip_code_span(text, pos, end)
+                continue
+            if char == "<":
+                autolink = AUTOLINK_PATTERN.match(text, pos, end)
+                if autolink:
+                    line = first_line + text.count("\n", 0, pos)
+                    self.tokens.links.append(Link(line, LINK, autolink.group(1)))
+                    pos = autolink.end()
+                else:
+                    pos += 1
+                continue
+
+            # Opening bracket, possibly of an image
+            is_image = pos > start and text[pos - 1] == "!"
+            close = _find_bracket_end(text, pos, end)
+            if close < 0:
+                pos += 1
+                continue
+            line = first_line + text.count("\n", 0, pos)
+            kind = IMAGE if is_image else LINK
+            label = text[pos + 1 : close]
+            after = close + 1
+
+            if after < end and text[after] == "(":
+                destination = _parse_destination(text, after, end)
+                if destination is not None:
+                    target, link_end = destination
+                    self.tokens.links.append(Link(line, kind, target))
+                    # Link text may contain images
+                    self.scan_inline(text, first_line, pos + 1, close)
+                    pos = link_end
+                    continue
+            elif after < end and text[after] == "[":
+                label_close = _find_bracket_end(text, after, end)
+                if label_close >= 0:
+                    explicit = text[after + 1 : label_close]
+                    self.references.append((len(self.tokens.links), line, explicit or label, True))
+                    self.tokens.links.append(Link(line, kind, ""))
+                    self.scan_inline(text, first_line, pos + 1, close)
+                    pos = label_close + 1
+                    continue
+            elif not label.startswith("^"):
+                # Shortcut reference, only a link if the label is defined
+                self.references.append((len(self.tokens.links), line, label, False))
+                self.tokens.links.append(Link(line, kind, ""))
+
+            pos += 1
+
+    def flush_paragraph(self) -> None:
+        """Scan the inline content of the current paragraph."""
+        if self.paragraph:
+            self.scan_inline("\n".join(self.paragraph), self.paragraph_line)
+            self.paragraph = []
+
+    def is_indented_code(self, line: str) -> bool:
+        """Return whether a line belongs to an indented code block."""
+        return (
+            not self.paragraph
+            and not self.in_container
+            and bool(line.strip())
+            and _indentation(line) >= CODE_INDENT
+        )
+
+    def start_block(self, line: str) -> None:
+        """Track whether a line opens or closes a list, admonition or content tab."""
+        if LIST_ITEM_PATTERN.match(line) or CONTAINER_PATTERN.match(line):
+            self.in_container = True
+        elif _indentation(line) < CODE_INDENT and (
+            not self.paragraph or ATX_HEADING_PATTERN.match(line)
+        ):
+            self.in_container = False
+
+    def add_line(self, line: str, line_number: int) -> None:
+        """Process one line outside front matter, code blocks and comments."""
+        if not line.strip():
+            self.flush_paragraph()
+            return
+        self.start_block(line)
+
+        if "<" in line:
+            self.tokens.html_ids.extend(HTML_ID_PATTERN.findall(line))
+
+        heading = ATX_HEADING_PATTERN.match(line)
+        if heading:
+            self.flush_paragraph()
+            title = (heading.group(2) or "").strip()
+            self.tokens.headings.append(Heading(line_number, len(heading.group(1)), title))
+            self.scan_inline(title, line_number)
+            return
+
+        underline = SETEXT_UNDERLINE_PATTERN.match(line)
+        if underline and self.paragraph and not LIST_ITEM_PATTERN.match(self.paragraph[-1]):
+            level = 1 if underline.group(1)[0] == "=" else 2
+            title = " ".join(part.strip() for part in self.paragraph)
+            self.tokens.headings.append(Heading(self.paragraph_line, level, title))
+            self.flush_paragraph()
+            return
+
+        definition = DEFINITION_PATTERN.match(line)
+        if definition:
+            self.flush_paragraph()
+            label = normalize_label(definition.group(1))
+            self.tokens.definitions.setdefault(label, definition.group(2))
+            return
+
+        if not self.paragraph:
+            self.paragraph_line = line_number
+        self.paragraph.append(line)
+
+    def resolve_references(self) -> None:
+        """Fill in reference link targets from the document's definitions."""
+        unused = []
+        for position, line, label, explicit in self.references:
+            target = self.tokens.definitions.get(normalize_label(label))
+            link = self.tokens.links[position]
+            if target is not None:
+                self.tokens.links[position] = link._replace(target=target)
+            elif explicit:
+                self.tokens.links[position] = Link(line, UNDEFINED_REFERENCE, label)
+            else:
+                unused.append(position)
+        # Shortcut brackets without a definition are plain text
+        for position in reversed(unused):
+            del self.tokens.links[position]
+
+
+def _indentation(line: str) -> int:
+    """Return the number of columns a line is indented by, tabs counting as four."""
+    expanded = line.expandtabs(CODE_INDENT)
+    return len(expanded) - len(expanded.lstrip(" "))
+
+
+def _strip_comments(line: str, in_comment: bool) -> tuple[str, bool]:
+    """Remove HTML comments from a line, outside inline code.
+
+    Args:
+        line: Line of markdown
+        in_comment: Whether the line starts inside a comment
+
+    Returns:
+        The line without comments, and whether a comment is still open at its end
+    """
+    if in_comment:
+        end = line.find("-->")
+        if end < 0:
+            return "", True
+        line = line[end + 3 :]
+    if "<!--" not in line:
+        return line, False
+
+    kept = []
+    pos = 0
+    while pos < len(line):
+        char = line[pos]
+        if char == "`":
+            span_end = _skip_code_span(line, pos, len(line))
+            kept.append(line[pos:span_end])
+            pos = span_end
+        elif line.startswith("<!--", pos):
+            end = line.find("-->", pos + 4)
+            if end < 0:
+                return "".join(kept), True
+            pos = end + 3
+        else:
+            kept.append(char)
+            pos += 1
+    return "".join(kept), False
+
+
+def tokenize(text: str) -> MarkdownTokens:
+    """Tokenize a markdown document in a single pass.
+
+    Args:
+        text: Document text
+
+    Returns:
+        Headings, links, reference definitions and HTML ids of the document
+    """
+    tokenizer = _Tokenizer()
+    lines = text.split("\n")
+
+    front_matter = FRONT_MATTER_PATTERN.match(text)
+    first = front_matter.group(0).count("\n") + 1 if front_matter else 0
+
+    fence: Optional[str] = None
+    in_comment = False
+    for index in range(first, len(lines)):
+        line = lines[index]
+        line_number = index + 1
+
+        if fence is not None:
+            stripped = line.strip()
+            if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                fence = None
+            continue
+
+        if not in_comment and tokenizer.is_indented_code(line):
+            continue
+
+        if in_comment or "<!--" in line:
+            line, in_comment = _strip_comments(line, in_comment)
+
+        opening = FENCE_PATTERN.match(line)
+        if opening:
+            tokenizer.flush_paragraph()
+            tokenizer.start_block(line)
+            fence = opening.group(1)
+            continue
+
+        tokenizer.add_line(line, line_number)
+
+    tokenizer.flush_paragraph()
+    tokenizer.resolve_references()
+    return tokenizer.tokens
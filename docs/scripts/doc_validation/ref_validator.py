@@ -1,15 +1,28 @@
 """Reference validator for documentation.
 
 Validates cross-references between documentation files by:
-1. Finding all markdown links
+1. Finding all markdown links (outside code blocks, inline code and comments)
 2. Checking that target files exist
 3. Validating fragment identifiers
+
+Targets are resolved against the set of paths in the shared document index,
+and fragments against each page's anchor set, so checking a link is a couple
+of hash lookups rather than a file system call. The links between pages are
+kept as a ``LinkGraph`` for orphan and cluster reporting.
 """
 
+import posixpath
 import re
 from pathlib import Path
+from typing import Optional
+from urllib.parse import unquote
+
+from markdown.extensions.toc import slugify
 
-from .validation_types import Severity, ValidationIssue, ValidationResult
+from .document_index import Document, DocumentIndex, outside_docs_root
+from .link_graph import LinkGraph
+from .markdown_tokens import UNDEFINED_REFERENCE
+from .validation_types import Severity, ValidationResult
 
 
 class RefValidator:
@@ -22,8 +35,19 @@ class RefValidator:
             docs_root: Root directory containing documentation files
         """
         self.docs_root = Path(docs_root)
-        self.ref_pattern = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
         self.glob_pattern = re.compile(r"[\*\?\[\]]")
+        self.scheme_pattern = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+
+        # Paths of all files and directories under the docs root, and the same
+        # keyed by their case-folded form to suggest fixes for case mismatches
+        self._targets: set[str] = set()
+        self._folded_targets: dict[str, str] = {}
+
+        # Anchors defined by each markdown page
+        self._anchors: dict[str, set[str]] = {}
+
+        # Links between pages, built by validate()
+        self.link_graph: Optional[LinkGraph] = None
 
     def _is_glob_pattern(self, path: str) -> bool:
         """Check if a path contains glob pattern characters.
@@ -44,14 +68,14 @@ class RefValidator:
             source_file: File containing the reference
 
         Returns:
-            Normalized path relative to docs root
+            Normalized path relative to docs root, keeping any fragment
         """
         # Remove any 'docs/' prefix
         if ref_path.startswith("docs/"):
             ref_path = ref_path[5:]
 
         # Handle fragment identifiers
-        path_part = ref_path.split("#")[0]
+        path_part, separator, fragment = ref_path.partition("#")
         if not path_part:
             return ref_path
 
@@ -64,86 +88,263 @@ class RefValidator:
         try:
             # Make path relative to docs root
             rel_path = abs_path.relative_to(self.docs_root)
-            return str(rel_path)
+            return rel_path.as_posix() + separator + fragment
         except ValueError:
             return ref_path
 
-    def _extract_refs(self, content: str, source_file: Path) -> list[str]:
-        """Extract and normalize all references from content.
+    def _extract_refs(self, doc: Document) -> list[tuple[int, str]]:
+        """Extract and normalize all references from a document.
 
         Args:
-            content: File content to extract refs from
-            source_file: File being processed
+            doc: Parsed document
 
         Returns:
-            List of normalized reference paths
+            List of (line number, normalized reference path) pairs
         """
         refs = []
-        for match in self.ref_pattern.finditer(content):
-            ref_path = match.group(2)
+        for link in doc.links:
+            ref_path = link.target
+            if link.kind == UNDEFINED_REFERENCE or not ref_path:
+                continue
 
-            # Skip external links and anchors
-            if ref_path.startswith(("http://", "https://", "#")):
+            # Skip external links (http, mailto, ...)
+            if self.scheme_pattern.match(ref_path):
                 continue
 
             # Skip glob patterns
             if self._is_glob_pattern(ref_path):
                 continue
 
-            normalized = self._normalize_path(ref_path, source_file)
-            refs.append(normalized)
+            normalized = self._normalize_path(ref_path, doc.path)
+            refs.append((link.line, normalized))
         return refs
 
-    def validate(self) -> ValidationResult:
+    def _target_path(self, ref: str) -> str:
+        """Return the docs-root-relative target path of a normalized reference.
+
+        Args:
+            ref: Normalized reference, possibly with a fragment
+
+        Returns:
+            Target path without fragment, with ``.`` and ``..`` segments resolved
+        """
+        return posixpath.normpath(ref.split("#")[0])
+
+    def _index_targets(self, index: DocumentIndex) -> None:
+        """Build the target lookup tables from a document index.
+
+        Args:
+            index: Shared document index
+        """
+        self._targets = index.files | index.directories
+        self._folded_targets = {path.casefold(): path for path in sorted(self._targets)}
+        self._anchors = {doc.rel_path: doc.anchors for doc in index}
+
+    def _target_exists(self, target: str) -> bool:
+        """Check if a reference target exists.
+
+        Args:
+            target: Target path relative to the docs root
+
+        Returns:
+            True if the target is a file or directory
+        """
+        if target in self._targets:
+            return True
+        # Only targets outside the docs root are not in the index
+        if outside_docs_root(target):
+            return (self.docs_root / target).exists()
+        return False
+
+    def _anchor_page(self, target: str) -> Optional[str]:
+        """Find the markdown page whose anchors a fragment on a target refers to.
+
+        Args:
+            target: Existing target path relative to the docs root
+
+        Returns:
+            The target page, the index page of a target directory, or None if
+            the target is not a markdown page (e.g. an image)
+        """
+        if target in self._anchors:
+            return target
+        index_page = posixpath.normpath(posixpath.join(target, "index.md"))
+        if index_page in self._anchors:
+            return index_page
+        return None
+
+    def _check_fragment(
+        self,
+        doc: Document,
+        line: int,
+        ref: str,
+        page: str,
+        fragment: str,
+        result: ValidationResult,
+    ) -> None:
+        """Check that a fragment names an anchor on a page.
+
+        Args:
+            doc: Document containing the reference
+            line: Line of the reference
+            ref: Normalized reference, for the issue message
+            page: Page the fragment should be defined on
+            fragment: Fragment identifier without the ``#``
+            result: Result to add an issue to if the anchor is missing
+        """
+        anchors = doc.anchors if page == doc.rel_path else self._anchors[page]
+        fragment = unquote(fragment)
+        if fragment in anchors:
+            return
+        suggestion = slugify(fragment, "-")
+        result.add_issue(
+            message=f"Broken anchor in reference to '{ref}'",
+            file=doc.rel_path,
+            line=line,
+            severity=Severity.ERROR,
+            context=f"Did you mean '#{suggestion}'?" if suggestion in anchors else None,
+            checker="references",
+        )
+
+    def check_document(self, doc: Document, result: ValidationResult) -> set[str]:
+        """Validate the references of a single document.
+
+        Args:
+            doc: Parsed document
+            result: Result to add issues and reference counts to
+
+        Returns:
+            Set of normalized references found in the document
+        """
+        if doc.error:
+            result.add_issue(
+                message=f"Error processing file: {doc.error}",
+                file=doc.rel_path,
+                severity=Severity.ERROR,
+                checker="references",
+            )
+            return set()
+
+        for link in doc.links:
+            if link.kind == UNDEFINED_REFERENCE:
+                result.add_issue(
+                    message=f"Undefined link reference '[{link.target}]'",
+                    file=doc.rel_path,
+                    line=link.line,
+                    severity=Severity.WARNING,
+                    checker="references",
+                )
+
+        refs = self._extract_refs(doc)
+        result.stats["total_references"] += len(refs)
+
+        # Check each reference
+        for line, ref in refs:
+            path_part, _, fragment = ref.partition("#")
+            if not path_part:
+                # Same-page anchor
+                if fragment:
+                    self._check_fragment(doc, line, ref, doc.rel_path, fragment, result)
+                continue
+
+            target = self._target_path(ref)
+            if self._target_exists(target):
+                page = self._anchor_page(target)
+                if fragment and page is not None:
+                    self._check_fragment(doc, line, ref, page, fragment, result)
+            else:
+                suggestion = self._folded_targets.get(target.casefold())
+                result.add_issue(
+                    message=f"Broken reference to '{ref}'",
+                    file=doc.rel_path,
+                    line=line,
+                    severity=Severity.ERROR,
+                    context=f"Did you mean '{suggestion}'?" if suggestion else None,
+                    checker="references",
+                )
+
+        return {ref for _, ref in refs}
+
+    def dependencies(self, doc: Document) -> set[str]:
+        """Return the files whose existence or anchors the document's references depend on.
+
+        Args:
+            doc: Parsed document
+
+        Returns:
+            Reference target paths relative to the docs root
+        """
+        paths = set()
+        for _, ref in self._extract_refs(doc):
+            path_part, _, fragment = ref.partition("#")
+            if not path_part:
+                continue
+            target = self._target_path(ref)
+            paths.add(target)
+            # A fragment on a directory link is looked up in its index page
+            if fragment and not target.endswith(".md"):
+                paths.add(posixpath.normpath(posixpath.join(target, "index.md")))
+        return paths
+
+    def _build_link_graph(self, ref_map: dict[str, set[str]]) -> LinkGraph:
+        """Build the graph of links between pages from the references of each page.
+
+        Args:
+            ref_map: Normalized references found in each page
+
+        Returns:
+            Graph of links to existing markdown pages (links to a directory
+            count as links to its index page)
+        """
+        links = {}
+        for source, refs in ref_map.items():
+            pages = set()
+            for ref in refs:
+                if ref.startswith("#"):
+                    continue
+                target = self._target_path(ref)
+                if self._target_exists(target):
+                    page = self._anchor_page(target)
+                    if page is not None:
+                        pages.add(page)
+            links[source] = pages
+        return LinkGraph(list(ref_map), links)
+
+    def validate(
+        self,
+        index: Optional[DocumentIndex] = None,
+        documents: Optional[set[str]] = None,
+        result: Optional[ValidationResult] = None,
+    ) -> ValidationResult:
         """Validate all documentation references.
 
+        Args:
+            index: Shared document index (built from the docs root if not given)
+            documents: Relative paths of the documents to check (default: all)
+            result: Result to add issues to as they are found (default: a new one)
+
         Returns:
             ValidationResult containing any reference issues
         """
-        result = ValidationResult()
+        if index is None:
+            index = DocumentIndex.build(self.docs_root)
+
+        self._index_targets(index)
+
+        if result is None:
+            result = ValidationResult()
         result.stats["total_references"] = 0
-        result.stats["total_documents"] = 0
+        result.stats["total_documents"] = len(index)
 
         # Build reference map
         ref_map: dict[str, set[str]] = {}
-        for md_file in self.docs_root.rglob("*.md"):
-            rel_path = str(md_file.relative_to(self.docs_root))
-            result.stats["total_documents"] += 1
-
-            try:
-                content = md_file.read_text(encoding="utf-8")
-                refs = self._extract_refs(content, md_file)
+        for doc in index:
+            if documents is None or doc.rel_path in documents:
+                ref_map[doc.rel_path] = self.check_document(doc, result)
+            else:
+                refs = self._extract_refs(doc)
+                ref_map[doc.rel_path] = {ref for _, ref in refs}
                 result.stats["total_references"] += len(refs)
-                ref_map[rel_path] = set(refs)
-
-                # Check each reference
-                for ref in refs:
-                    # Skip fragment-only refs
-                    if not ref or ref.startswith("#"):
-                        continue
-
-                    # Get path part without fragment
-                    ref_path = ref.split("#")[0]
-                    target = self.docs_root / ref_path
-
-                    if not target.exists():
-                        result.issues.append(
-                            ValidationIssue(
-                                message=f"Broken reference to '{ref}'",
-                                file=rel_path,
-                                severity=Severity.ERROR,
-                                checker="references",
-                            )
-                        )
-
-            except Exception as e:
-                result.issues.append(
-                    ValidationIssue(
-                        message=f"Error processing file: {str(e)}",
-                        file=rel_path,
-                        severity=Severity.ERROR,
-                        checker="references",
-                    )
-                )
 
+        self.link_graph = self._build_link_graph(ref_map)
         return result
@@ -0,0 +1,364 @@
+"""
+Validation report history.
+
+Keeps every validation run in a single SQLite database in the reports
+directory instead of one JSON file per run:
+
+1. Runs are appended with their summary and statistics
+2. Issues are stored one row per issue, indexed by run, file and checker
+3. Only the most recent runs are kept (configurable)
+4. Any two runs can be compared to list new and fixed issues
+
+Issues are matched between runs by file, checker, severity and message,
+not by line number, so an issue that only moved because lines were added
+above it is neither new nor fixed. Each run stores the checkers it ran, and
+only the issues of checkers both runs ran are compared, so selecting other
+checkers does not make issues look fixed or new.
+"""
+
+import json
+import sqlite3
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .validation_types import Severity, ValidationIssue, ValidationResult
+
+# Default database file name, created in the reports directory
+DEFAULT_HISTORY_NAME = "history.sqlite3"
+
+# Number of runs kept by default
+DEFAULT_KEEP_RUNS = 100
+
+# Reference to the most recent run
+LAST_RUN = "last"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    timestamp TEXT NOT NULL,
+    total_errors INTEGER NOT NULL,
+    total_warnings INTEGER NOT NULL,
+    stats TEXT NOT NULL,
+    checkers TEXT
+);
+CREATE TABLE IF NOT EXISTS issues (
+    run INTEGER NOT NULL REFERENCES runs(seq) ON DELETE CASCADE,
+    file TEXT NOT NULL,
+    line INTEGER,
+    checker TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    message TEXT NOT NULL,
+    context TEXT
+);
+CREATE INDEX IF NOT EXISTS issues_by_run ON issues(run);
+CREATE INDEX IF NOT EXISTS issues_by_file ON issues(file, run);
+CREATE INDEX IF NOT EXISTS issues_by_checker ON issues(checker, run);
+"""
+
+# Columns added to the runs table after it was first created, with their types
+ADDED_RUN_COLUMNS = {"checkers": "TEXT"}
+
+
+def issue_key(issue: ValidationIssue) -> tuple[str, str, str, str]:
+    """Return what identifies an issue across runs (everything but line and context)."""
+    return (issue.file, issue.checker, issue.severity.value, issue.message)
+
+
+def diff_issues(
+    previous: list[ValidationIssue], current: list[ValidationIssue]
+) -> tuple[list[ValidationIssue], list[ValidationIssue]]:
+    """Compare two lists of issues.
+
+    Issues are compared as multisets: if a message appears twice in a file
+    and only once afterwards, one of them is reported as fixed.
+
+    Args:
+        previous: Issues of the earlier run
+        current: Issues of the later run
+
+    Returns:
+        Issues only in ``current`` (new) and issues only in ``previous`` (fixed)
+    """
+    remaining = Counter(issue_key(issue) for issue in previous)
+    new = []
+    for issue in current:
+        key = issue_key(issue)
+        if remaining[key] > 0:
+            remaining[key] -= 1
+        else:
+            new.append(issue)
+    fixed = []
+    for issue in previous:
+        key = issue_key(issue)
+        if remaining[key] > 0:
+            remaining[key] -= 1
+            fixed.append(issue)
+    return new, fixed
+
+
+@dataclass
+class RunDiff:
+    """Issues that appeared or disappeared between two runs.
+
+    Attributes:
+        against: Id of the run compared against
+        timestamp: When that run was made
+        new: Issues of the current run not in the earlier one
+        fixed: Issues of the earlier run not in the current one
+        not_compared: Checkers only one of the runs ran, whose issues are
+            left out of the comparison
+    """
+
+    against: str
+    timestamp: str
+    new: list[ValidationIssue] = field(default_factory=list)
+    fixed: list[ValidationIssue] = field(default_factory=list)
+    not_compared: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, any]:
+        """Convert the diff to a dictionary for the report."""
+        return {
+            "against": self.against,
+            "timestamp": self.timestamp,
+            "new": [issue.to_dict() for issue in self.new],
+            "fixed": [issue.to_dict() for issue in self.fixed],
+            "not_compared": self.not_compared,
+        }
+
+
+class ReportHistory:
+    """Append-only store of validation runs."""
+
+    def __init__(self, path: Path):
+        """Open (and create if needed) a history database.
+
+        Args:
+            path: Location of the database file
+        """
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(runs)")}
+        with self.connection:
+            for name, column_type in ADDED_RUN_COLUMNS.items():
+                if name not in columns:
+                    # Runs recorded before the column existed get NULL (unknown)
+                    self.connection.execute(f"ALTER TABLE runs ADD COLUMN {name} {column_type}")
+
+    def close(self) -> None:
+        """Close the database."""
+        self.connection.close()
+
+    def __enter__(self) -> "ReportHistory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record(
+        self, run_id: str, result: ValidationResult, checkers: Optional[Iterable[str]] = None
+    ) -> None:
+        """Append a run and its issues.
+
+        Args:
+            run_id: Unique id of the run
+            result: Validation result of the run
+            checkers: Names of the checkers the run ran (default: those in the
+                result's ``checkers`` statistic)
+        """
+        if checkers is None:
+            checkers = result.stats.get("checkers", {})
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (id, timestamp, total_errors, total_warnings, stats, checkers) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    result.timestamp.isoformat(),
+                    result.error_count,
+                    result.warning_count,
+                    json.dumps(result.stats, default=str),
+                    json.dumps(sorted(checkers)),
+                ),
+            )
+            seq = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO issues (run, file, line, checker, severity, message, context) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        seq,
+                        issue.file,
+                        issue.line,
+                        issue.checker,
+                        issue.severity.value,
+                        issue.message,
+                        issue.context,
+                    )
+                    for issue in result.issues
+                ),
+            )
+
+    def prune(self, keep: int = DEFAULT_KEEP_RUNS) -> int:
+        """Delete all but the most recent runs.
+
+        Args:
+            keep: Number of runs to keep
+
+        Returns:
+            Number of runs deleted
+        """
+        with self.connection:
+            row = self.connection.execute(
+                "SELECT seq FROM runs ORDER BY seq DESC LIMIT 1 OFFSET ?", (max(keep, 0),)
+            ).fetchone()
+            if row is None:
+                return 0
+            # Issues go with their run (ON DELETE CASCADE)
+            cursor = self.connection.execute("DELETE FROM runs WHERE seq <= ?", (row[0],))
+        return cursor.rowcount
+
+    def runs(self, limit: Optional[int] = None) -> list[dict[str, any]]:
+        """List runs, most recent first.
+
+        Args:
+            limit: Maximum number of runs to return
+
+        Returns:
+            Id, timestamp, error and warning counts of each run
+        """
+        rows = self.connection.execute(
+            "SELECT id, timestamp, total_errors, total_warnings FROM runs "
+            "ORDER BY seq DESC LIMIT ?",
+            (-1 if limit is None else limit,),
+        )
+        return [
+            {
+                "id": run_id,
+                "timestamp": timestamp,
+                "total_errors": errors,
+                "total_warnings": warnings,
+            }
+            for run_id, timestamp, errors, warnings in rows
+        ]
+
+    def _find_run(self, ref: str) -> Optional[tuple[int, str, str, Optional[str]]]:
+        """Resolve ``last`` or a run id (or unique id prefix) to a stored run.
+
+        Returns:
+            Sequence number, id, timestamp and checkers (JSON, or None if not
+            recorded) of the run, or None if there is no match
+
+        Raises:
+            ValueError: If an id prefix matches more than one run
+        """
+        if ref == LAST_RUN:
+            return self.connection.execute(
+                "SELECT seq, id, timestamp, checkers FROM runs ORDER BY seq DESC LIMIT 1"
+            ).fetchone()
+        rows = self.connection.execute(
+            "SELECT seq, id, timestamp, checkers FROM runs WHERE substr(id, 1, ?) = ? "
+            "ORDER BY seq DESC",
+            (len(ref), ref),
+        ).fetchall()
+        exact = [row for row in rows if row[1] == ref]
+        if exact:
+            return exact[0]
+        if len(rows) > 1:
+            raise ValueError(f"Run id '{ref}' is ambiguous")
+        return rows[0] if rows else None
+
+    def issues(
+        self, run_id: str, file: Optional[str] = None, checker: Optional[str] = None
+    ) -> list[ValidationIssue]:
+        """Load the issues of a run, optionally only for one file and/or checker.
+
+        Args:
+            run_id: ``last``, a run id or a unique prefix of one
+            file: Only return issues in this file
+            checker: Only return issues found by this checker
+
+        Returns:
+            Issues of the run, in the order they were recorded
+
+        Raises:
+            KeyError: If there is no such run
+        """
+        run = self._find_run(run_id)
+        if run is None:
+            raise KeyError(run_id)
+        return self._load_issues(run[0], file, checker)
+
+    def _load_issues(
+        self, seq: int, file: Optional[str] = None, checker: Optional[str] = None
+    ) -> list[ValidationIssue]:
+        """Load the issues of a run by sequence number."""
+        query = "SELECT file, line, checker, severity, message, context FROM issues WHERE run = ?"
+        params: list = [seq]
+        if file is not None:
+            query += " AND file = ?"
+            params.append(file)
+        if checker is not None:
+            query += " AND checker = ?"
+            params.append(checker)
+        return [
+            ValidationIssue(
+                message=message,
+                file=issue_file,
+                line=line,
+                severity=Severity(severity),
+                context=context,
+                checker=issue_checker,
+            )
+            for issue_file, line, issue_checker, severity, message, context in self.connection.execute(
+                query + " ORDER BY rowid", params
+            )
+        ]
+
+    def diff(
+        self,
+        result: ValidationResult,
+        against: str = LAST_RUN,
+        checkers: Optional[Iterable[str]] = None,
+    ) -> RunDiff:
+        """Compare a result with a stored run (see ``diff_issues``).
+
+        Only the issues of checkers both runs ran are compared. Runs recorded
+        without their checkers are assumed to have run the same ones.
+
+        Args:
+            result: Result of the current run
+            against: ``last``, a run id or a unique prefix of one
+            checkers: Names of the checkers the current run ran (default:
+                those in the result's ``checkers`` statistic)
+
+        Returns:
+            New and fixed issues
+
+        Raises:
+            KeyError: If there is no such run
+        """
+        run = self._find_run(against)
+        if run is None:
+            raise KeyError(against)
+        seq, run_id, timestamp, stored = run
+        current = set(result.stats.get("checkers", {}) if checkers is None else checkers)
+        previous = current if stored is None else set(json.loads(stored))
+        not_compared = current ^ previous
+        new, fixed = diff_issues(
+            [issue for issue in self._load_issues(seq) if issue.checker not in not_compared],
+            [issue for issue in result.issues if issue.checker not in not_compared],
+        )
+        return RunDiff(
+            against=run_id,
+            timestamp=timestamp,
+            new=new,
+            fixed=fixed,
+            not_compared=sorted(not_compared),
+        )
@@ -0,0 +1,166 @@
+"""
+Streaming report formats.
+
+Reporters write issues to an output stream as validation finds them, rather
+than building the whole report in memory and writing it at the end:
+
+1. ``jsonl``: one JSON object per line, an ``issue`` record per issue followed
+   by a final ``summary`` record, for CI scripts and ``jq``
+2. ``sarif``: a SARIF 2.1.0 log for code scanning tools (e.g. GitHub code
+   scanning), written incrementally; the tool and rule descriptions come
+   after the results, which JSON object key order allows
+
+Every reporter follows the same protocol: ``start()`` once, ``issue()`` for
+each issue as it is found, then ``finish()`` with the complete result.
+"""
+
+import json
+import posixpath
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TextIO
+
+from .checkers import CHECKERS
+from .validation_types import Severity, ValidationIssue, ValidationResult
+
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+TOOL_NAME = "doc_validation"
+TOOL_URI = "https://github.com/MaterDev/thepath-ai_pi"
+
+# SARIF result levels for each severity
+SARIF_LEVELS = {
+    Severity.ERROR: "error",
+    Severity.WARNING: "warning",
+    Severity.INFO: "note",
+}
+
+
+class Reporter(ABC):
+    """Writes issues to a stream as they are found."""
+
+    def __init__(self, stream: TextIO, docs_root: str = "."):
+        """Initialize the reporter.
+
+        Args:
+            stream: Text stream to write the report to
+            docs_root: Root directory of the documentation the issue paths are relative to
+        """
+        self.stream = stream
+        self.docs_root = docs_root
+
+    def start(self) -> None:
+        """Write whatever comes before the first issue."""
+
+    @abstractmethod
+    def issue(self, issue: ValidationIssue) -> None:
+        """Write one issue.
+
+        Args:
+            issue: Issue just found
+        """
+
+    def finish(self, result: ValidationResult) -> None:
+        """Write whatever comes after the last issue.
+
+        Args:
+            result: Complete validation result, for totals and statistics
+        """
+
+
+class JsonLinesReporter(Reporter):
+    """Writes each issue as a line of JSON, then a summary line."""
+
+    def issue(self, issue: ValidationIssue) -> None:
+        """Write one issue record and flush it, so readers see it right away."""
+        record = {"type": "issue", **issue.to_dict()}
+        self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+
+    def finish(self, result: ValidationResult) -> None:
+        """Write the summary record."""
+        record = {
+            "type": "summary",
+            "timestamp": result.timestamp.isoformat(),
+            "total_errors": result.error_count,
+            "total_warnings": result.warning_count,
+            "stats": result.stats,
+        }
+        self.stream.write(json.dumps(record, default=str) + "\n")
+        self.stream.flush()
+
+
+class SarifReporter(Reporter):
+    """Writes a SARIF log with one result per issue."""
+
+    def __init__(self, stream: TextIO, docs_root: str = "."):
+        """Initialize the reporter.
+
+        Args:
+            stream: Text stream to write the report to
+            docs_root: Root directory of the documentation, used to turn issue
+                paths into artifact locations (relative roots stay relative,
+                which is what code scanning expects when run from the
+                repository root)
+        """
+        super().__init__(stream, docs_root)
+        root = Path(docs_root)
+        self.base_uri = root.resolve().as_uri() + "/" if root.is_absolute() else None
+        self.root = root.as_posix()
+        self.count = 0
+        self.rules: dict[str, None] = {}
+
+    def _uri(self, file: str) -> str:
+        """Return the artifact URI of a file relative to the docs root."""
+        if self.base_uri is not None:
+            return self.base_uri + file
+        return posixpath.normpath(posixpath.join(self.root, file))
+
+    def start(self) -> None:
+        """Write the log header and open the results array."""
+        self.stream.write(
+            f'{{"$schema": "{SARIF_SCHEMA}", "version": "{SARIF_VERSION}", '
+            '"runs": [{"results": [\n'
+        )
+
+    def issue(self, issue: ValidationIssue) -> None:
+        """Write one result."""
+        self.rules.setdefault(issue.checker)
+        message = issue.message
+        if issue.context:
+            message = f"{message} ({issue.context})"
+        location = {"artifactLocation": {"uri": self._uri(issue.file)}}
+        if issue.line:
+            location["region"] = {"startLine": issue.line}
+        record = {
+            "ruleId": issue.checker,
+            "level": SARIF_LEVELS[issue.severity],
+            "message": {"text": message},
+            "locations": [{"physicalLocation": location}],
+        }
+        if self.count:
+            self.stream.write(",\n")
+        self.stream.write(json.dumps(record))
+        self.count += 1
+
+    def finish(self, result: ValidationResult) -> None:
+        """Close the results array and write the tool and its rules."""
+        rules = [
+            {
+                "id": checker,
+                "shortDescription": {
+                    "text": CHECKERS[checker].description if checker in CHECKERS else checker
+                },
+            }
+            for checker in self.rules
+        ]
+        tool = {"driver": {"name": TOOL_NAME, "informationUri": TOOL_URI, "rules": rules}}
+        self.stream.write(f'\n], "tool": {json.dumps(tool)}}}]}}\n')
+        self.stream.flush()
+
+
+# Output formats selectable on the command line (text is the default console output)
+REPORTERS = {
+    "jsonl": JsonLinesReporter,
+    "sarif": SarifReporter,
+}
@@ -5,83 +5,245 @@ Documentation validation script.
 This script provides a unified interface for running all documentation validation
 checks and generating comprehensive reports. It:
 
-1. Runs all validation checks (references, health)
-2. Generates detailed reports with issues and statistics
+1. Runs the registered validation checks (references, health, and optionally
+   external links), recording the time each one takes
+2. Generates detailed reports with issues, statistics and the link graph
+   (inbound links, orphan pages and clusters of pages linking to each other)
 3. Saves results to a temporary directory for tracking
-4. Provides clear terminal output for immediate feedback
+4. Records each run in a history database and can report only the issues
+   that are new or fixed since an earlier run
+5. Provides clear terminal output for immediate feedback, or streams issues
+   as JSON Lines or SARIF while validation runs
+6. Can keep running, re-validating only what changed whenever a file is saved
 
 The validation results are saved to .reports/doc_validation_report.json for further
-processing or integration with other tools.
+processing or integration with other tools. Only the most recent reports are kept.
 """
 
+import argparse
+import contextlib
 import json
 import logging
 import sys
+import time
 import uuid
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
-
-from doc_validation import HealthChecker, RefValidator, Severity, ValidationResult
+from typing import Optional
+
+from doc_validation import (
+    DocumentIndex,
+    ExternalLinkChecker,
+    Severity,
+    ValidationCache,
+    ValidationIssue,
+    ValidationResult,
+)
+from doc_validation.checkers import (
+    CHECKERS,
+    consumed_fields,
+    load_plugins,
+    resolve_checkers,
+    run_checker,
+)
+from doc_validation.document_index import PARSED_FIELDS
+from doc_validation.external_links import DEFAULT_CACHE_NAME as EXTERNAL_CACHE_NAME
+from doc_validation.external_links import ExternalLinkCache
+from doc_validation.link_graph import ROOT_PAGE, nav_pages
+from doc_validation.report_history import (
+    DEFAULT_HISTORY_NAME,
+    DEFAULT_KEEP_RUNS,
+    LAST_RUN,
+    ReportHistory,
+    diff_issues,
+)
+from doc_validation.reporters import REPORTERS, Reporter
+from doc_validation.validation_cache import DEFAULT_CACHE_NAME
+from doc_validation.watcher import DEFAULT_POLL_INTERVAL, create_watcher
 
 # Create a logger
 logger = logging.getLogger(__name__)
 
 
-def validate_docs(docs_root: str) -> ValidationResult:
-    """Run documentation validation.
+def format_index(index: DocumentIndex) -> int:
+    """Format every indexed document, writing back only the ones that change.
+
+    Documents are formatted from their in-memory text and the index is
+    updated with the result, so no file is read a second time. Documents
+    restored from the cache are skipped if they were formatted when cached;
+    the others (e.g. checked by a ``--no-format`` or ``--watch`` run) are read.
 
     Args:
-        docs_root: Root directory containing documentation
+        index: Document index to format
 
     Returns:
-        Combined validation result
+        Number of files rewritten
     """
-    print("Running documentation validation...")
+    import format_docs
+    from atomic_io import write_atomic
+
+    formatted_count = 0
+    for doc in list(index):
+        if doc.cached:
+            if doc.formatted:
+                continue
+            doc = index.load(doc.rel_path)
+        if doc.error:
+            continue
+        content = format_docs.format_content(doc.text)
+        if content != doc.text:
+            write_atomic(doc.path, content.encode("utf-8"))
+            doc = index.update(doc.rel_path, content.encode("utf-8"))
+            logger.info(f"Formatted {doc.path}")
+            formatted_count += 1
+        doc.formatted = True
+    return formatted_count
+
+
+def validate_docs(
+    docs_root: str,
+    index: Optional[DocumentIndex] = None,
+    cache: Optional[ValidationCache] = None,
+    external: Optional[ExternalLinkChecker] = None,
+    on_issue: Optional[Callable[[ValidationIssue], None]] = None,
+    checkers: Optional[list[str]] = None,
+) -> ValidationResult:
+    """Run documentation validation.
+
+    With a cache, only documents that changed (or whose dependencies did)
+    are checked by the cacheable checkers; the issues of all other documents
+    come from the cache. The cost of each checker is recorded in the
+    ``checkers`` statistic.
 
-    result = ValidationResult()
+    Args:
+        docs_root: Root directory containing documentation
+        index: Shared document index (built from the docs root if not given),
+            which must parse every field the checkers consume
+        cache: Optional validation cache, updated with this run's results (it
+            must have been loaded for the same cacheable checkers)
+        external: Optional checker for external links (which has its own
+            cache); implies the ``external_links`` checker
+        on_issue: Optional callback invoked with every issue as soon as it is
+            found (issues arrive in check order; the returned result is sorted)
+        checkers: Names of the registered checkers to run (default: the default ones)
 
-    # Run health checks
-    health = HealthChecker(docs_root)
-    result.merge(health.validate())
+    Returns:
+        Combined validation result
 
-    # Run reference checks
-    refs = RefValidator(docs_root)
-    result.merge(refs.validate())
+    Raises:
+        ValueError: If a checker is unknown or consumes fields the index did not parse
+    """
+    specs = resolve_checkers(checkers)
+    if external is not None and all(spec.name != "external_links" for spec in specs):
+        specs = resolve_checkers([*(spec.name for spec in specs), "external_links"])
+    fields = consumed_fields(specs)
+    instances = {
+        spec.name: (
+            external
+            if spec.name == "external_links" and external is not None
+            else spec.factory(docs_root)
+        )
+        for spec in specs
+    }
 
+    if index is None:
+        index = DocumentIndex.build(docs_root, cache=cache, fields=fields)
+    missing = (fields & PARSED_FIELDS) - index.fields
+    if missing:
+        raise ValueError(f"Document index does not parse {', '.join(sorted(missing))}")
+    to_check = cache.plan(index) if cache is not None else None
+
+    result = ValidationResult(on_issue=on_issue)
+    timings: dict[str, dict[str, any]] = {}
+
+    # Checkers whose results depend only on the documents run on changed documents
+    cacheable = [spec.name for spec in specs if spec.cacheable]
+    for name in cacheable:
+        timings[name] = run_checker(instances[name], index, to_check, result)
+
+    refs = instances.get("references")
+    if refs is not None:
+        # Pages are reachable from the home page and from the mkdocs navigation
+        roots = [ROOT_PAGE, *nav_pages(Path(docs_root).parent / "mkdocs.yml")]
+        links = refs.link_graph.report(roots)
+        result.sections["links"] = links
+        result.add_stat("orphan_pages", len(links["orphans"]))
+        result.add_stat("link_clusters", len(links["clusters"]))
+
+    if cache is not None:
+        # Checkers that look at other files (e.g. link targets) declare them as dependencies
+        tracking = [
+            instances[name] for name in cacheable if hasattr(instances[name], "dependencies")
+        ]
+        issues_by_file: dict[str, list] = {}
+        for issue in result.issues:
+            issues_by_file.setdefault(issue.file, []).append(issue)
+        for doc in index:
+            if doc.rel_path in to_check:
+                dependencies = set()
+                for checker in tracking:
+                    dependencies |= checker.dependencies(doc)
+                cache.record(doc, issues_by_file.get(doc.rel_path, []), dependencies)
+            else:
+                result.extend(cache.issues(doc.rel_path, doc.formatted))
+        result.add_stat("checked_documents", len(to_check))
+        result.add_stat("cached_documents", len(index) - len(to_check))
+
+    # Other results (e.g. external links, which expire with time rather than
+    # with document changes) are kept out of the validation cache
+    for spec in specs:
+        if not spec.cacheable:
+            timings[spec.name] = run_checker(instances[spec.name], index, None, result)
+
+    result.add_stat("checkers", timings)
+    result.sort()
     return result
 
 
-def save_report(result: ValidationResult, reports_dir: Path) -> Path:
+def save_report(
+    result: ValidationResult, reports_dir: Path, unique_id: Optional[str] = None
+) -> Path:
     """Save validation report with unique filename.
 
     Args:
         result: Validation result to save
         reports_dir: Directory to save report in
+        unique_id: Run id used in the filename (default: a new random id)
 
     Returns:
         Path to saved report file
     """
     # Generate unique filename using timestamp and UUID
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    unique_id = str(uuid.uuid4())[:8]  # Use first 8 chars of UUID
+    if unique_id is None:
+        unique_id = str(uuid.uuid4())[:8]  # Use first 8 chars of UUID
     filename = f"doc_validation_{timestamp}_{unique_id}.json"
 
-    # Create report data
-    report = {
+    header = {
         "id": unique_id,
         "timestamp": datetime.now().isoformat(),
         "summary": {
-            "total_errors": len([i for i in result.issues if i.severity == Severity.ERROR]),
-            "total_warnings": len([i for i in result.issues if i.severity == Severity.WARNING]),
+            "total_errors": result.error_count,
+            "total_warnings": result.warning_count,
         },
-        "issues": [i.to_dict() for i in result.issues],
-        "stats": result.stats,
     }
+    trailer = {"stats": result.stats, **result.sections}
 
-    # Save report
+    # Write the issues one at a time instead of building the whole report as
+    # one object, which for large runs is several times the size of the issues
     report_path = reports_dir / filename
     with open(report_path, "w") as f:
-        json.dump(report, f, indent=2)
+        f.write(json.dumps(header, indent=2)[:-2])
+        f.write(',\n  "issues": [')
+        for n, issue in enumerate(result.issues):
+            f.write(",\n    " if n else "\n    ")
+            f.write(json.dumps(issue.to_dict()))
+        f.write("\n  ]" if result.issues else "]")
+        for key, value in trailer.items():
+            f.write(f",\n  {json.dumps(key)}: ")
+            f.write(json.dumps(value, indent=2, default=str).replace("\n", "\n  "))
+        f.write("\n}\n")
 
     # Create symlink to latest report
     latest_link = reports_dir / "latest.json"
@@ -92,68 +254,398 @@ def save_report(result: ValidationResult, reports_dir: Path) -> Path:
     return report_path
 
 
-def main():
-    """Main entry point."""
-    if len(sys.argv) != 2:
-        print("Usage: validate_docs.py <docs_root>")
-        sys.exit(1)
+def prune_reports(reports_dir: Path, keep: int) -> int:
+    """Delete all but the most recent JSON reports.
 
-    docs_root = sys.argv[1]
+    Args:
+        reports_dir: Directory the reports are saved in
+        keep: Number of reports to keep
 
-    # First, format all documentation
-    logger.info("Formatting documentation...")
-    import format_docs
+    Returns:
+        Number of reports deleted
+    """
+    # Report names start with their timestamp, so name order is age order
+    reports = sorted(reports_dir.glob("doc_validation_*.json"))
+    stale = reports[: max(len(reports) - keep, 0)]
+    for report in stale:
+        report.unlink()
+    return len(stale)
 
-    format_docs.main()
 
-    # Then proceed with validation
-    logger.info("Validating documentation...")
+def print_issues(issues: list) -> None:
+    """Print issues with their location, message and context (e.g. a suggested fix).
 
-    print("\nGenerating report...")
-    result = validate_docs(docs_root)
+    Args:
+        issues: Issues to print
+    """
+    for issue in issues:
+        location = f"{issue.file}:{issue.line}" if issue.line else issue.file
+        print(f"[{issue.severity}] {location}")
+        print(f"  {issue.message}")
+        if issue.context:
+            print(f"  {issue.context}")
+
+
+def watch(
+    docs_root: str,
+    index: DocumentIndex,
+    cache: ValidationCache,
+    external: Optional[ExternalLinkChecker] = None,
+    checkers: Optional[list[str]] = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> None:
+    """Re-validate the documentation whenever it changes, until interrupted.
+
+    The document index, and with it every document's headings, anchors and
+    links, stays in memory between runs. Only the files that changed are
+    read again, and the cache limits checks to the documents that changed
+    or depend on a change. Each run prints the issues that are new or fixed
+    since the previous one.
+
+    Args:
+        docs_root: Root directory containing documentation
+        index: Document index, kept up to date with the changes
+        cache: Validation cache (updated in memory after every run)
+        external: Optional checker for external links
+        checkers: Names of the registered checkers to run (default: the default ones)
+        poll_interval: Seconds between scans if the tree has to be polled
+    """
+    result = validate_docs(docs_root, index, cache, external, checkers=checkers)
+    cache.commit(index)
+    print_issues(result.issues)
+
+    with create_watcher(Path(docs_root), poll_interval) as watcher:
+        print(
+            f"\nWatching {docs_root} ({watcher.kind}): {result.error_count} errors, "
+            f"{result.warning_count} warnings. Press Ctrl+C to stop."
+        )
+        while True:
+            changed = watcher.changes()
+            start = time.perf_counter()
+            documents = index.refresh(changed)
+            previous = result
+            result = validate_docs(docs_root, index, cache, external, checkers=checkers)
+            cache.commit(index)
+            new, fixed = diff_issues(previous.issues, result.issues)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            print(
+                f"\n[{datetime.now().strftime('%H:%M:%S')}] {len(documents)} changed, "
+                f"{result.stats.get('checked_documents', len(index))} checked in "
+                f"{elapsed:.0f} ms: {len(new)} new, {len(fixed)} fixed "
+                f"({result.error_count} errors, {result.warning_count} warnings)"
+            )
+            if new:
+                print("New issues:")
+                print_issues(new)
+            if fixed:
+                print("Fixed issues:")
+                print_issues(fixed)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Validate documentation")
+    parser.add_argument("docs_root", nargs="?", help="Root directory containing documentation")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to read and parse documents (default: 1)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Validate every document instead of only those changed since the last run",
+    )
+    parser.add_argument(
+        "--no-format",
+        action="store_true",
+        help="Validate documents as they are instead of formatting them first "
+        "(use format_docs.py --check to report unformatted files)",
+    )
+    parser.add_argument(
+        "--external",
+        action="store_true",
+        help="Also check that external http(s) links resolve (requires network access)",
+    )
+    parser.add_argument(
+        "--checkers",
+        metavar="NAMES",
+        default=None,
+        help="Comma-separated checkers to run instead of the default ones (see --list-checkers)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-validate changed documents whenever files change, "
+        "printing only new and fixed issues (no formatting, reports or history)",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        metavar="SECONDS",
+        help=f"Seconds between scans in watch mode when inotify is unavailable "
+        f"(default: {DEFAULT_POLL_INTERVAL})",
+    )
+    parser.add_argument(
+        "--list-checkers",
+        action="store_true",
+        help="List the registered checkers and exit",
+    )
+    parser.add_argument(
+        "--checker-plugin",
+        action="append",
+        default=[],
+        metavar="MODULE:ATTRIBUTE",
+        help="Register the checker a CheckerSpec object defines, in addition to the built-in "
+        "ones and those installed under the doc_validation.checkers entry point group "
+        "(repeatable)",
+    )
+    parser.add_argument(
+        "--external-ttl",
+        type=float,
+        default=24,
+        metavar="HOURS",
+        help="Hours to reuse external link results before checking them again (default: 24)",
+    )
+    parser.add_argument(
+        "--diff-against",
+        metavar="RUN",
+        default=None,
+        help=f"Only list issues that are new or fixed since an earlier run "
+        f"('{LAST_RUN}' or a run id)",
+    )
+    parser.add_argument(
+        "--keep-runs",
+        type=int,
+        default=DEFAULT_KEEP_RUNS,
+        metavar="N",
+        help=f"Number of runs kept in the history and JSON reports (default: {DEFAULT_KEEP_RUNS})",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", *REPORTERS],
+        default="text",
+        help="Output format: text for people, jsonl (JSON Lines) or sarif (SARIF 2.1.0) "
+        "to stream issues to other tools as they are found (default: text)",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="PATH",
+        default=None,
+        help="Write the output to a file instead of standard output",
+    )
+    args = parser.parse_args()
+
+    try:
+        load_plugins(args.checker_plugin)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.list_checkers:
+        for spec in CHECKERS.values():
+            default = " (default)" if spec.default else ""
+            print(f"{spec.name}{default}: {spec.description}")
+            print(f"  consumes: {', '.join(sorted(spec.consumes))}")
+        return
+    if args.docs_root is None:
+        parser.error("the following arguments are required: docs_root")
+    if args.watch and (args.format != "text" or args.diff_against):
+        parser.error("--watch cannot be combined with --format or --diff-against")
+
+    names = None
+    if args.checkers is not None:
+        names = [name.strip() for name in args.checkers.split(",") if name.strip()]
+    if args.external:
+        names = [*(names or (spec.name for spec in resolve_checkers())), "external_links"]
+    try:
+        args.checkers = [spec.name for spec in resolve_checkers(names)]
+    except ValueError as e:
+        parser.error(str(e))
+
+    with contextlib.ExitStack() as stack:
+        output = sys.stdout
+        if args.output:
+            output = stack.enter_context(open(args.output, "w", encoding="utf-8"))
+        reporter = None
+        if args.format != "text":
+            reporter = REPORTERS[args.format](output, args.docs_root)
+            # Progress and summary go to the console, never into the report
+            output = sys.stderr if args.output is None else sys.stdout
+        stack.enter_context(contextlib.redirect_stdout(output))
+        run(args, reporter)
+
+
+def run(args: argparse.Namespace, reporter: Optional[Reporter] = None) -> None:
+    """Format, validate and report on the documentation.
+
+    Args:
+        args: Parsed command line arguments
+        reporter: Optional reporter to stream issues to as they are found
+    """
+    docs_root = args.docs_root
 
     # Create .reports directory in project root
     reports_dir = Path(docs_root).parent / ".reports"
     reports_dir.mkdir(exist_ok=True)
 
-    print("\nSaving results...")
-    report_path = save_report(result, reports_dir)
+    cache = None
+    cacheable = [name for name in args.checkers if CHECKERS[name].cacheable]
+    # Only what the selected checkers consume is parsed
+    fields = consumed_fields(CHECKERS[name] for name in args.checkers)
+    if not args.no_cache:
+        cache = ValidationCache.load(reports_dir / DEFAULT_CACHE_NAME, cacheable, fields)
+
+    # Read every document once, shared by the formatter and all checkers
+    index = DocumentIndex.build(docs_root, jobs=args.jobs, cache=cache, fields=fields)
+
+    # First, format changed documentation (never in watch mode, where the
+    # files are open in an editor)
+    if not args.no_format and not args.watch:
+        logger.info("Formatting documentation...")
+        format_index(index)
+
+    # Then proceed with validation
+    logger.info("Validating documentation...")
+
+    external = None
+    if "external_links" in args.checkers:
+        external_cache = ExternalLinkCache.load(
+            reports_dir / EXTERNAL_CACHE_NAME, ttl=args.external_ttl * 60 * 60
+        )
+        external = ExternalLinkChecker(cache=external_cache)
+
+    if args.watch:
+        # Watch mode always keeps results in memory, even without a cache on disk
+        watch_cache = cache or ValidationCache(reports_dir / DEFAULT_CACHE_NAME, cacheable, fields)
+        try:
+            watch(docs_root, index, watch_cache, external, args.checkers, args.poll_interval)
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+        if cache is not None:
+            cache.write()
+        if external is not None:
+            external.cache.save()
+        return
+
+    print("\nGenerating report...")
+    print("Running documentation validation...")
+    if reporter is not None:
+        reporter.start()
+    result = validate_docs(
+        docs_root,
+        index,
+        cache,
+        external,
+        reporter.issue if reporter is not None else None,
+        args.checkers,
+    )
+    if cache is not None:
+        cache.save(index)
+    if external is not None:
+        external.cache.save()
+
+    run_id = str(uuid.uuid4())[:8]
+    with ReportHistory(reports_dir / DEFAULT_HISTORY_NAME) as history:
+        diff = None
+        if args.diff_against:
+            try:
+                diff = history.diff(result, args.diff_against, args.checkers)
+            except KeyError:
+                if args.diff_against != LAST_RUN:
+                    logger.error(f"No run '{args.diff_against}' in the report history")
+                    sys.exit(2)
+                logger.warning("No earlier run in the report history to diff against")
+            except ValueError as e:
+                logger.error(str(e))
+                sys.exit(2)
+            else:
+                result.sections["diff"] = diff.to_dict()
+                if diff.not_compared:
+                    logger.warning(
+                        f"Run {diff.against} and this run ran different checkers; issues of "
+                        f"{', '.join(diff.not_compared)} are left out of the comparison"
+                    )
+
+        print("\nSaving results...")
+        history.record(run_id, result, args.checkers)
+        history.prune(args.keep_runs)
+    report_path = save_report(result, reports_dir, run_id)
+    prune_reports(reports_dir, args.keep_runs)
+    if reporter is not None:
+        reporter.finish(result)
 
     print("\nDocumentation Validation Report")
     print(f"Generated: {datetime.now().isoformat()}")
     print("\nSummary:")
     print("--------")
-    print(f"Total Errors: {len([i for i in result.issues if i.severity == Severity.ERROR])}")
-    print(f"Total Warnings: {len([i for i in result.issues if i.severity == Severity.WARNING])}")
-
-    print("\nReferences Validation")
-    print("---------------------")
-    ref_issues = [i for i in result.issues if i.checker == "references"]
-    print(f"Errors: {len([i for i in ref_issues if i.severity == Severity.ERROR])}")
-    print(f"Warnings: {len([i for i in ref_issues if i.severity == Severity.WARNING])}")
-    print("\nStatistics:")
-    for k, v in result.stats.items():
-        if k.startswith("total_"):
-            print(f"- {k}: {v}")
-
-    print("\nHealth Validation")
-    print("-----------------")
-    health_issues = [i for i in result.issues if i.checker == "health"]
-    print(f"Errors: {len([i for i in health_issues if i.severity == Severity.ERROR])}")
-    print(f"Warnings: {len([i for i in health_issues if i.severity == Severity.WARNING])}")
-    print("\nStatistics:")
-    for k, v in result.stats.items():
-        if k == "coverage_percentage":
-            print(f"- {k}: {v}")
-
-    if result.issues:
+    print(f"Total Errors: {result.error_count}")
+    print(f"Total Warnings: {result.warning_count}")
+
+    if "references" in args.checkers:
+        print("\nReferences Validation")
+        print("---------------------")
+        print(f"Errors: {result.count(Severity.ERROR, 'references')}")
+        print(f"Warnings: {result.count(Severity.WARNING, 'references')}")
+        print("\nStatistics:")
+        for k, v in result.stats.items():
+            if k.startswith("total_"):
+                print(f"- {k}: {v}")
+
+    if external is not None:
+        print("\nExternal Links")
+        print("--------------")
+        print(f"Errors: {result.count(Severity.ERROR, 'external_links')}")
+        print(f"Warnings: {result.count(Severity.WARNING, 'external_links')}")
+        print(f"Checked over the network: {result.stats['requested_external_links']}")
+
+    if "health" in args.checkers:
+        print("\nHealth Validation")
+        print("-----------------")
+        print(f"Errors: {result.count(Severity.ERROR, 'health')}")
+        print(f"Warnings: {result.count(Severity.WARNING, 'health')}")
+        print("\nStatistics:")
+        for k, v in result.stats.items():
+            if k == "coverage_percentage":
+                print(f"- {k}: {v}")
+
+    if "links" in result.sections:
+        links = result.sections["links"]
+        print("\nLink Graph")
+        print("----------")
+        print(f"Pages: {links['total_pages']}")
+        print(f"Links: {links['total_links']}")
+        print(f"Orphan pages: {len(links['orphans'])}")
+        for page in links["orphans"]:
+            print(f"- {page}")
+        print(f"Clusters: {len(links['clusters'])}")
+        for cluster in links["clusters"]:
+            print(f"- {len(cluster)} pages: {', '.join(cluster)}")
+
+    print("\nChecker Cost")
+    print("------------")
+    for name, cost in result.stats["checkers"].items():
+        print(
+            f"- {name}: {cost['wall_time']:.3f}s wall, {cost['cpu_time']:.3f}s CPU, "
+            f"{cost['files']} files, {cost['issues']} issues"
+        )
+
+    if diff is not None:
+        print(f"\nChanges since run {diff.against} ({diff.timestamp})")
+        if diff.not_compared:
+            print(f"Not compared (run by only one of the runs): {', '.join(diff.not_compared)}")
+        print(f"New issues: {len(diff.new)}")
+        print_issues(diff.new)
+        print(f"Fixed issues: {len(diff.fixed)}")
+        print_issues(diff.fixed)
+    elif result.issues and reporter is None:
         print("\nIssues:")
-        for issue in result.issues:
-            print(f"[{issue.severity}] {issue.file}")
-            print(f"  {issue.message}")
+        print_issues(result.issues)
 
     print("\nDocumentation validation complete")
-    print(f"Report saved to: {report_path}")
+    print(f"Report saved to: {report_path} (run id: {run_id})")
     print(f"Latest report symlinked at: {reports_dir}/latest.json")
 
 
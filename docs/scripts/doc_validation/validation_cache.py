@@ -0,0 +1,301 @@
+"""
+Incremental validation cache.
+
+Persists, for every markdown document, what validation extracted from it
+(front matter, headings, anchors, links), the issues found in it and the files its
+checks depended on. On the next run:
+
+1. Documents whose size and mtime are unchanged are restored without reading them
+2. Documents whose content hash is unchanged keep their issues
+3. Documents are re-checked if their content changed, or if a file or
+   directory they depend on (e.g. a link target) was added or removed, or
+   a page they link to changed its anchors since the last run
+
+Dependencies outside the docs root (``../`` links) are not part of the
+document index, so whether each of them exists is stored too and checked
+with one ``stat`` per target when the next run is planned.
+
+The cache is discarded as a whole when ``CACHE_VERSION`` changes, a
+different set of checkers is run or different document fields are parsed.
+"""
+
+import hashlib
+import json
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional
+
+from atomic_io import write_atomic
+
+from .document_index import PARSED_FIELDS, Document, DocumentIndex, outside_docs_root
+from .markdown_tokens import Heading, Link
+from .validation_types import ValidationIssue
+
+logger = logging.getLogger(__name__)
+
+# Bump when checker or formatter changes invalidate stored results
+CACHE_VERSION = 8
+
+# Default cache file name, created in the reports directory
+DEFAULT_CACHE_NAME = "validation_cache.json"
+
+
+def content_hash(data: bytes) -> str:
+    """Return the hex digest used to identify document contents."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def json_safe(value: any, _parents: Optional[set[int]] = None) -> any:
+    """Convert parsed YAML into data that can always be written as JSON.
+
+    YAML mapping keys can be dates, numbers or booleans, JSON keys only
+    strings, and ``json.dumps(default=...)`` is never applied to keys. Keys
+    are therefore turned into strings, and values JSON has no type for
+    (e.g. dates) into their string form.
+
+    Args:
+        value: Parsed YAML value
+
+    Returns:
+        Equivalent value made of dicts with string keys, lists and JSON scalars
+
+    Raises:
+        ValueError: If the value contains itself (YAML anchors allow cycles)
+    """
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if not isinstance(value, (dict, list, tuple, set)):
+        return str(value)
+    if _parents is None:
+        _parents = set()
+    if id(value) in _parents:
+        raise ValueError("Front matter refers to itself")
+    _parents.add(id(value))
+    try:
+        if isinstance(value, dict):
+            return {str(key): json_safe(item, _parents) for key, item in value.items()}
+        return [json_safe(item, _parents) for item in value]
+    finally:
+        _parents.discard(id(value))
+
+
+class ValidationCache:
+    """Per-document validation results carried over between runs."""
+
+    def __init__(
+        self, path: Path, checkers: Iterable[str] = (), fields: Iterable[str] = PARSED_FIELDS
+    ):
+        """Initialize an empty cache.
+
+        Args:
+            path: Location of the cache file
+            checkers: Names of the cacheable checkers whose issues are stored
+            fields: Parsed ``Document`` fields stored for each document (those
+                of the ``DocumentIndex`` the cache is used with)
+        """
+        self.path = path
+        self.checkers = sorted(checkers)
+        self.fields = sorted(PARSED_FIELDS.intersection(fields))
+        self.entries: dict[str, dict] = {}
+        self.files: set[str] = set()
+        # Dependencies outside the docs root that existed when the entries were committed
+        self.outside: set[str] = set()
+        self._next: dict[str, dict] = {}
+
+    @classmethod
+    def load(
+        cls, path: Path, checkers: Iterable[str] = (), fields: Iterable[str] = PARSED_FIELDS
+    ) -> "ValidationCache":
+        """Load a cache from disk, starting empty if it is missing or stale.
+
+        Args:
+            path: Location of the cache file
+            checkers: Names of the cacheable checkers run this time; a cache
+                written by a different set of checkers is stale
+            fields: Parsed ``Document`` fields needed this time; a cache
+                written with different fields is stale
+
+        Returns:
+            Loaded cache
+        """
+        cache = cls(path, checkers, fields)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cache
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable validation cache {path}: {str(e)}")
+            return cache
+
+        if (
+            data.get("version") != CACHE_VERSION
+            or data.get("checkers") != cache.checkers
+            or data.get("fields") != cache.fields
+        ):
+            return cache
+
+        cache.entries = data.get("entries", {})
+        cache.files = set(data.get("files", []))
+        cache.outside = set(data.get("outside", []))
+        return cache
+
+    def restore(self, path: Path, rel_path: str) -> Optional[Document]:
+        """Rebuild a document from the cache if the file is unchanged on disk.
+
+        Args:
+            path: Absolute path to the file
+            rel_path: Path relative to the docs root
+
+        Returns:
+            Cached document, or None if the file must be read
+        """
+        entry = self.entries.get(rel_path)
+        if entry is None:
+            return None
+        stat = path.stat()
+        if entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+            return None
+        return Document(
+            path=path,
+            rel_path=rel_path,
+            front_matter=entry["front_matter"],
+            front_matter_error=entry["front_matter_error"],
+            headings=[Heading(*heading) for heading in entry["headings"]],
+            anchors=set(entry["anchors"]),
+            links=[Link(*link) for link in entry["links"]],
+            error=entry["error"],
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            cached=True,
+            formatted=entry["formatted"],
+        )
+
+    def plan(self, index: DocumentIndex) -> set[str]:
+        """Work out which documents need to be checked again.
+
+        Args:
+            index: Document index of the current run
+
+        Returns:
+            Relative paths of documents to re-check
+        """
+        changed_files = self.files ^ (index.files | index.directories)
+        to_check = set()
+        for doc in index:
+            entry = self.entries.get(doc.rel_path)
+            if entry is None:
+                to_check.add(doc.rel_path)
+            elif not doc.cached and content_hash(doc.raw) != entry["sha256"]:
+                to_check.add(doc.rel_path)
+                if set(entry["anchors"]) != doc.anchors:
+                    changed_files.add(doc.rel_path)
+
+        exists: dict[str, bool] = {}
+        for doc in index:
+            entry = self.entries.get(doc.rel_path)
+            if entry is None:
+                continue
+            if changed_files.intersection(entry["dependencies"]):
+                to_check.add(doc.rel_path)
+                continue
+            for dependency in entry["dependencies"]:
+                if not outside_docs_root(dependency):
+                    continue
+                if dependency not in exists:
+                    exists[dependency] = (index.docs_root / dependency).exists()
+                if exists[dependency] != (dependency in self.outside):
+                    to_check.add(doc.rel_path)
+                    break
+        return to_check
+
+    def issues(self, rel_path: str, formatted: bool = False) -> list[ValidationIssue]:
+        """Return the cached issues of a document and carry its entry over.
+
+        Args:
+            rel_path: Path relative to the docs root
+            formatted: Whether the document was found to be formatted this run
+
+        Returns:
+            Issues found in the document on the run that last checked it
+        """
+        entry = self.entries[rel_path]
+        if formatted and not entry["formatted"]:
+            entry = {**entry, "formatted": True}
+        self._next[rel_path] = entry
+        return [ValidationIssue.from_dict(issue) for issue in entry["issues"]]
+
+    def record(self, doc: Document, issues: list[ValidationIssue], dependencies: set[str]) -> None:
+        """Record the result of checking a document.
+
+        Args:
+            doc: Checked document
+            issues: Issues found in the document
+            dependencies: Relative paths of files the checks depended on
+        """
+        try:
+            front_matter = json_safe(doc.front_matter)
+        except ValueError as e:
+            # Left out of the cache, so the document is simply checked again next run
+            logger.info(f"Not caching {doc.rel_path}: {str(e)}")
+            return
+        entry = self.entries.get(doc.rel_path)
+        self._next[doc.rel_path] = {
+            "size": doc.size,
+            "mtime_ns": doc.mtime_ns,
+            "sha256": entry["sha256"] if doc.cached else content_hash(doc.raw),
+            "front_matter": front_matter,
+            "front_matter_error": doc.front_matter_error,
+            "headings": doc.headings,
+            "anchors": sorted(doc.anchors),
+            "links": doc.links,
+            "error": doc.error,
+            "formatted": doc.formatted,
+            "issues": [issue.to_dict() for issue in issues],
+            "dependencies": sorted(dependencies),
+        }
+
+    def commit(self, index: DocumentIndex) -> None:
+        """Make the entries recorded or carried over this run the current ones.
+
+        The next ``plan`` compares against them, without anything being written
+        to disk (see ``write``).
+
+        Args:
+            index: Document index of the current run
+        """
+        self.entries = self._next
+        self.files = index.files | index.directories
+        outside = {
+            dependency
+            for entry in self.entries.values()
+            for dependency in entry["dependencies"]
+            if outside_docs_root(dependency)
+        }
+        self.outside = {path for path in outside if (index.docs_root / path).exists()}
+        self._next = {}
+
+    def save(self, index: DocumentIndex) -> None:
+        """Commit the entries recorded or carried over this run and write them.
+
+        Args:
+            index: Document index of the current run
+        """
+        self.commit(index)
+        self.write()
+
+    def write(self) -> None:
+        """Write the current entries to disk, replacing the old cache."""
+        data = {
+            "version": CACHE_VERSION,
+            "checkers": self.checkers,
+            "fields": self.fields,
+            "files": sorted(self.files),
+            "outside": sorted(self.outside),
+            "entries": dict(sorted(self.entries.items())),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Front matter may hold dates, which are stored as strings
+        write_atomic(
+            self.path, json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+        )
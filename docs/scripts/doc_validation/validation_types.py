@@ -12,6 +12,7 @@ These types ensure consistent handling of validation results across all validato
 and provide a unified way to report and track documentation issues.
 """
 
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -32,10 +33,12 @@ class Severity(Enum):
     INFO = "info"
 
 
-@dataclass
 class ValidationIssue:
     """Represents a single validation issue found during checks.
 
+    Issues use ``__slots__`` instead of a per-instance ``__dict__``, since a
+    run over a badly broken tree can produce hundreds of thousands of them.
+
     Attributes:
         message: Description of the issue
         file: Path to the file where the issue was found (relative to docs root)
@@ -45,12 +48,39 @@ class ValidationIssue:
         checker: Name of the validator that found this issue
     """
 
-    message: str
-    file: str
-    line: Optional[int] = None
-    severity: Severity = Severity.ERROR
-    context: Optional[str] = None
-    checker: str = "unknown"
+    __slots__ = ("message", "file", "line", "severity", "context", "checker")
+
+    def __init__(
+        self,
+        message: str,
+        file: str,
+        line: Optional[int] = None,
+        severity: Severity = Severity.ERROR,
+        context: Optional[str] = None,
+        checker: str = "unknown",
+    ):
+        self.message = message
+        self.file = file
+        self.line = line
+        self.severity = severity
+        self.context = context
+        self.checker = checker
+
+    def _fields(self) -> tuple:
+        """Return the field values in declaration order."""
+        return (self.message, self.file, self.line, self.severity, self.context, self.checker)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ValidationIssue):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self) -> int:
+        return hash(self._fields())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"ValidationIssue({fields})"
 
     def to_dict(self) -> dict[str, any]:
         """Convert the issue to a dictionary.
@@ -67,24 +97,106 @@ class ValidationIssue:
             "checker": self.checker,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, any]) -> "ValidationIssue":
+        """Create an issue from its dictionary representation.
+
+        Args:
+            data: Dictionary as returned by ``to_dict``
+
+        Returns:
+            Validation issue
+        """
+        return cls(
+            message=data["message"],
+            file=data["file"],
+            line=data["line"],
+            severity=Severity(data["severity"]),
+            context=data["context"],
+            checker=data["checker"],
+        )
+
 
 @dataclass
 class ValidationResult:
     """Collection of validation issues and statistics from a validation run.
 
     This class serves as both a container for validation issues and a way to
-    track statistics about the validation run. It provides helper methods for
-    adding issues and computing issue counts by severity.
+    track statistics about the validation run. Issues are also bucketed by
+    severity and by checker as they are added, so counts and filtered views
+    never rescan the whole list. Always add issues through ``add``,
+    ``add_issue``, ``extend`` or ``merge`` rather than by appending to
+    ``issues`` directly, so the buckets stay in step.
 
     Attributes:
         issues: List of validation issues found
         stats: Dictionary of validation statistics (e.g., coverage percentage)
+        sections: Additional report sections keyed by name (e.g., the link graph)
         timestamp: When the validation was performed
+        on_issue: Optional callback invoked with every issue as it is added,
+            used to stream issues out before validation finishes
     """
 
     issues: list[ValidationIssue] = field(default_factory=list)
     stats: dict[str, any] = field(default_factory=dict)
+    sections: dict[str, any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=datetime.now)
+    on_issue: Optional[Callable[[ValidationIssue], None]] = field(
+        default=None, repr=False, compare=False
+    )
+    _by_severity: dict[Severity, list[ValidationIssue]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _by_checker: dict[str, dict[Severity, list[ValidationIssue]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self):
+        """Index the issues the result was created with."""
+        self._reindex()
+
+    def _reindex(self) -> None:
+        """Rebuild the severity and checker buckets from the issue list."""
+        self._by_severity = {}
+        self._by_checker = {}
+        for issue in self.issues:
+            self._index(issue)
+
+    def add(self, issue: ValidationIssue) -> None:
+        """Add an existing validation issue.
+
+        Args:
+            issue: Issue to add
+        """
+        self.issues.append(issue)
+        self._index(issue)
+        if self.on_issue is not None:
+            self.on_issue(issue)
+
+    def _index(self, issue: ValidationIssue) -> None:
+        """File an issue under its severity and checker."""
+        severity = issue.severity
+        bucket = self._by_severity.get(severity)
+        if bucket is None:
+            bucket = self._by_severity[severity] = []
+        bucket.append(issue)
+
+        checker_buckets = self._by_checker.get(issue.checker)
+        if checker_buckets is None:
+            checker_buckets = self._by_checker[issue.checker] = {}
+        bucket = checker_buckets.get(severity)
+        if bucket is None:
+            bucket = checker_buckets[severity] = []
+        bucket.append(issue)
+
+    def extend(self, issues: Iterable[ValidationIssue]) -> None:
+        """Add several existing validation issues.
+
+        Args:
+            issues: Issues to add
+        """
+        for issue in issues:
+            self.add(issue)
 
     def add_issue(
         self,
@@ -105,7 +217,7 @@ class ValidationResult:
             context: Optional additional context
             checker: Name of the validator that found this issue
         """
-        self.issues.append(
+        self.add(
             ValidationIssue(
                 message=message,
                 file=file,
@@ -125,25 +237,88 @@ class ValidationResult:
         """
         self.stats[key] = value
 
+    def count(self, severity: Optional[Severity] = None, checker: Optional[str] = None) -> int:
+        """Count issues, optionally only those of one severity and/or checker.
+
+        Args:
+            severity: Only count issues of this severity
+            checker: Only count issues found by this checker
+
+        Returns:
+            Number of matching issues
+        """
+        if checker is not None:
+            checker_buckets = self._by_checker.get(checker, {})
+            if severity is not None:
+                return len(checker_buckets.get(severity, ()))
+            return sum(len(bucket) for bucket in checker_buckets.values())
+        if severity is not None:
+            return len(self._by_severity.get(severity, ()))
+        return len(self.issues)
+
+    def issues_for(
+        self, severity: Optional[Severity] = None, checker: Optional[str] = None
+    ) -> list[ValidationIssue]:
+        """Return issues of one severity and/or checker, in the order of ``issues``.
+
+        Args:
+            severity: Only return issues of this severity
+            checker: Only return issues found by this checker
+
+        Returns:
+            Matching issues (do not modify the returned list)
+        """
+        if checker is not None:
+            checker_buckets = self._by_checker.get(checker, {})
+            if severity is not None:
+                return checker_buckets.get(severity, [])
+            if len(checker_buckets) == 1:
+                return next(iter(checker_buckets.values()))
+            return [issue for issue in self.issues if issue.checker == checker]
+        if severity is not None:
+            return self._by_severity.get(severity, [])
+        return self.issues
+
+    @property
+    def checkers(self) -> list[str]:
+        """Names of the checkers that reported issues, in order of their first issue."""
+        return list(self._by_checker)
+
     @property
     def has_errors(self) -> bool:
         """Check if any errors were found during validation."""
-        return any(i.severity == Severity.ERROR for i in self.issues)
+        return self.error_count > 0
 
     @property
     def error_count(self) -> int:
         """Get the total number of errors."""
-        return sum(1 for i in self.issues if i.severity == Severity.ERROR)
+        return self.count(Severity.ERROR)
 
     @property
     def warning_count(self) -> int:
         """Get the total number of warnings."""
-        return sum(1 for i in self.issues if i.severity == Severity.WARNING)
+        return self.count(Severity.WARNING)
 
     @property
     def info_count(self) -> int:
         """Get the total number of info messages."""
-        return sum(1 for i in self.issues if i.severity == Severity.INFO)
+        return self.count(Severity.INFO)
+
+    def sort(self) -> None:
+        """Sort issues by file, line, checker and message.
+
+        Gives reports a stable order no matter how the work was split up.
+        """
+        self.issues.sort(
+            key=lambda i: (
+                i.file,
+                -1 if i.line is None else i.line,
+                i.checker,
+                i.severity.value,
+                i.message,
+            )
+        )
+        self._reindex()
 
     def merge(self, other: "ValidationResult") -> None:
         """Merge another validation result into this one.
@@ -151,5 +326,6 @@ class ValidationResult:
         Args:
             other: Another ValidationResult to merge in
         """
-        self.issues.extend(other.issues)
+        self.extend(other.issues)
         self.stats.update(other.stats)
+        self.sections.update(other.sections)
@@ -0,0 +1,249 @@
+"""
+File system change notification for watch mode.
+
+Reports which paths under the docs root changed, so only those are re-read
+and re-validated:
+
+1. On Linux, inotify through ``ctypes`` (no extra dependency), with one watch
+   per directory, added as directories appear
+2. Elsewhere, or when inotify is unavailable (e.g. the per-user watch limit
+   is reached), polling: file sizes and modification times are compared at a
+   fixed interval
+
+Both report paths relative to the docs root, in batches: after the first
+change, changes keep being collected until none arrive for a short settle
+time, so an editor saving through a temporary file and a rename causes a
+single re-validation.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds without further changes before a batch of changes is reported
+SETTLE_TIME = 0.05
+
+# Default seconds between scans of the polling watcher
+DEFAULT_POLL_INTERVAL = 1.0
+
+# inotify event flags (<sys/inotify.h>)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+# Events that change what a directory contains or what a file holds
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# struct inotify_event header: wd, mask, cookie, len (followed by the name)
+EVENT_HEADER = struct.Struct("iIII")
+
+# Bytes read from the inotify descriptor at a time
+READ_SIZE = 64 * 1024
+
+
+class Watcher(ABC):
+    """Reports paths under a docs root that changed."""
+
+    # Short name of the mechanism, shown to the user
+    kind = "unknown"
+
+    def __init__(self, docs_root: Path):
+        """Initialize the watcher.
+
+        Args:
+            docs_root: Root directory containing documentation files
+        """
+        self.docs_root = docs_root
+
+    @abstractmethod
+    def changes(self, timeout: Optional[float] = None) -> set[str]:
+        """Wait for changes.
+
+        Args:
+            timeout: Seconds to wait for a first change (default: forever)
+
+        Returns:
+            Relative paths of the files and directories that were created,
+            modified, deleted or moved (empty if the timeout passed first);
+            ``.`` stands for the whole tree when individual changes were lost
+        """
+
+    def close(self) -> None:
+        """Stop watching."""
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class InotifyWatcher(Watcher):
+    """Watcher using Linux inotify."""
+
+    kind = "inotify"
+
+    def __init__(self, docs_root: Path):
+        """Start watching every directory under the docs root.
+
+        Args:
+            docs_root: Root directory containing documentation files
+
+        Raises:
+            OSError: If inotify is not available or a watch cannot be added
+        """
+        super().__init__(docs_root)
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1: {os.strerror(errno)}")
+        self.watches: dict[int, str] = {}
+        try:
+            self._watch_tree(".")
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, rel_dir: str) -> None:
+        """Add watches to a directory and all directories below it."""
+        for dirpath, _, _ in os.walk(self.docs_root / rel_dir):
+            path = os.fsencode(dirpath)
+            wd = self._libc.inotify_add_watch(self.fd, path, WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, f"inotify_add_watch {dirpath}: {os.strerror(errno)}")
+            self.watches[wd] = Path(dirpath).relative_to(self.docs_root).as_posix()
+
+    def _read(self, changed: set[str]) -> None:
+        """Read the pending events and add the paths they concern."""
+        try:
+            data = os.read(self.fd, READ_SIZE)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changed.add(".")
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            rel_dir = self.watches.get(wd)
+            if rel_dir is None or not name:
+                continue
+            rel_path = (Path(rel_dir) / os.fsdecode(name)).as_posix()
+            changed.add(rel_path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    self._watch_tree(rel_path)
+                except OSError as e:
+                    # Gone again already, or out of watches; the next batch will tell
+                    logger.warning(f"Could not watch {rel_path}: {str(e)}")
+
+    def changes(self, timeout: Optional[float] = None) -> set[str]:
+        """Wait for changes (see ``Watcher.changes``)."""
+        changed: set[str] = set()
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return changed
+        while True:
+            self._read(changed)
+            if not select.select([self.fd], [], [], SETTLE_TIME)[0]:
+                return changed
+
+    def close(self) -> None:
+        """Stop watching."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher(Watcher):
+    """Watcher comparing snapshots of the tree at a fixed interval."""
+
+    kind = "polling"
+
+    def __init__(self, docs_root: Path, interval: float = DEFAULT_POLL_INTERVAL):
+        """Take the first snapshot of the docs root.
+
+        Args:
+            docs_root: Root directory containing documentation files
+            interval: Seconds between scans
+        """
+        super().__init__(docs_root)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[bool, int, int]]:
+        """Return whether each path is a directory, and its size and mtime."""
+        snapshot = {}
+        for dirpath, _, filenames in os.walk(self.docs_root):
+            rel_dir = Path(dirpath).relative_to(self.docs_root)
+            snapshot[rel_dir.as_posix()] = (True, 0, 0)
+            for name in filenames:
+                try:
+                    stat = os.stat(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+                snapshot[(rel_dir / name).as_posix()] = (False, stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def changes(self, timeout: Optional[float] = None) -> set[str]:
+        """Wait for changes (see ``Watcher.changes``)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay < 0:
+                    return set()
+            time.sleep(delay)
+            snapshot = self._scan()
+            changed = {
+                path
+                for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = snapshot
+            if changed:
+                return changed
+
+
+def create_watcher(docs_root: Path, poll_interval: float = DEFAULT_POLL_INTERVAL) -> Watcher:
+    """Create the best available watcher.
+
+    Args:
+        docs_root: Root directory containing documentation files
+        poll_interval: Seconds between scans if polling has to be used
+
+    Returns:
+        An inotify watcher, or a polling watcher if inotify is unavailable
+    """
+    try:
+        return InotifyWatcher(docs_root)
+    except (OSError, AttributeError) as e:
+        # AttributeError: the C library has no inotify functions
+        logger.info(f"inotify unavailable ({str(e)}), polling every {poll_interval}s instead")
+        return PollingWatcher(docs_root, poll_interval)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""Image pipeline benchmark.
+
+Generates a reproducible synthetic image corpus and measures each phase of
+``image_processing.py`` against it:
+
+1. discovery - walking the tree for image files
+2. check - inspecting every image
+3. dry-run - reporting issues for images needing work
+4. process - fixing every image that needs work
+5. check with the manifest - cold (hashing every file), then warm
+
+Peak RSS figures are high-water marks, so they include corpus generation.
+CPU time covers this process and the worker processes of the phase, which
+have all exited by the time it ends.
+
+Results (per-phase timings, images/s, MB/s and peak RSS) are written as
+JSON so runs can be compared over time.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import image_processing
+from image_manifest import ImageManifest
+from PIL import Image, PngImagePlugin
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# (width, height) choices with their relative weights
+CORPUS_SIZES = [((320, 240), 4), ((800, 600), 4), ((1600, 1200), 3), ((4000, 3000), 1)]
+
+# Extension and Pillow save options for each generated format
+CORPUS_FORMATS = {
+    "jpg": {"quality": 90},
+    "png": {},
+    "gif": {},
+    "tiff": {},
+    "bmp": {},
+}
+
+# DPI values written into generated images (None writes no DPI)
+CORPUS_DPIS = [72, 96, 300, None]
+
+# Directory nesting of the generated corpus
+CORPUS_SUBDIRS = ["", "screenshots", "screenshots/ui", "art", "art/concepts/large"]
+
+
+def _peak_rss_mb() -> dict:
+    """Return peak resident set size of this process and its workers in MB."""
+    if resource is None:
+        return {}
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+def _cpu_seconds() -> tuple[float, float]:
+    """Return CPU time used so far by this process and by its exited workers."""
+    if resource is None:
+        return time.process_time(), 0.0
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time(), children.ru_utime + children.ru_stime
+
+
+def _make_image(rng: random.Random, size: tuple[int, int], mode: str) -> Image.Image:
+    """Create a noisy gradient image that compresses like real content."""
+    # Noise comes from the seeded generator; Image.effect_noise is not reproducible
+    noise = Image.frombytes("L", size, rng.randbytes(size[0] * size[1]))
+    noise = Image.blend(Image.new("L", size, 128), noise, rng.uniform(0.1, 0.5))
+    gradient = Image.linear_gradient("L").resize(size)
+    channels = [Image.blend(noise, gradient, rng.random()) for _ in range(3)]
+    img = Image.merge("RGB", channels)
+    if mode == "RGBA":
+        img.putalpha(gradient)
+    elif mode == "P":
+        img = img.convert("P", palette=Image.Palette.ADAPTIVE)
+    return img
+
+
+def _metadata_payload(rng: random.Random) -> dict[str, str]:
+    """Pick a random set of metadata fields, possibly empty."""
+    fields = {
+        "Software": "Midjourney v6",
+        "Artist": f"user-{rng.randint(1000, 9999)}",
+        "ImageDescription": "prompt: " + " ".join(rng.choice("abcdefgh") * 5 for _ in range(40)),
+    }
+    return {k: v for k, v in fields.items() if rng.random() < 0.5}
+
+
+def generate_corpus(directory: Path, count: int, seed: int) -> list[Path]:
+    """Generate a synthetic image corpus.
+
+    Args:
+        directory: Directory to create the corpus in
+        count: Number of images to generate
+        seed: Random seed, so the same arguments always give the same corpus
+
+    Returns:
+        Paths of the generated images
+    """
+    rng = random.Random(seed)
+    sizes, weights = zip(*CORPUS_SIZES)
+    exif_tags = {"Software": 0x0131, "Artist": 0x013B, "ImageDescription": 0x010E}
+    paths = []
+
+    for i in range(count):
+        ext = rng.choice(list(CORPUS_FORMATS))
+        subdir = directory / rng.choice(CORPUS_SUBDIRS)
+        subdir.mkdir(parents=True, exist_ok=True)
+        path = subdir / f"image_{i:05d}.{ext}"
+
+        mode = "RGB"
+        if ext == "png":
+            mode = rng.choice(["RGB", "RGBA", "P"])
+        elif ext == "gif":
+            mode = "P"
+        img = _make_image(rng, rng.choices(sizes, weights)[0], mode)
+
+        save_kwargs = dict(CORPUS_FORMATS[ext])
+        dpi = rng.choice(CORPUS_DPIS)
+        if dpi is not None and ext != "gif":
+            save_kwargs["dpi"] = (dpi, dpi)
+
+        payload = _metadata_payload(rng)
+        if payload and ext in ("jpg", "png", "tiff"):
+            exif = Image.Exif()
+            for key, value in payload.items():
+                exif[exif_tags[key]] = value
+            save_kwargs["exif"] = exif.tobytes()
+        if payload and ext == "png":
+            info = PngImagePlugin.PngInfo()
+            for key, value in payload.items():
+                info.add_text(key, value)
+            save_kwargs["pnginfo"] = info
+        if payload and ext == "gif":
+            save_kwargs["comment"] = "; ".join(payload.values()).encode("utf-8")
+
+        img.save(path, **save_kwargs)
+        paths.append(path)
+
+    return paths
+
+
+def _measure(name: str, func, image_count: int, total_bytes: int) -> tuple[dict, object]:
+    """Time one phase and compute its throughput."""
+    wall_start = time.perf_counter()
+    cpu_start, workers_cpu_start = _cpu_seconds()
+    value = func()
+    wall = time.perf_counter() - wall_start
+    cpu_end, workers_cpu_end = _cpu_seconds()
+    cpu = cpu_end - cpu_start
+    workers_cpu = workers_cpu_end - workers_cpu_start
+
+    megabytes = total_bytes / (1024 * 1024)
+    stage = {
+        "name": name,
+        "images": image_count,
+        "megabytes": round(megabytes, 2),
+        "wall_seconds": round(wall, 4),
+        "cpu_seconds": round(cpu + workers_cpu, 4),
+        "parent_cpu_seconds": round(cpu, 4),
+        "workers_cpu_seconds": round(workers_cpu, 4) if resource is not None else None,
+        "images_per_second": round(image_count / wall, 1) if wall else None,
+        "megabytes_per_second": round(megabytes / wall, 2) if wall else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    return stage, value
+
+
+def run_benchmark(corpus_dir: Path, jobs: int) -> dict:
+    """Run every pipeline phase against a corpus.
+
+    The process phase rewrites the corpus in place.
+
+    Args:
+        corpus_dir: Directory holding the corpus
+        jobs: Number of worker processes
+
+    Returns:
+        Benchmark results
+    """
+    stages = []
+
+    stage, image_files = _measure(
+        "discovery", lambda: image_processing.get_image_files(corpus_dir), 0, 0
+    )
+    total_bytes = sum(path.stat().st_size for path in image_files)
+    count = len(image_files)
+    megabytes = total_bytes / (1024 * 1024)
+    wall = stage["wall_seconds"] or 1e-9
+    stage.update(
+        images=count,
+        megabytes=round(megabytes, 2),
+        images_per_second=round(count / wall, 1),
+        megabytes_per_second=round(megabytes / wall, 2),
+    )
+    stages.append(stage)
+
+    stage, inspections = _measure(
+        "check",
+        lambda: image_processing.inspect_images(image_files, jobs),
+        count,
+        total_bytes,
+    )
+    stages.append(stage)
+    needs_processing = [m for m in inspections if m.needs_processing()]
+    needs_bytes = sum(m.path.stat().st_size for m in needs_processing)
+
+    stage, _ = _measure(
+        "dry_run",
+        lambda: [m.log_issues() for m in needs_processing],
+        len(needs_processing),
+        needs_bytes,
+    )
+    stages.append(stage)
+
+    stage, results = _measure(
+        "process",
+        lambda: image_processing.map_images(
+            image_processing.process_inspection, needs_processing, jobs
+        ),
+        len(needs_processing),
+        needs_bytes,
+    )
+    stage["failures"] = len(results) - sum(results)
+    stages.append(stage)
+
+    settings = {"max_width": image_processing.MAX_WIDTH, "target_dpi": image_processing.TARGET_DPI}
+    manifest_path = corpus_dir.parent / "benchmark_manifest.json"
+    # Against the processed corpus: the cold run hashes everything, the warm one skips it all.
+    # A manifest left in a reused --workdir would make the cold run warm.
+    manifest_path.unlink(missing_ok=True)
+    for name in ("check_manifest_cold", "check_manifest_warm"):
+
+        def check_with_manifest():
+            manifest = ImageManifest.load(manifest_path, corpus_dir, settings)
+            image_processing.inspect_images(image_files, jobs, manifest)
+            manifest.save()
+
+        stage, _ = _measure(name, check_with_manifest, count, total_bytes)
+        stages.append(stage)
+
+    return {
+        "corpus": {"images": count, "megabytes": round(total_bytes / (1024 * 1024), 2)},
+        "needs_processing": len(needs_processing),
+        "stages": stages,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the image pipeline against a synthetic corpus"
+    )
+    parser.add_argument(
+        "--count", type=int, default=200, help="Number of images to generate (default: 200)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Corpus random seed (default: 0)")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--workdir",
+        type=str,
+        default=None,
+        help="Directory to generate the corpus in (default: a temporary directory)",
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="Write results to this file instead of stdout"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own log output")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="img_bench_"))
+    corpus_dir = workdir / "corpus"
+    try:
+        if corpus_dir.exists():
+            shutil.rmtree(corpus_dir)
+        start = time.perf_counter()
+        generate_corpus(corpus_dir, args.count, args.seed)
+        generation_seconds = time.perf_counter() - start
+
+        results = {
+            "settings": {"count": args.count, "seed": args.seed, "jobs": args.jobs},
+            "generation_seconds": round(generation_seconds, 2),
+            **run_benchmark(corpus_dir, args.jobs),
+        }
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Persistent manifest of image check results.
+
+The manifest records, for every image under a root directory, its size,
+modification time, content hash and the verdict of the last check. It lets
+the image tooling skip files that are known to be clean:
+
+1. Files whose size and mtime are unchanged are trusted without reading them
+2. Files whose mtime changed but whose content hash matches keep their verdict
+3. Everything else is inspected again
+
+The manifest is discarded as a whole when the processing settings it was
+built with (maximum width, target DPI, manifest version) change.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from atomic_io import write_atomic
+
+logger = logging.getLogger(__name__)
+
+# Bump when the check logic changes in a way that invalidates stored verdicts
+MANIFEST_VERSION = 1
+
+# Default manifest file name, created in the scanned root directory
+DEFAULT_MANIFEST_NAME = ".image_manifest.json"
+
+VERDICT_CLEAN = "clean"
+VERDICT_NEEDS_PROCESSING = "needs_processing"
+
+
+def content_hash(data: bytes) -> str:
+    """Return the hex digest used to identify image contents."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ImageManifest:
+    """Per-file record of the last check result for a directory of images."""
+
+    def __init__(self, path: Path, root: Path, settings: dict):
+        """Initialize an empty manifest.
+
+        Args:
+            path: Location of the manifest file
+            root: Directory image paths are stored relative to
+            settings: Processing settings the verdicts depend on
+        """
+        self.path = path
+        self.root = root
+        self.settings = {"version": MANIFEST_VERSION, **settings}
+        self.entries: dict[str, dict] = {}
+        self._seen: set[str] = set()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path, root: Path, settings: dict) -> "ImageManifest":
+        """Load a manifest from disk, starting fresh if it is missing or stale.
+
+        Args:
+            path: Location of the manifest file
+            root: Directory image paths are stored relative to
+            settings: Processing settings the verdicts depend on
+
+        Returns:
+            Loaded manifest
+        """
+        manifest = cls(path, root, settings)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return manifest
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable manifest {path}: {str(e)}")
+            return manifest
+
+        if data.get("settings") != manifest.settings:
+            logger.info("Image settings changed, re-checking all images")
+            manifest._dirty = True
+            return manifest
+
+        manifest.entries = data.get("entries", {})
+        return manifest
+
+    def _key(self, image_path: Path) -> str:
+        """Return the manifest key for an image path."""
+        try:
+            return image_path.relative_to(self.root).as_posix()
+        except ValueError:
+            return image_path.as_posix()
+
+    def get(self, image_path: Path) -> Optional[dict]:
+        """Return the stored entry for an image, if any."""
+        key = self._key(image_path)
+        self._seen.add(key)
+        return self.entries.get(key)
+
+    def is_unchanged_clean(self, image_path: Path, stat: os.stat_result) -> bool:
+        """Check if an image is recorded clean and its size and mtime still match.
+
+        Args:
+            image_path: Path to the image
+            stat: Current ``stat()`` of the image
+
+        Returns:
+            True if the image can be skipped without reading it
+        """
+        entry = self.get(image_path)
+        return (
+            entry is not None
+            and entry["verdict"] == VERDICT_CLEAN
+            and entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+        )
+
+    def record(self, image_path: Path, stat: os.stat_result, digest: str, verdict: str) -> None:
+        """Record the result of checking an image.
+
+        Args:
+            image_path: Path to the image
+            stat: ``stat()`` of the image at the time it was checked
+            digest: Content hash of the image
+            verdict: Check verdict (clean or needs_processing)
+        """
+        key = self._key(image_path)
+        self._seen.add(key)
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+            "verdict": verdict,
+        }
+        if self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest atomically, dropping entries for images not seen this run."""
+        stale = set(self.entries) - self._seen
+        for key in stale:
+            del self.entries[key]
+        if not (self._dirty or stale):
+            return
+
+        data = {"settings": self.settings, "entries": dict(sorted(self.entries.items()))}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+        self._dirty = False
@@ -15,10 +15,37 @@ Supports common image formats including:
 """
 
 import argparse
+import io
 import logging
+import os
 import sys
+from collections.abc import Collection, Iterable, Iterator, Sized
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-
+from typing import Optional
+
+# atomic_io is shared with the documentation scripts, one directory up
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from atomic_io import write_atomic
+from image_manifest import (
+    DEFAULT_MANIFEST_NAME,
+    VERDICT_CLEAN,
+    VERDICT_NEEDS_PROCESSING,
+    ImageManifest,
+    content_hash,
+)
+from image_variants import (
+    DEFAULT_VARIANT_FORMATS,
+    DEFAULT_VARIANT_WIDTHS,
+    VARIANT_SAVE_OPTIONS,
+    available_formats,
+    generate_variants,
+    load_variant_index,
+    write_variant_index,
+)
+from lossless_strip import LOSSLESS_STRIPPERS
 from PIL import ExifTags, Image
 
 # Configure logging
@@ -29,174 +56,593 @@ logger = logging.getLogger(__name__)
 MAX_WIDTH = 800
 TARGET_DPI = 72
 
+# Resampling keeps at least this factor above the target size before the final filter
+REDUCING_GAP = 2
+
+# File extensions treated as images, matched case-insensitively
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".tiff", ".bmp"}
+
+# Directory names never searched for images
+DEFAULT_EXCLUDED_DIRS = {".git", "site", "node_modules"}
+
+# Items handed to each worker at once when the item count is not known upfront
+DEFAULT_CHUNKSIZE = 4
+
+# Variant directory, relative to the scanned root, used when --variant-dir is not given
+DEFAULT_VARIANT_DIR = "assets/variants"
+
+# Info entries that affect how pixels render and must survive metadata stripping
+PRESERVED_INFO_KEYS = {"transparency"}
+
 
 def is_close_enough(a, b, rel_tol=1e-2):
     """Check if two numbers are close enough, accounting for floating point precision."""
     return abs(a - b) <= rel_tol * abs(b)
 
 
+class _RecordCollector(logging.Handler):
+    """Logging handler that buffers records so a worker can ship them to the parent."""
+
+    def __init__(self):
+        """Initialize with an empty record buffer."""
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        """Buffer a record, flattening any exception info so it can be pickled."""
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.msg = record.getMessage()
+        record.args = None
+        self.records.append(record)
+
+
+def _run_captured(func, item, **kwargs):
+    """Run ``func`` on one image inside a worker, capturing its log output.
+
+    Args:
+        func: Per-image function to run
+        item: Image path or inspection passed to ``func``
+        **kwargs: Extra keyword arguments for ``func``
+
+    Returns:
+        Tuple of (result of ``func``, list of captured log records)
+    """
+    collector = _RecordCollector()
+    root = logging.getLogger()
+    handlers = root.handlers
+    root.handlers = [collector]
+    try:
+        return func(item, **kwargs), collector.records
+    finally:
+        root.handlers = handlers
+
+
+def map_images(func, items: Iterable, jobs: int = 1, **kwargs) -> list:
+    """Apply a per-image function to every item, optionally over a process pool.
+
+    Results are returned in input order. Log records emitted by workers are
+    replayed in the parent in that same order, so output is identical no
+    matter how many jobs are used. ``items`` may be a generator, in which case
+    workers start on the first items while the rest are still being produced.
+
+    Args:
+        func: Module-level callable taking an image path or inspection as first argument
+        items: Image paths or inspections to process
+        jobs: Number of worker processes (1 runs everything in-process)
+        **kwargs: Extra keyword arguments for ``func``
+
+    Returns:
+        List of ``func`` results, one per input item
+    """
+    workers = jobs
+    chunksize = DEFAULT_CHUNKSIZE
+    if isinstance(items, Sized):
+        workers = min(jobs, len(items))
+        chunksize = max(1, len(items) // (workers * 4)) if workers else 1
+
+    if workers <= 1:
+        return [func(item, **kwargs) for item in items]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        captured = executor.map(partial(_run_captured, func, **kwargs), items, chunksize=chunksize)
+        for result, records in captured:
+            for record in records:
+                logging.getLogger(record.name).handle(record)
+            results.append(result)
+    return results
+
+
 class ImageMetadata:
-    """Class to handle image metadata operations."""
+    """Single-open, header-only inspection of an image.
+
+    The file is opened once and only its headers are parsed: Pillow defers
+    pixel decoding until ``load()``, which is never called here. The same
+    object answers every question the check, dry-run, process and verify
+    steps ask (embedded metadata, size, DPI), so none of them reopen the file.
+    """
 
-    def __init__(self, image_path: Path):
-        """Initialize with image path."""
+    # Info keys Pillow fills from structural header fields rather than embedded metadata
+    STRUCTURAL_INFO_KEYS = {
+        "adobe",
+        "adobe_transform",
+        "aspect",
+        "background",
+        "chromaticity",
+        "compression",
+        "dpi",
+        "duration",
+        "exif",
+        "gamma",
+        "icc_profile",
+        "interlace",
+        "jfif",
+        "jfif_density",
+        "jfif_unit",
+        "jfif_version",
+        "loop",
+        "progression",
+        "progressive",
+        "srgb",
+        "transparency",
+        "version",
+    }
+
+    # Info keys that always carry embedded metadata, whatever their value type
+    METADATA_INFO_KEYS = {"comment", "iptc", "photoshop", "xmp", "XML:com.adobe.xmp"}
+
+    def __init__(
+        self,
+        image_path: Path,
+        image: Optional[Image.Image] = None,
+        data: Optional[bytes] = None,
+    ):
+        """Initialize with image path.
+
+        Args:
+            image_path: Path to the image file
+            image: Already-open image to inspect instead of opening the path
+            data: Already-read file contents to inspect instead of opening the path
+        """
         self.path = image_path
         self.metadata = {}
-        self._load_metadata()
+        self.format = None
+        self.mode = None
+        self.size = (0, 0)
+        self.dpi = None
+        self.error = None
+
+        if image is not None:
+            self._inspect(image)
+        else:
+            self._load_metadata(data)
 
-    def _load_metadata(self):
-        """Load all available metadata from image."""
+    def _load_metadata(self, data: Optional[bytes] = None):
+        """Open the image once and inspect its headers."""
         try:
-            with Image.open(self.path) as img:
-                # Get EXIF data
-                if hasattr(img, "_getexif") and img._getexif():
-                    exif = img._getexif()
-                    if exif:
-                        for tag_id in exif:
-                            try:
-                                tag = ExifTags.TAGS.get(tag_id, tag_id)
-                                self.metadata[f"EXIF_{tag}"] = str(exif[tag_id])
-                            except Exception:
-                                continue
-
-                # Get other image info
-                self.metadata["FORMAT"] = img.format
-                self.metadata["MODE"] = img.mode
-                self.metadata["SIZE"] = img.size
-
-                # Get DPI info
-                if "dpi" in img.info:
-                    self.metadata["DPI"] = img.info["dpi"]
-
-                # Get all available info except DPI
-                for k, v in img.info.items():
-                    if k != "dpi" and isinstance(v, (str, int, float)):
-                        self.metadata[k] = v
-
+            with Image.open(io.BytesIO(data) if data is not None else self.path) as img:
+                self._inspect(img)
         except Exception as e:
+            self.error = str(e)
             logger.error(f"Error loading metadata from {self.path}: {str(e)}")
 
+    def _inspect(self, img: Image.Image):
+        """Read format, size, DPI and embedded metadata from image headers."""
+        self.format = img.format
+        self.mode = img.mode
+        self.size = img.size
+
+        dpi = img.info.get("dpi")
+        if dpi:
+            self.dpi = (float(dpi[0]), float(dpi[1]))
+
+        # Parse raw EXIF bytes directly; img.getexif() would decode pixels for PNG
+        raw_exif = img.info.get("exif")
+        if raw_exif:
+            exif = Image.Exif()
+            try:
+                exif.load(raw_exif)
+            except Exception:
+                self.metadata["EXIF"] = f"{len(raw_exif)} bytes (unparseable)"
+            else:
+                for tag_id, value in exif.items():
+                    tag = ExifTags.TAGS.get(tag_id, tag_id)
+                    self.metadata[f"EXIF_{tag}"] = str(value)
+                if not exif:
+                    self.metadata["EXIF"] = f"{len(raw_exif)} bytes"
+
+        for k, v in img.info.items():
+            if k in self.METADATA_INFO_KEYS:
+                self.metadata[k] = self._describe_value(v)
+            elif k not in self.STRUCTURAL_INFO_KEYS and isinstance(v, (str, int, float)):
+                self.metadata[k] = v
+
+    @staticmethod
+    def _describe_value(value) -> str:
+        """Summarize a raw metadata value for logging."""
+        if isinstance(value, (bytes, bytearray)):
+            return f"{len(value)} bytes"
+        if isinstance(value, dict):
+            return f"{len(value)} entries"
+        return str(value)
+
     def has_metadata(self) -> bool:
         """Check if image has any metadata beyond basic format info."""
-        basic_info = {"FORMAT", "MODE", "SIZE", "DPI"}
-        return len(set(self.metadata.keys()) - basic_info) > 0
+        return bool(self.metadata)
+
+    def needs_resize(self) -> bool:
+        """Check if the image is wider than ``MAX_WIDTH``."""
+        return self.size[0] > MAX_WIDTH
+
+    def has_wrong_dpi(self) -> bool:
+        """Check if the image declares a DPI other than ``TARGET_DPI``."""
+        return self.dpi is not None and (
+            not is_close_enough(self.dpi[0], TARGET_DPI)
+            or not is_close_enough(self.dpi[1], TARGET_DPI)
+        )
+
+    def needs_processing(self) -> bool:
+        """Check if the image has metadata, needs resizing/DPI adjustment or is unreadable."""
+        return (
+            self.error is not None
+            or self.has_metadata()
+            or self.needs_resize()
+            or self.has_wrong_dpi()
+        )
 
     def get_metadata_summary(self) -> str:
         """Get a formatted summary of metadata."""
         if not self.has_metadata():
             return "No metadata found"
 
-        summary = []
-        for k, v in self.metadata.items():
-            if k not in {"FORMAT", "MODE", "SIZE", "DPI"}:
-                summary.append(f"{k}: {v}")
-        return "\n".join(summary)
+        return "\n".join(f"{k}: {v}" for k, v in self.metadata.items())
+
+    def log_issues(self):
+        """Log every issue found, as reported by dry runs."""
+        if self.error is not None:
+            logger.info(f"Could not read {self.path}: {self.error}")
+            return
+
+        if self.has_metadata():
+            logger.info(f"Found metadata in {self.path}:")
+            logger.info(self.get_metadata_summary())
+
+        if self.needs_resize():
+            logger.info(f"Image needs resizing: {self.size[0]}x{self.size[1]}")
 
+        if self.has_wrong_dpi():
+            logger.info(f"Current DPI: {self.dpi}, target: {TARGET_DPI}")
 
-def get_image_files(directory: Path) -> list[Path]:
+
+def iter_image_files(
+    directory: Path, exclude: Collection[str] = DEFAULT_EXCLUDED_DIRS
+) -> Iterator[Path]:
+    """Yield image files under a directory in a single traversal.
+
+    Extensions are matched case-insensitively and excluded directories are
+    pruned without being entered. Entries are visited in name order, so paths
+    come out sorted, the same order ``sorted()`` would give.
+
+    Args:
+        directory: Root directory to search
+        exclude: Directory names to skip wherever they appear
+
+    Yields:
+        Paths to image files
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError as e:
+        logger.warning(f"Cannot read directory {directory}: {str(e)}")
+        return
+
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in exclude:
+                yield from iter_image_files(Path(entry.path), exclude)
+        elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS and entry.is_file():
+            yield Path(entry.path)
+
+
+def get_image_files(
+    directory: Path, exclude: Collection[str] = DEFAULT_EXCLUDED_DIRS
+) -> list[Path]:
     """Find all image files in the directory recursively.
 
     Args:
         directory: Root directory to search
+        exclude: Directory names to skip wherever they appear
 
     Returns:
-        List of paths to image files
+        Sorted list of paths to image files
     """
-    image_extensions = {".jpg", ".jpeg", ".png", ".gif", ".tiff", ".bmp"}
-    image_files = []
+    return list(iter_image_files(directory, exclude))
 
-    for ext in image_extensions:
-        image_files.extend(directory.rglob(f"*{ext}"))
-        image_files.extend(directory.rglob(f"*{ext.upper()}"))
 
-    return sorted(image_files)
+def check_image(path: Path) -> bool:
+    """Check whether a single image has metadata or needs resizing/DPI adjustment.
 
+    Args:
+        path: Image path to check
 
-def check_images(image_files: list[Path]) -> tuple[list[Path], list[Path]]:
+    Returns:
+        True if the image needs processing
+    """
+    return ImageMetadata(path).needs_processing()
+
+
+def inspect_with_manifest(item: tuple[Path, Optional[str]]) -> tuple[Optional[ImageMetadata], str]:
+    """Hash an image and inspect it unless it matches a clean manifest entry.
+
+    The file is read once; the inspection parses the same bytes that were hashed.
+
+    Args:
+        item: Tuple of (image path, content hash last recorded as clean, if any)
+
+    Returns:
+        Tuple of (inspection, or None if the hash matched; content hash, or
+        an empty string if the file could not be read)
+    """
+    path, clean_digest = item
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return ImageMetadata(path), ""
+
+    digest = content_hash(data)
+    if digest == clean_digest:
+        return None, digest
+    return ImageMetadata(path, data=data), digest
+
+
+def inspect_images(
+    image_files: Iterable[Path], jobs: int = 1, manifest: Optional[ImageManifest] = None
+) -> list[ImageMetadata]:
+    """Inspect every image once, optionally over a process pool.
+
+    With a manifest, images recorded as clean are skipped when their size and
+    mtime, or failing that their content hash, are unchanged. Every verdict is
+    recorded back into the manifest.
+
+    Args:
+        image_files: Image paths to inspect, as a list or a generator
+        jobs: Number of worker processes to spread the inspections over
+        manifest: Optional manifest of previous check results
+
+    Returns:
+        Inspections of the images that were not skipped, in input order
+    """
+    if manifest is None:
+        return map_images(ImageMetadata, image_files, jobs)
+
+    pending = []
+    stats = {}
+    total = 0
+
+    def pending_items():
+        nonlocal total
+        for path in image_files:
+            total += 1
+            try:
+                stat = path.stat()
+            except OSError:
+                # Gone or inaccessible: inspected anyway, so it is reported as unreadable
+                pending.append(path)
+                stats[path] = None
+                yield path, None
+                continue
+            if manifest.is_unchanged_clean(path, stat):
+                continue
+            entry = manifest.get(path)
+            clean_digest = entry["sha256"] if entry and entry["verdict"] == VERDICT_CLEAN else None
+            pending.append(path)
+            stats[path] = stat
+            yield path, clean_digest
+
+    results = map_images(inspect_with_manifest, pending_items(), jobs)
+
+    inspections = []
+    for path, (inspection, digest) in zip(pending, results):
+        if digest and stats[path] is not None:
+            needs_work = inspection is not None and inspection.needs_processing()
+            verdict = VERDICT_NEEDS_PROCESSING if needs_work else VERDICT_CLEAN
+            manifest.record(path, stats[path], digest, verdict)
+        if inspection is not None:
+            inspections.append(inspection)
+
+    skipped = total - len(inspections)
+    if skipped:
+        logger.info(f"Skipped {skipped} unchanged images recorded as clean")
+    return inspections
+
+
+def check_images(
+    image_files: Iterable[Path], jobs: int = 1, manifest: Optional[ImageManifest] = None
+) -> tuple[list[Path], list[Path]]:
     """Check which images have metadata or need resizing/DPI adjustment.
 
     Args:
         image_files: List of image paths to check
+        jobs: Number of worker processes to spread the checks over
+        manifest: Optional manifest used to skip unchanged clean images
 
     Returns:
         Tuple of (images needing processing, images without issues)
     """
-    needs_processing = []
-    no_issues = []
-
-    for path in image_files:
-        needs_work = False
-        metadata = ImageMetadata(path)
-
-        # Check metadata
-        if metadata.has_metadata():
-            needs_work = True
-
-        # Check size and DPI
-        with Image.open(path) as img:
-            width, height = img.size
-            if width > MAX_WIDTH:
-                needs_work = True
-
-            dpi = img.info.get("dpi", (None, None))
-            if dpi and (
-                not is_close_enough(dpi[0], TARGET_DPI) or not is_close_enough(dpi[1], TARGET_DPI)
-            ):
-                needs_work = True
-
-        if needs_work:
-            needs_processing.append(path)
-        else:
-            no_issues.append(path)
+    image_files = list(image_files)
+    needs_processing = [
+        inspection.path
+        for inspection in inspect_images(image_files, jobs, manifest)
+        if inspection.needs_processing()
+    ]
+    flagged = set(needs_processing)
+    no_issues = [path for path in image_files if path not in flagged]
 
     return needs_processing, no_issues
 
 
-def process_image(image_path: Path, dry_run: bool = False) -> bool:
+def strip_metadata(img: Image.Image) -> Image.Image:
+    """Return a copy of an image that carries no metadata.
+
+    ``Image.copy`` duplicates the decoded pixels in a single buffer copy, so
+    no per-pixel Python objects are created, and returns a plain ``Image``.
+    Dropping the ``ImageFile`` subclass also drops format-specific state
+    (TIFF tags, JPEG APP segments) that some encoders would otherwise write
+    back.
+
+    Args:
+        img: Image to strip
+
+    Returns:
+        Image with only rendering-relevant info entries kept
+    """
+    clean = img.copy()
+    clean.info = {k: v for k, v in img.info.items() if k in PRESERVED_INFO_KEYS}
+    return clean
+
+
+def can_strip_losslessly(inspection: ImageMetadata) -> bool:
+    """Check if an image can be fixed by rewriting its container alone.
+
+    This holds for JPEG and PNG files within ``MAX_WIDTH`` whose extension
+    matches their actual format, since the fix never changes pixels or format.
+
+    Args:
+        inspection: Inspection of the image
+
+    Returns:
+        True if the lossless fast path applies
+    """
+    if inspection.format not in LOSSLESS_STRIPPERS or inspection.needs_resize():
+        return False
+    return Image.registered_extensions().get(inspection.path.suffix.lower()) == inspection.format
+
+
+def strip_losslessly(image_path: Path, image_format: str) -> bool:
+    """Remove metadata and set DPI at the container level, without re-encoding.
+
+    The rewritten file is built in memory and only atomically written back
+    if an inspection of it shows nothing left to fix.
+
+    Args:
+        image_path: Path to the image file
+        image_format: Pillow format name of the file (JPEG or PNG)
+
+    Returns:
+        True if the file was rewritten, False if it needs a full re-encode
+    """
+    buffer = io.BytesIO()
+    try:
+        with open(image_path, "rb") as src:
+            LOSSLESS_STRIPPERS[image_format](src, buffer, TARGET_DPI)
+    except ValueError as e:
+        logger.debug(f"Lossless strip not possible for {image_path}: {str(e)}")
+        return False
+
+    data = buffer.getvalue()
+    if ImageMetadata(image_path, data=data).needs_processing():
+        return False
+
+    write_atomic(image_path, data)
+    return True
+
+
+def load_resized(img: Image.Image, max_pixels: Optional[int] = None) -> Image.Image:
+    """Decode an image, shrinking it to ``MAX_WIDTH`` as cheaply as possible.
+
+    JPEGs wider than ``MAX_WIDTH`` are decoded directly at a reduced scale
+    (1/2, 1/4 or 1/8) that stays ``REDUCING_GAP`` times above the target, then
+    finished with a Lanczos filter. Other formats are box-reduced by integer
+    factors before the Lanczos pass.
+
+    The pixel budget is checked before any pixels are decoded, against the
+    reduced size for JPEGs and the full size otherwise. Images over the
+    budget are refused rather than decoded in tiles, since Pillow decodes
+    most formats into a single full-size buffer.
+
+    Args:
+        img: Freshly opened image whose pixels have not been loaded
+        max_pixels: Refuse images whose decoded size exceeds this many pixels
+
+    Returns:
+        Decoded image, resized if it was wider than ``MAX_WIDTH``
+
+    Raises:
+        ValueError: If the decoded image would exceed ``max_pixels``
+    """
+    width, height = img.size
+    new_size = None
+    if width > MAX_WIDTH:
+        new_size = (MAX_WIDTH, int(height * MAX_WIDTH / width))
+        # No-op for formats without reduced-scale decoding
+        img.draft(img.mode, (new_size[0] * REDUCING_GAP, new_size[1] * REDUCING_GAP))
+
+    decoded_width, decoded_height = img.size
+    if max_pixels is not None and decoded_width * decoded_height > max_pixels:
+        raise ValueError(
+            f"Decoded size {decoded_width}x{decoded_height} exceeds the budget of "
+            f"{max_pixels} pixels"
+        )
+
+    if new_size is None:
+        return img
+    return img.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+
+
+def process_inspection(inspection: ImageMetadata, max_pixels: Optional[int] = None) -> bool:
+    """Process an already-inspected image.
+
+    Args:
+        inspection: Inspection produced by the check phase
+        max_pixels: Refuse images whose decoded size exceeds this many pixels
+
+    Returns:
+        True if successful, False if failed
+    """
+    return process_image(inspection.path, metadata=inspection, max_pixels=max_pixels)
+
+
+def process_image(
+    image_path: Path,
+    dry_run: bool = False,
+    metadata: Optional[ImageMetadata] = None,
+    max_pixels: Optional[int] = None,
+) -> bool:
     """Process an image: remove metadata, resize, and set DPI.
 
     Args:
         image_path: Path to the image file
         dry_run: If True, only check for issues without modifying
+        metadata: Existing inspection of the image, reused instead of reopening it
+        max_pixels: Refuse images whose decoded size exceeds this many pixels
 
     Returns:
         True if successful, False if failed
     """
     try:
-        metadata = ImageMetadata(image_path)
-
         if dry_run:
-            with Image.open(image_path) as img:
-                width, height = img.size
-                dpi = img.info.get("dpi", (None, None))
-
-                if metadata.has_metadata():
-                    logger.info(f"Found metadata in {image_path}:")
-                    logger.info(metadata.get_metadata_summary())
-
-                if width > MAX_WIDTH:
-                    logger.info(f"Image needs resizing: {width}x{height}")
-
-                if dpi and (
-                    not is_close_enough(dpi[0], TARGET_DPI)
-                    or not is_close_enough(dpi[1], TARGET_DPI)
-                ):
-                    logger.info(f"Current DPI: {dpi}, target: {TARGET_DPI}")
+            if metadata is None:
+                metadata = ImageMetadata(image_path)
+            metadata.log_issues()
+            return True
+
+        # Images that only need metadata/DPI fixes are rewritten without re-encoding
+        if metadata is None:
+            metadata = ImageMetadata(image_path)
+        if can_strip_losslessly(metadata) and strip_losslessly(image_path, metadata.format):
+            logger.info(f"Successfully processed {image_path} (lossless)")
             return True
 
         # Process the image
         with Image.open(image_path) as img:
-            # Calculate new size if needed
-            width, height = img.size
-            if width > MAX_WIDTH:
-                ratio = MAX_WIDTH / width
-                new_size = (MAX_WIDTH, int(height * ratio))
-                img = img.resize(new_size, Image.Resampling.LANCZOS)
+            # Decode, resizing if needed
+            img = load_resized(img, max_pixels)
 
             # Create new image without metadata
-            data = list(img.getdata())
-            image_clean = Image.new(img.mode, img.size)
-            image_clean.putdata(data)
+            image_clean = strip_metadata(img)
 
             # Set DPI
             dpi = (TARGET_DPI, TARGET_DPI)
@@ -208,37 +654,154 @@ def process_image(image_path: Path, dry_run: bool = False) -> bool:
             elif image_path.suffix.lower() == ".png":
                 save_kwargs.update({"optimize": True})
 
-            # Save back to original file
-            image_clean.save(image_path, **save_kwargs)
+            # Encode in memory, in the format the file extension calls for
+            image_format = Image.registered_extensions().get(
+                image_path.suffix.lower(), metadata.format
+            )
+            buffer = io.BytesIO()
+            image_clean.save(buffer, format=image_format, **save_kwargs)
+            data = buffer.getvalue()
 
-            # Verify changes
-            check_metadata = ImageMetadata(image_path)
-            with Image.open(image_path) as verify_img:
-                current_width = verify_img.size[0]
-                current_dpi = verify_img.info.get("dpi", (None, None))
+        # Verify the encoded bytes before the original is touched
+        if not verify_image(ImageMetadata(image_path, data=data)):
+            return False
 
-                if check_metadata.has_metadata():
-                    logger.error(f"Failed to remove all metadata from {image_path}")
-                    return False
+        # Replace the original in a single rename
+        write_atomic(image_path, data)
+        logger.info(f"Successfully processed {image_path}")
+        return True
 
-                if current_width > MAX_WIDTH:
-                    logger.error(f"Failed to resize {image_path}")
-                    return False
+    except Exception as e:
+        logger.error(f"Failed to process {image_path}: {str(e)}")
+        return False
 
-                if current_dpi and (
-                    not is_close_enough(current_dpi[0], TARGET_DPI)
-                    or not is_close_enough(current_dpi[1], TARGET_DPI)
-                ):
-                    logger.error(f"Failed to set DPI for {image_path}")
-                    return False
 
-            logger.info(f"Successfully processed {image_path}")
-            return True
+def verify_image(inspection: ImageMetadata) -> bool:
+    """Verify that a processed image meets the size, DPI and metadata targets.
 
-    except Exception as e:
-        logger.error(f"Failed to process {image_path}: {str(e)}")
+    Args:
+        inspection: Inspection of the encoded image, before it is written
+
+    Returns:
+        True if the image passed verification
+    """
+    image_path = inspection.path
+
+    if inspection.error is not None:
+        logger.error(f"Failed to read back {image_path}: {inspection.error}")
+        return False
+
+    if inspection.has_metadata():
+        logger.error(f"Failed to remove all metadata from {image_path}")
+        return False
+
+    if inspection.needs_resize():
+        logger.error(f"Failed to resize {image_path}")
+        return False
+
+    if inspection.has_wrong_dpi():
+        logger.error(f"Failed to set DPI for {image_path}")
+        return False
+
+    return True
+
+
+def build_variants(
+    image_files: list[Path],
+    root_dir: Path,
+    variant_dir: Path,
+    widths: tuple[int, ...],
+    formats: str,
+    jobs: int = 1,
+) -> bool:
+    """Generate responsive variants for every image and write the variant index.
+
+    Args:
+        image_files: Source images
+        root_dir: Directory the index keys are relative to
+        variant_dir: Directory variants and their index are written to
+        widths: Variant widths
+        formats: Comma-separated variant formats
+        jobs: Number of worker processes
+
+    Sources whose variants cannot be generated this time (e.g. a file that
+    no longer decodes) keep their entry from the previous index, so pages
+    go on serving the variants of their last good version.
+
+    Returns:
+        True if variants were generated for every image
+    """
+    format_list = tuple(f.strip().lower() for f in formats.split(",") if f.strip())
+    unsupported = set(format_list) - available_formats()
+    if unsupported:
+        logger.warning(
+            f"Skipping variant formats not supported by this Pillow: {', '.join(sorted(unsupported))}"
+        )
+        format_list = tuple(f for f in format_list if f not in unsupported)
+    if not format_list:
+        logger.error("No supported variant formats requested")
         return False
 
+    variant_dir.mkdir(parents=True, exist_ok=True)
+    entries = map_images(
+        generate_variants,
+        image_files,
+        jobs,
+        variant_dir=variant_dir,
+        widths=widths,
+        formats=format_list,
+    )
+
+    previous = load_variant_index(variant_dir)
+    index = {}
+    generated = 0
+    for path, entry in zip(image_files, entries):
+        key = path.relative_to(root_dir).as_posix()
+        if entry is not None:
+            index[key] = entry
+            generated += 1
+        elif key in previous:
+            logger.warning(f"Keeping the previous variants of {path}")
+            index[key] = previous[key]
+    removed = write_variant_index(variant_dir, index)
+
+    logger.info(f"Variants up to date for {generated} of {len(image_files)} images")
+    if removed:
+        logger.info(f"Removed {removed} stale variants")
+    return generated == len(image_files)
+
+
+def parse_variant_widths(value: str) -> tuple[int, ...]:
+    """Parse the ``--variants`` argument.
+
+    Args:
+        value: Comma-separated variant widths
+
+    Returns:
+        Variant widths
+
+    Raises:
+        argparse.ArgumentTypeError: If a width is not a whole number between 1 and ``MAX_WIDTH``
+    """
+    widths = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            width = int(item)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid variant width: '{item}'") from None
+        if not 1 <= width <= MAX_WIDTH:
+            # Variants are made from processed images, which are never wider than MAX_WIDTH
+            raise argparse.ArgumentTypeError(
+                f"variant width {width} is not between 1 and the maximum width ({MAX_WIDTH})"
+            )
+        widths.append(width)
+    if not widths:
+        raise argparse.ArgumentTypeError("no variant widths given")
+    return tuple(widths)
+
 
 def main():
     """Main entry point."""
@@ -261,6 +824,63 @@ def main():
         action="store_true",
         help="Only check if any images need processing and exit with status 1 if found",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes for checking and processing (default: CPU count)",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=None,
+        metavar="DIR",
+        help="Directory name to skip, may be repeated "
+        f"(default: {', '.join(sorted(DEFAULT_EXCLUDED_DIRS))})",
+    )
+    parser.add_argument(
+        "--max-pixels",
+        type=int,
+        default=None,
+        help="Refuse to process images whose decoded size exceeds this many pixels; JPEGs "
+        "count at the reduced scale they are decoded at, other formats at full size. Refused "
+        "images are reported as failures and left untouched (they are not decoded in tiles)",
+    )
+    parser.add_argument(
+        "--variants",
+        nargs="?",
+        type=parse_variant_widths,
+        const=DEFAULT_VARIANT_WIDTHS,
+        default=None,
+        metavar="WIDTHS",
+        help=f"Generate responsive variants at these comma-separated widths, at most {MAX_WIDTH} "
+        f"(default when given without a value: {','.join(str(w) for w in DEFAULT_VARIANT_WIDTHS)})",
+    )
+    parser.add_argument(
+        "--variant-formats",
+        type=str,
+        default=",".join(DEFAULT_VARIANT_FORMATS),
+        help=f"Comma-separated variant formats out of {', '.join(VARIANT_SAVE_OPTIONS)} "
+        f"(default: {','.join(DEFAULT_VARIANT_FORMATS)})",
+    )
+    parser.add_argument(
+        "--variant-dir",
+        type=str,
+        default=None,
+        help=f"Directory for generated variants (default: <directory>/{DEFAULT_VARIANT_DIR})",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help=f"Manifest of previous check results, read by every run and written by runs "
+        f"that process images (default: <directory>/{DEFAULT_MANIFEST_NAME})",
+    )
+    parser.add_argument(
+        "--no-manifest",
+        action="store_true",
+        help="Inspect every image instead of skipping unchanged ones",
+    )
     args = parser.parse_args()
 
     root_dir = Path(args.directory).resolve()
@@ -269,7 +889,28 @@ def main():
         sys.exit(1)
 
     logger.info(f"Searching for images in {root_dir}")
-    image_files = get_image_files(root_dir)
+    exclude = set(args.exclude) if args.exclude else DEFAULT_EXCLUDED_DIRS
+
+    manifest = None
+    if not args.no_manifest:
+        manifest_path = Path(args.manifest) if args.manifest else root_dir / DEFAULT_MANIFEST_NAME
+        settings = {"max_width": MAX_WIDTH, "target_dpi": TARGET_DPI}
+        manifest = ImageManifest.load(manifest_path, root_dir, settings)
+
+    # Inspection starts on the first images found while the walk continues
+    image_files = []
+
+    def discovered():
+        for path in iter_image_files(root_dir, exclude):
+            image_files.append(path)
+            yield path
+
+    # Inspect every image once; the inspections are reused by the dry run
+    inspections = inspect_images(discovered(), jobs=args.jobs, manifest=manifest)
+    needs_processing = [m for m in inspections if m.needs_processing()]
+    # Check-only runs use the manifest but never write into the scanned tree
+    if manifest is not None and not (args.check or args.dry_run):
+        manifest.save()
 
     if not image_files:
         logger.info("No image files found")
@@ -277,40 +918,64 @@ def main():
 
     logger.info(f"Found {len(image_files)} image files")
 
-    # Check which images need processing
-    needs_processing, no_issues = check_images(image_files)
-
     if args.check:
         if needs_processing:
             logger.error(f"Found {len(needs_processing)} images needing processing:")
-            for path in needs_processing:
-                logger.error(f"  {path}")
+            for inspection in needs_processing:
+                logger.error(f"  {inspection.path}")
             sys.exit(1)
         logger.info("No images need processing")
         sys.exit(0)
 
-    if not needs_processing:
-        logger.info("No images need processing")
-        sys.exit(0)
-
-    logger.info(f"Found {len(needs_processing)} images needing processing")
-
     if args.dry_run:
-        for path in needs_processing:
-            process_image(path, dry_run=True)
+        if not needs_processing:
+            logger.info("No images need processing")
+            sys.exit(0)
+        logger.info(f"Found {len(needs_processing)} images needing processing")
+        for inspection in needs_processing:
+            process_image(inspection.path, dry_run=True, metadata=inspection)
         sys.exit(0)
 
-    # Process each image
-    success_count = 0
-    for image_path in needs_processing:
-        if process_image(image_path):
-            success_count += 1
+    failed = False
+    if needs_processing:
+        logger.info(f"Found {len(needs_processing)} images needing processing")
+
+        # Process each image
+        results = map_images(
+            process_inspection, needs_processing, args.jobs, max_pixels=args.max_pixels
+        )
+        success_count = sum(results)
+
+        if manifest is not None:
+            for inspection, success in zip(needs_processing, results):
+                if not success:
+                    continue
+                path = inspection.path
+                try:
+                    stat = path.stat()
+                    digest = content_hash(path.read_bytes())
+                except OSError as e:
+                    # Inspected again next run
+                    logger.warning(f"Not recording {path} in the manifest: {str(e)}")
+                    continue
+                manifest.record(path, stat, digest, VERDICT_CLEAN)
+            manifest.save()
+
+        # Print summary
+        logger.info(f"Successfully processed {success_count} of {len(needs_processing)} images")
+        failed = success_count < len(needs_processing)
+    else:
+        logger.info("No images need processing")
 
-    # Print summary
-    logger.info(f"Successfully processed {success_count} of {len(needs_processing)} images")
+    if args.variants is not None:
+        variant_dir = Path(args.variant_dir) if args.variant_dir else root_dir / DEFAULT_VARIANT_DIR
+        if not build_variants(
+            image_files, root_dir, variant_dir, args.variants, args.variant_formats, args.jobs
+        ):
+            failed = True
 
     # Exit with error if any images failed
-    if success_count < len(needs_processing):
+    if failed:
         sys.exit(1)
 
 
@@ -0,0 +1,175 @@
+"""Responsive image variant generation.
+
+Produces resized copies of each source image in modern formats (WebP, and
+AVIF where the installed Pillow supports it) for serving responsive images:
+
+1. Variants are stored in a cache directory, named by the source content hash
+2. A variant is only generated when its file does not exist yet, so changing
+   a source image is what triggers regeneration
+3. An index (``variants.json``) maps each source image to its variants and
+   variants no longer referenced by any source are removed; a source whose
+   variants could not be generated keeps its previous ones
+
+Variants are never wider than their source, and carry no metadata.
+"""
+
+import io
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Optional
+
+from atomic_io import write_atomic
+from image_manifest import content_hash
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Variants are made from processed images, which are at most 800 pixels wide
+DEFAULT_VARIANT_WIDTHS = (400, 800)
+DEFAULT_VARIANT_FORMATS = ("webp",)
+
+# Encoder settings per output format
+VARIANT_SAVE_OPTIONS = {
+    "webp": {"quality": 80, "method": 6},
+    "avif": {"quality": 60, "speed": 6},
+}
+
+# Index of generated variants, written into the variant directory
+VARIANT_INDEX_NAME = "variants.json"
+
+# Hex digits of the content hash used in variant file names
+VARIANT_HASH_LENGTH = 16
+
+VARIANT_NAME_PATTERN = re.compile(
+    r"^[0-9a-f]{%d}-\d+\.(%s)$" % (VARIANT_HASH_LENGTH, "|".join(VARIANT_SAVE_OPTIONS))
+)
+
+
+def available_formats() -> set[str]:
+    """Return the variant formats the installed Pillow can write."""
+    Image.init()
+    return {fmt for fmt in VARIANT_SAVE_OPTIONS if fmt.upper() in Image.SAVE}
+
+
+def _prepare_mode(img: Image.Image) -> Image.Image:
+    """Convert an image to a mode WebP/AVIF encoders accept."""
+    if img.mode in ("RGB", "RGBA"):
+        return img
+    return img.convert("RGBA" if img.has_transparency_data else "RGB")
+
+
+def plan_widths(source_width: int, widths: tuple[int, ...]) -> list[int]:
+    """Pick the variant widths for a source image without upscaling.
+
+    Args:
+        source_width: Width of the source image
+        widths: Requested variant widths
+
+    Returns:
+        Requested widths no larger than the source, or the source width alone
+        if the source is narrower than all of them
+    """
+    planned = sorted({w for w in widths if w <= source_width})
+    return planned or [source_width]
+
+
+def generate_variants(
+    image_path: Path,
+    variant_dir: Path,
+    widths: tuple[int, ...] = DEFAULT_VARIANT_WIDTHS,
+    formats: tuple[str, ...] = DEFAULT_VARIANT_FORMATS,
+) -> Optional[dict]:
+    """Generate the missing variants of one source image.
+
+    The source is decoded at most once, and not at all when every variant
+    for its current content already exists.
+
+    Args:
+        image_path: Source image
+        variant_dir: Directory variants are written to
+        widths: Requested variant widths
+        formats: Output formats (keys of ``VARIANT_SAVE_OPTIONS``)
+
+    Returns:
+        Index entry with the source hash and its variants, or None on failure
+    """
+    try:
+        data = image_path.read_bytes()
+        digest = content_hash(data)[:VARIANT_HASH_LENGTH]
+
+        with Image.open(io.BytesIO(data)) as img:
+            source_width, source_height = img.size
+            variants = []
+            missing = []
+            for width in plan_widths(source_width, widths):
+                height = max(1, round(source_height * width / source_width))
+                for fmt in formats:
+                    name = f"{digest}-{width}.{fmt}"
+                    variants.append({"width": width, "height": height, "format": fmt, "file": name})
+                    if not (variant_dir / name).exists():
+                        missing.append((width, height, fmt, name))
+
+            if missing:
+                largest = max(width for width, _, _, _ in missing)
+                img.draft(
+                    img.mode, (largest * 2, round(source_height * largest * 2 / source_width))
+                )
+                source = _prepare_mode(img)
+                for width, height, fmt, name in missing:
+                    resized = source.resize(
+                        (width, height), Image.Resampling.LANCZOS, reducing_gap=2
+                    )
+                    resized.info = {}
+                    buffer = io.BytesIO()
+                    resized.save(buffer, format=fmt.upper(), **VARIANT_SAVE_OPTIONS[fmt])
+                    write_atomic(variant_dir / name, buffer.getvalue())
+                logger.info(f"Generated {len(missing)} variants of {image_path}")
+
+        return {"content_hash": digest, "variants": variants}
+
+    except Exception as e:
+        logger.error(f"Failed to generate variants of {image_path}: {str(e)}")
+        return None
+
+
+def load_variant_index(variant_dir: Path) -> dict[str, dict]:
+    """Read the variant index written by the last run.
+
+    Args:
+        variant_dir: Directory holding the variants
+
+    Returns:
+        Mapping of source path to its entry, empty if there is no readable index
+    """
+    try:
+        index = json.loads((variant_dir / VARIANT_INDEX_NAME).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable variant index in {variant_dir}: {str(e)}")
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def write_variant_index(variant_dir: Path, index: dict[str, dict]) -> int:
+    """Write the variant index and remove variants no source refers to anymore.
+
+    Args:
+        variant_dir: Directory holding the variants
+        index: Mapping of source path (relative to the scanned root) to its entry
+
+    Returns:
+        Number of stale variant files removed
+    """
+    referenced = {v["file"] for entry in index.values() for v in entry["variants"]}
+    removed = 0
+    for path in variant_dir.iterdir():
+        if VARIANT_NAME_PATTERN.match(path.name) and path.name not in referenced:
+            path.unlink()
+            removed += 1
+
+    data = json.dumps(dict(sorted(index.items())), indent=2)
+    write_atomic(variant_dir / VARIANT_INDEX_NAME, data.encode("utf-8"))
+    return removed
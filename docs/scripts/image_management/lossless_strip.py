@@ -0,0 +1,148 @@
+"""Lossless container-level metadata removal.
+
+Rewrites JPEG and PNG files at the byte level, without decoding any pixel
+data:
+
+1. JPEG: drops APP1 (EXIF/XMP), APP13 (Photoshop/IPTC) and COM segments and
+   rewrites the JFIF density to the target DPI
+2. PNG: drops tEXt, iTXt, zTXt and eXIf chunks and rewrites the pHYs chunk
+   to the target DPI
+
+Compressed image data is streamed through untouched, so the output is
+bit-exact on pixels and the cost is a single sequential copy of the file.
+"""
+
+import shutil
+import struct
+import zlib
+from typing import BinaryIO
+
+# JPEG markers
+JPEG_SOI = b"\xff\xd8"
+JPEG_EOI = 0xD9
+JPEG_SOS = 0xDA
+JPEG_APP0 = 0xE0
+JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+JPEG_METADATA_MARKERS = {0xE1, 0xED, 0xFE}  # APP1, APP13, COM
+
+# PNG chunks
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_METADATA_CHUNKS = {b"tEXt", b"iTXt", b"zTXt", b"eXIf"}
+
+# Copy buffer for streamed image data
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def _read_exact(src: BinaryIO, size: int) -> bytes:
+    """Read exactly ``size`` bytes or raise on a truncated file."""
+    data = src.read(size)
+    if len(data) != size:
+        raise ValueError("Unexpected end of file")
+    return data
+
+
+def _copy_exact(src: BinaryIO, dst: BinaryIO, size: int) -> None:
+    """Stream exactly ``size`` bytes from ``src`` to ``dst``."""
+    while size > 0:
+        chunk = src.read(min(size, COPY_BUFFER_SIZE))
+        if not chunk:
+            raise ValueError("Unexpected end of file")
+        dst.write(chunk)
+        size -= len(chunk)
+
+
+def strip_jpeg(src: BinaryIO, dst: BinaryIO, dpi: int) -> None:
+    """Copy a JPEG stream, dropping metadata segments and setting the JFIF DPI.
+
+    Args:
+        src: Readable binary stream positioned at the start of a JPEG file
+        dst: Writable binary stream receiving the cleaned file
+        dpi: Density written into an existing JFIF APP0 segment
+
+    Raises:
+        ValueError: If the stream is not a well-formed JPEG
+    """
+    if src.read(2) != JPEG_SOI:
+        raise ValueError("Not a JPEG file")
+    dst.write(JPEG_SOI)
+
+    while True:
+        if _read_exact(src, 1) != b"\xff":
+            raise ValueError("Invalid JPEG marker")
+        marker = _read_exact(src, 1)[0]
+        # Skip fill bytes between segments
+        while marker == 0xFF:
+            marker = _read_exact(src, 1)[0]
+
+        if marker in JPEG_STANDALONE_MARKERS:
+            dst.write(bytes((0xFF, marker)))
+            continue
+        if marker == JPEG_EOI:
+            dst.write(bytes((0xFF, marker)))
+            return
+
+        length_bytes = _read_exact(src, 2)
+        (length,) = struct.unpack(">H", length_bytes)
+        if length < 2:
+            raise ValueError("Invalid JPEG segment length")
+
+        if marker in JPEG_METADATA_MARKERS:
+            src.seek(length - 2, 1)
+            continue
+
+        payload = _read_exact(src, length - 2)
+        if marker == JPEG_APP0 and payload.startswith(b"JFIF\x00") and len(payload) >= 12:
+            # Units byte (1 = dots per inch) followed by X and Y density
+            payload = payload[:7] + struct.pack(">BHH", 1, dpi, dpi) + payload[12:]
+
+        dst.write(bytes((0xFF, marker)) + length_bytes + payload)
+
+        if marker == JPEG_SOS:
+            # Entropy-coded data runs to the end of the file
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+            return
+
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Serialize a PNG chunk with its length and CRC."""
+    crc = zlib.crc32(data, zlib.crc32(chunk_type)) & 0xFFFFFFFF
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", crc)
+
+
+def strip_png(src: BinaryIO, dst: BinaryIO, dpi: int) -> None:
+    """Copy a PNG stream, dropping text/EXIF chunks and setting the pHYs DPI.
+
+    Args:
+        src: Readable binary stream positioned at the start of a PNG file
+        dst: Writable binary stream receiving the cleaned file
+        dpi: Density written into an existing pHYs chunk
+
+    Raises:
+        ValueError: If the stream is not a well-formed PNG
+    """
+    if src.read(len(PNG_SIGNATURE)) != PNG_SIGNATURE:
+        raise ValueError("Not a PNG file")
+    dst.write(PNG_SIGNATURE)
+
+    pixels_per_meter = round(dpi / 0.0254)
+    while True:
+        header = _read_exact(src, 8)
+        length, chunk_type = struct.unpack(">I4s", header)
+
+        if chunk_type in PNG_METADATA_CHUNKS:
+            src.seek(length + 4, 1)
+        elif chunk_type == b"pHYs":
+            src.seek(length + 4, 1)
+            dst.write(
+                _png_chunk(b"pHYs", struct.pack(">IIB", pixels_per_meter, pixels_per_meter, 1))
+            )
+        else:
+            dst.write(header)
+            _copy_exact(src, dst, length + 4)
+
+        if chunk_type == b"IEND":
+            return
+
+
+# Lossless strippers by Pillow format name
+LOSSLESS_STRIPPERS = {"JPEG": strip_jpeg, "PNG": strip_png}
@@ -0,0 +1,67 @@
+"""Tests for atomic file replacement and the scripts that write through it."""
+
+import os
+
+import pytest
+from atomic_io import write_atomic
+from doc_validation import ValidationCache
+from doc_validation.external_links import ExternalLinkCache, LinkStatus
+from format_docs import format_markdown_file
+
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    calls = []
+    fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: calls.append(fd) or fsync(fd))
+    return calls
+
+
+def test_replaces_contents_and_keeps_mode(tmp_path, fsyncs):
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"old")
+    path.chmod(0o640)
+    write_atomic(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert len(fsyncs) == 1
+    assert os.listdir(tmp_path) == ["file.txt"]
+
+
+def test_new_files_get_the_umask_mode(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        write_atomic(tmp_path / "new.txt", b"data")
+    finally:
+        os.umask(umask)
+    assert (tmp_path / "new.txt").stat().st_mode & 0o777 == 0o644
+
+
+def test_failed_write_leaves_the_file_alone(tmp_path, monkeypatch):
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"old")
+
+    def fail(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "fsync", fail)
+    with pytest.raises(OSError):
+        write_atomic(path, b"new")
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["file.txt"]
+
+
+def test_scripts_write_atomically(tmp_path, fsyncs):
+    doc = tmp_path / "a.md"
+    doc.write_text("# A\nText\n")
+    doc.chmod(0o600)
+    assert format_markdown_file(doc)
+    assert doc.read_text() == "# A\n\nText\n"
+    assert doc.stat().st_mode & 0o777 == 0o600
+
+    ValidationCache(tmp_path / "reports" / "cache.json").write()
+    cache = ExternalLinkCache(tmp_path / "reports" / "links.json")
+    cache.put(LinkStatus("https://example.com/", status=200, checked_at=1e12))
+    cache.save()
+    assert len(fsyncs) == 3
+    assert sorted(os.listdir(tmp_path / "reports")) == ["cache.json", "links.json"]
@@ -0,0 +1,37 @@
+"""Tests for the image pipeline benchmark."""
+
+import json
+
+from benchmark import generate_corpus, run_benchmark
+
+
+def test_corpus_is_reproducible(tmp_path):
+    first = generate_corpus(tmp_path / "first", 6, seed=1)
+    second = generate_corpus(tmp_path / "second", 6, seed=1)
+    assert [path.relative_to(tmp_path / "first") for path in first] == [
+        path.relative_to(tmp_path / "second") for path in second
+    ]
+    assert [path.read_bytes() for path in first] == [path.read_bytes() for path in second]
+
+
+def test_every_stage_is_measured(tmp_path):
+    corpus_dir = tmp_path / "corpus"
+    generate_corpus(corpus_dir, 6, seed=1)
+
+    results = json.loads(json.dumps(run_benchmark(corpus_dir, jobs=2)))
+
+    assert results["corpus"]["images"] == 6
+    stages = {stage["name"]: stage for stage in results["stages"]}
+    assert list(stages) == [
+        "discovery",
+        "check",
+        "dry_run",
+        "process",
+        "check_manifest_cold",
+        "check_manifest_warm",
+    ]
+    assert stages["discovery"]["images"] == stages["check"]["images"] == 6
+    assert stages["process"]["images"] == results["needs_processing"] > 0
+    assert stages["process"]["failures"] == 0
+    for stage in stages.values():
+        assert stage["wall_seconds"] >= 0 and stage["megabytes"] >= 0
@@ -0,0 +1,125 @@
+"""Tests for the checker registry, plugins and the fields checkers consume."""
+
+from importlib.metadata import EntryPoint
+
+import pytest
+from doc_validation import DocumentIndex, ValidationCache
+from doc_validation import checkers as registry
+from doc_validation.checkers import (
+    CHECKERS,
+    ENTRY_POINT_GROUP,
+    CheckerSpec,
+    consumed_fields,
+    load_plugins,
+    register,
+    resolve_checkers,
+)
+from validate_docs import validate_docs
+
+PLUGIN = """
+from doc_validation.checkers import CheckerSpec
+from doc_validation.validation_types import Severity
+
+
+class TodoChecker:
+    def __init__(self, docs_root):
+        self.docs_root = docs_root
+
+    def validate(self, index, documents, result):
+        for doc in index:
+            if documents is None or doc.rel_path in documents:
+                for line, text in enumerate(doc.text.splitlines(), 1):
+                    if "TODO" in text:
+                        result.add_issue("TODO left in page", doc.rel_path,
+                                         Severity.WARNING, line, checker="todo")
+        return result
+
+
+SPEC = CheckerSpec(
+    name="todo",
+    factory=TodoChecker,
+    consumes=frozenset({"text"}),
+    description="Pages with TODOs",
+    default=False,
+)
+NOT_A_SPEC = object()
+"""
+
+
+@pytest.fixture
+def plugin(tmp_path, monkeypatch):
+    (tmp_path / "todo_plugin.py").write_text(PLUGIN)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(registry, "CHECKERS", dict(CHECKERS))
+    return "todo_plugin:SPEC"
+
+
+def test_plugin_from_module_path(plugin, tmp_path):
+    (loaded,) = load_plugins([plugin])
+    assert registry.CHECKERS["todo"] is loaded
+    # Loading the same plugin again is harmless
+    assert load_plugins([plugin]) == [loaded]
+
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("# A\n\nTODO: write this\n")
+    result = validate_docs(str(docs), checkers=["todo"])
+    assert [(issue.checker, issue.line) for issue in result.issues] == [("todo", 3)]
+    assert result.stats["checkers"]["todo"]["issues"] == 1
+
+
+def test_plugin_from_entry_point(plugin, monkeypatch):
+    entry_point = EntryPoint(name="todo", value=plugin, group=ENTRY_POINT_GROUP)
+    # Python 3.9's entry_points() returns a dict of groups
+    monkeypatch.setattr(registry, "entry_points", lambda: {ENTRY_POINT_GROUP: [entry_point]})
+    load_plugins()
+    assert "todo" in registry.CHECKERS
+
+
+@pytest.mark.parametrize(
+    "path", ["todo_plugin", "todo_plugin:MISSING", "missing_module:SPEC", "todo_plugin:NOT_A_SPEC"]
+)
+def test_bad_plugins(plugin, path):
+    with pytest.raises(ValueError, match=path):
+        load_plugins([path])
+
+
+def test_unknown_consumed_fields_are_rejected():
+    spec = CheckerSpec("odd", object, frozenset({"nope"}), "Consumes nothing that exists")
+    with pytest.raises(ValueError, match="nope"):
+        register(spec)
+
+
+def test_only_consumed_fields_are_parsed(tmp_path):
+    (tmp_path / "a.md").write_text("---\ntitle: A\n---\n# A\n\n[b](b.md)\n")
+    health = consumed_fields(resolve_checkers(["health"]))
+    doc = DocumentIndex.build(str(tmp_path), fields=health).load("a.md")
+    assert doc.front_matter == {"title": "A"}
+    assert doc.links == [] and doc.anchors == set()
+
+    refs = consumed_fields(resolve_checkers(["references"]))
+    doc = DocumentIndex.build(str(tmp_path), fields=refs).load("a.md")
+    assert doc.front_matter == {}
+    assert [link.target for link in doc.links] == ["b.md"] and doc.anchors == {"a"}
+
+
+def test_index_must_parse_what_checkers_consume(tmp_path):
+    (tmp_path / "a.md").write_text("# A\n")
+    index = DocumentIndex.build(str(tmp_path), fields=consumed_fields(resolve_checkers(["health"])))
+    with pytest.raises(ValueError, match="anchors, links"):
+        validate_docs(str(tmp_path), index, checkers=["references"])
+
+
+def test_cache_parsed_with_other_fields_is_stale(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("# A\n")
+    cache_path = tmp_path / "cache.json"
+    fields = consumed_fields(resolve_checkers(["health"]))
+    cache = ValidationCache.load(cache_path, ["health"], fields)
+    index = DocumentIndex.build(str(docs), cache=cache, fields=fields)
+    validate_docs(str(docs), index, cache, checkers=["health"])
+    cache.save(index)
+
+    assert ValidationCache.load(cache_path, ["health"], fields).entries
+    assert not ValidationCache.load(cache_path, ["health"]).entries
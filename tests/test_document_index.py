@@ -0,0 +1,65 @@
+"""Tests for the shared document index."""
+
+import builtins
+import io
+from collections import Counter
+
+import pytest
+from doc_validation import DocumentIndex
+from validate_docs import format_index, validate_docs
+
+PAGES = {
+    "index.md": "---\ntitle: Home\n---\n# Home\n\n[Guide](guide/a.md)\n",
+    "guide/a.md": "# A\n\n## Setup\n\n[B](b.md#setup)\n[Missing](missing.md)\n",
+    "guide/b.md": "# B\nNot formatted\n\n[A](a.md#setup)\n",
+    "orphan.md": "---\ntitle: [unclosed\n---\n# Orphan\n",
+}
+
+
+@pytest.fixture
+def docs(tmp_path):
+    docs = tmp_path / "docs"
+    for rel_path, text in PAGES.items():
+        path = docs / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    (docs / "images").mkdir()
+    (docs / "images" / "logo.png").write_bytes(b"")
+    return docs
+
+
+def test_a_run_reads_each_document_once(docs, monkeypatch):
+    reads = Counter()
+    for module in (builtins, io):
+        open_file = module.open
+
+        def record_open(file, *args, _open=open_file, **kwargs):
+            if str(file).endswith(".md"):
+                reads[str(file)] += 1
+            return _open(file, *args, **kwargs)
+
+        monkeypatch.setattr(module, "open", record_open)
+
+    index = DocumentIndex.build(str(docs))
+    assert format_index(index)
+    result = validate_docs(str(docs), index)
+
+    assert reads == {str(docs / rel_path): 1 for rel_path in PAGES}
+    assert {issue.checker for issue in result.issues} == {"health", "references"}
+    assert index.load("guide/b.md").text.startswith("# B\n\nNot formatted")
+
+
+def test_parallel_build_matches_serial_build(docs):
+    for i in range(20):
+        (docs / "guide" / f"page_{i:02d}.md").write_text(f"# Page {i}\n\n[A](a.md#setup)\n")
+    serial = DocumentIndex.build(str(docs))
+    parallel = DocumentIndex.build(str(docs), jobs=3)
+
+    assert list(parallel.documents) == list(serial.documents)
+    assert list(parallel) == list(serial)
+    assert parallel.files == serial.files and parallel.directories == serial.directories
+
+    result = validate_docs(str(docs), parallel)
+    assert result.issues == validate_docs(str(docs), serial).issues
+    keys = [(issue.file, issue.line or -1, issue.checker) for issue in result.issues]
+    assert keys == sorted(keys)
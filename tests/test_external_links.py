@@ -0,0 +1,166 @@
+"""Tests for the external link checker, against a local HTTP server."""
+
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from doc_validation import DocumentIndex
+from doc_validation.external_links import ExternalLinkCache, ExternalLinkChecker
+from doc_validation.validation_types import Severity
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Answers each path the way a kind of real-world server would."""
+
+    protocol_version = "HTTP/1.1"
+    requests: list[tuple[str, str]] = []
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, code, headers=(), body=b""):
+        self.send_response(code)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self.requests.append((self.command, self.path))
+        path = self.path
+        if path.startswith("/ok"):
+            self.reply(200)
+        elif path == "/nohead":
+            self.reply(405 if self.command == "HEAD" else 200, body=b"x" * 1000)
+        elif path == "/redirect":
+            self.reply(301, [("Location", "/ok?via=redirect")])
+        elif path == "/loop":
+            self.reply(302, [("Location", "/loop")])
+        elif path == "/gone":
+            self.reply(404)
+        elif path == "/limited":
+            self.reply(429)
+        elif path == "/slow":
+            time.sleep(1)
+            self.reply(200)
+        elif path.startswith("/busy"):
+            time.sleep(0.2)
+            self.reply(200)
+        else:
+            self.reply(500)
+
+    do_HEAD = do_GET
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def check(server, paths, **kwargs):
+    checker = ExternalLinkChecker(timeout=0.5, requests_per_second=0, **kwargs)
+    results = checker.check(server + path for path in paths)
+    return {url[len(server) :]: status for url, status in results.items()}
+
+
+def test_statuses(server):
+    results = check(server, ["/ok", "/nohead", "/redirect", "/gone", "/limited"])
+    assert results["/ok"].ok
+    assert results["/nohead"].ok
+    assert results["/redirect"].ok
+    assert results["/redirect"].final_url == server + "/ok?via=redirect"
+    assert results["/gone"].broken
+    assert not results["/limited"].ok and not results["/limited"].broken
+
+
+def test_unanswered(server):
+    results = check(server, ["/loop", "/slow"])
+    assert results["/loop"].status is None
+    assert "redirects" in results["/loop"].error
+    assert results["/slow"].status is None
+    assert "Timed out" in results["/slow"].error
+
+    refused = ExternalLinkChecker(timeout=0.5).check(["http://127.0.0.1:1/"])
+    status = refused["http://127.0.0.1:1/"]
+    assert status.error and not status.ok and not status.broken
+
+
+@pytest.mark.parametrize(
+    "limits",
+    [{"connections_per_host": 2, "requests_per_second": 0}, {"requests_per_second": 5}],
+)
+def test_waiting_for_a_slot_does_not_count_against_the_timeout(server, limits):
+    # Eight 0.2s requests over two connections, or at five per second, take
+    # longer than the timeout in total but not individually
+    checker = ExternalLinkChecker(timeout=0.5, **limits)
+    results = checker.check(f"{server}/busy?{i}" for i in range(8))
+    assert [status.error for status in results.values() if not status.ok] == []
+
+
+def test_tls_context_is_created_once(server, monkeypatch):
+    created = []
+    create_default_context = ssl.create_default_context
+    monkeypatch.setattr(
+        ssl, "create_default_context", lambda: created.append(1) or create_default_context()
+    )
+    # The local server does not speak TLS, so the handshakes fail
+    https = server.replace("http://", "https://")
+    results = ExternalLinkChecker(timeout=0.5).check([https + "/ok", https + "/gone"])
+    assert all(status.error for status in results.values())
+    assert len(created) == 1
+
+
+def test_non_ascii_target_is_encoded(server):
+    Handler.requests.clear()
+    assert check(server, ["/ok/ünï cøde"])["/ok/ünï cøde"].ok
+    assert ("HEAD", "/ok/%C3%BCn%C3%AF%20c%C3%B8de") in Handler.requests
+
+
+def test_cached_results_are_reused(server, tmp_path):
+    cache_path = tmp_path / "external_links.json"
+    cache = ExternalLinkCache.load(cache_path)
+    urls = [server + "/ok", server + "/gone"]
+    ExternalLinkChecker(cache=cache, requests_per_second=0).check(urls)
+    cache.save()
+
+    Handler.requests.clear()
+    checker = ExternalLinkChecker(cache=ExternalLinkCache.load(cache_path))
+    results = checker.check(urls)
+    assert checker.requested == 0
+    assert Handler.requests == []
+    assert results[server + "/ok"].ok and results[server + "/gone"].broken
+
+
+def test_requests_per_second(server):
+    Handler.requests.clear()
+    start = time.perf_counter()
+    ExternalLinkChecker(requests_per_second=10).check(f"{server}/ok?{i}" for i in range(5))
+    assert len(Handler.requests) == 5
+    assert time.perf_counter() - start >= 0.4
+
+
+def test_validate_reports_each_occurrence(server, tmp_path):
+    (tmp_path / "a.md").write_text(
+        f"[ok]({server}/ok#part)\n\n[gone]({server}/gone)\n\n[again]({server}/gone)\n"
+        f"\n[limited]({server}/limited)\n\n[upper]({server.upper()}/gone)\n"
+    )
+    index = DocumentIndex.build(str(tmp_path))
+    result = ExternalLinkChecker(timeout=0.5, requests_per_second=0).validate(index)
+    issues = sorted((issue.line, issue.severity, issue.message) for issue in result.issues)
+    assert [(line, severity) for line, severity, _ in issues] == [
+        (3, Severity.ERROR),
+        (5, Severity.ERROR),
+        (7, Severity.WARNING),
+        (9, Severity.ERROR),
+    ]
+    assert issues[0][2] == f"Broken external link '{server}/gone' (HTTP 404)"
+    assert result.stats["total_external_links"] == 4
@@ -0,0 +1,85 @@
+"""Tests for the single-pass markdown formatter."""
+
+import random
+import re
+from pathlib import Path
+
+import pytest
+from format_docs import FENCE_PATTERN, format_content
+
+DOCS_ROOT = Path(__file__).resolve().parents[1] / "docs"
+
+
+def baseline_format(content: str) -> str:
+    """The regex formatter that ``format_content`` replaced, kept as the reference."""
+    content = "\n".join(line.rstrip() for line in content.splitlines())
+    content = re.sub(r"\n{3,}", "\n\n", content)
+    # Lists
+    content = re.sub(r"([^\n])\n([-*])", r"\1\n\n\2", content)
+    content = re.sub(r"([-*][^\n]+)\n([^-*\n])", r"\1\n\n\2", content)
+    # Headings
+    content = re.sub(r"([^\n])\n(#+\s)", r"\1\n\n\2", content)
+    content = re.sub(r"(#+[^\n]+)\n([^#\n])", r"\1\n\n\2", content)
+    # Code blocks
+    content = re.sub(r"([^\n])\n(```)", r"\1\n\n\2", content)
+    content = re.sub(r"(```)\n([^\n])", r"\1\n\n\2", content)
+    # Admonitions
+    content = re.sub(r"([^\n])\n(!!! )", r"\1\n\n\2", content)
+    content = re.sub(r"(!!!.*\n.*)\n([^!\n])", r"\1\n\n\2", content)
+    return content.rstrip() + "\n"
+
+
+def prose_only(content: str) -> str:
+    """Drop fenced code blocks and admonitions, which the formatters treat differently."""
+    lines = []
+    fence = None
+    in_admonition = False
+    for line in content.splitlines():
+        match = FENCE_PATTERN.match(line)
+        if fence is not None:
+            if match and match.group(1)[0] == fence:
+                fence = None
+            continue
+        if match:
+            fence = match.group(1)[0]
+            continue
+        if line.startswith("!!!"):
+            in_admonition = True
+            continue
+        if in_admonition and (not line.strip() or line.startswith((" ", "\t"))):
+            continue
+        in_admonition = False
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize(
+    "path", sorted(DOCS_ROOT.rglob("*.md")), ids=lambda p: p.relative_to(DOCS_ROOT).as_posix()
+)
+def test_matches_baseline_on_docs(path):
+    content = prose_only(path.read_text(encoding="utf-8"))
+    assert format_content(content) == baseline_format(content)
+
+
+def test_matches_baseline_on_random_prose():
+    lines = [
+        "", "", "  ", "text", "a", "-", "*", "#", "##", "# Head", "## Sub #", "- item",
+        "* star", "-x", "a-b", "word -", "x*", "C# lang", "#tag", "end ```", "x```",
+        "  indented", "    - nested", "1. num", "|a|-|", "\t", "para text here", "--",
+        "#\t", "***", "- ", "> quote", "well-known",
+    ]  # fmt: skip
+    rng = random.Random(1)
+    for _ in range(20000):
+        content = "\n".join(rng.choice(lines) for _ in range(rng.randint(0, 9)))
+        content = "\n" * rng.randint(0, 2) + content + "\n" * rng.randint(0, 3)
+        assert format_content(content) == baseline_format(content), repr(content)
+
+
+def test_leaves_fenced_code_untouched():
+    content = "Text\n\n```python\n# comment\n- not a list\n\n\n\nx = 1\n```\n"
+    assert format_content(content) == content
+
+
+def test_spaces_admonition_blocks():
+    content = "Text\n!!! note\n    Body\n    More\nAfter\n"
+    assert format_content(content) == "Text\n\n!!! note\n    Body\n    More\n\nAfter\n"
@@ -0,0 +1,38 @@
+"""Tests for formatting the document index before validation."""
+
+import format_docs
+from doc_validation import DocumentIndex, ValidationCache
+from validate_docs import format_index, validate_docs
+
+CHECKERS = ["health", "references"]
+UNFORMATTED = "---\ntitle: t\ndescription: d\n---\n# A\ntext\n## B\nmore\n"
+
+
+def run(docs_root, cache_path, format_first):
+    """Build the index from the cache, optionally format it, validate and save the cache."""
+    cache = ValidationCache.load(cache_path, CHECKERS)
+    index = DocumentIndex.build(str(docs_root), cache=cache)
+    if format_first:
+        format_index(index)
+    validate_docs(str(docs_root), index, cache)
+    cache.save(index)
+    return index
+
+
+def test_documents_cached_by_a_no_format_run_are_formatted_later(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    page = docs / "unf.md"
+    page.write_text(UNFORMATTED)
+    cache_path = tmp_path / "cache.json"
+
+    run(docs, cache_path, format_first=False)
+    assert page.read_text() == UNFORMATTED
+
+    run(docs, cache_path, format_first=True)
+    assert page.read_text() == format_docs.format_content(UNFORMATTED)
+
+    # Now known to be formatted, so it is restored without being read again
+    index = run(docs, cache_path, format_first=True)
+    assert index.documents["unf.md"].cached
+    assert index.documents["unf.md"].formatted
@@ -0,0 +1,48 @@
+"""Tests for heading anchors, which must match the ones the toc extension generates."""
+
+import pytest
+from doc_validation.document_index import heading_anchors
+
+
+@pytest.mark.parametrize(
+    "title, anchor",
+    [
+        ("A &amp; B", "a-b"),
+        ("x < y > z", "x-y-z"),
+        ("Trailing_", "trailing_"),
+        ("__init__", "init"),
+        ("snake_case_name", "snake_case_name"),
+        ("*em* and _em_", "em-and-em"),
+        ("`a &amp; b` and `<b>`", "a-amp-b-and-b"),
+        ("<b>Bold</b> text", "bold-text"),
+        ("[Link](a.md) and ![image](i.png)", "link-and"),
+        ("&copy 2020", "copy-2020"),
+        ("Über straße", "uber-strae"),
+        ("Custom {#my-id}", "my-id"),
+        ("Classes only {: .wide }", "classes-only"),
+        ("Closing hashes ##", "closing-hashes"),
+        ("![logo](logo.png){: .icon } Title", "title"),
+    ],
+)
+def test_anchor(title, anchor):
+    assert heading_anchors([title]) == [anchor]
+
+
+def test_empty_slugs_are_numbered():
+    assert heading_anchors(["!!!", "???"]) == ["_1", "_2"]
+
+
+def test_duplicates_skip_explicit_ids_further_down():
+    assert heading_anchors(["Intro", "Intro", "Setup {#intro_1}"]) == [
+        "intro",
+        "intro_2",
+        "intro_1",
+    ]
+
+
+def test_footnote_references_are_dropped():
+    assert heading_anchors(["Results[^1]"]) == ["results"]
+
+
+def test_no_headings():
+    assert heading_anchors([]) == []
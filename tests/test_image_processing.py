@@ -0,0 +1,264 @@
+"""Tests for re-encoding images without their metadata."""
+
+import io
+import logging
+import os
+import sys
+import time
+
+import image_processing
+import pytest
+from image_manifest import (
+    DEFAULT_MANIFEST_NAME,
+    VERDICT_CLEAN,
+    VERDICT_NEEDS_PROCESSING,
+    ImageManifest,
+)
+from image_processing import (
+    MAX_WIDTH,
+    TARGET_DPI,
+    ImageMetadata,
+    check_images,
+    inspect_images,
+    iter_image_files,
+    load_resized,
+    map_images,
+    process_image,
+    process_inspection,
+    strip_metadata,
+)
+from PIL import Image, ImageFile, PngImagePlugin
+
+
+def exif_bytes():
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"  # Make
+    return exif.tobytes()
+
+
+def test_strip_metadata_keeps_pixels_and_transparency():
+    img = Image.new("P", (8, 4))
+    img.putpalette([value for i in range(256) for value in (i, 255 - i, 0)])
+    img.putdata([i % 5 for i in range(32)])
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG", transparency=2, exif=exif_bytes(), icc_profile=b"icc")
+
+    with Image.open(io.BytesIO(buffer.getvalue())) as opened:
+        clean = strip_metadata(opened)
+        assert type(clean) is Image.Image
+        assert clean.tobytes() == opened.tobytes()
+        assert clean.getpalette() == opened.getpalette()
+        assert clean.info == {"transparency": 2}
+        assert "exif" in opened.info
+
+
+def test_process_image_resizes_and_drops_metadata(tmp_path):
+    path = tmp_path / "photo.jpg"
+    Image.new("RGB", (MAX_WIDTH * 2, 100), (200, 100, 50)).save(
+        path, format="JPEG", dpi=(300, 300), exif=exif_bytes(), icc_profile=b"icc"
+    )
+
+    assert process_image(path)
+
+    with Image.open(path) as img:
+        assert img.width == MAX_WIDTH
+        assert "exif" not in img.info and "icc_profile" not in img.info
+        assert round(img.info["dpi"][0]) == TARGET_DPI
+
+
+def test_inspect_images_reports_files_that_cannot_be_stat(tmp_path):
+    good = tmp_path / "good.png"
+    Image.new("RGB", (10, 10)).save(good, dpi=(TARGET_DPI, TARGET_DPI))
+    gone = tmp_path / "gone.png"
+    manifest = ImageManifest(tmp_path / "manifest.json", tmp_path, {})
+
+    inspections = inspect_images([gone, good], manifest=manifest)
+
+    assert [inspection.path for inspection in inspections] == [gone, good]
+    assert inspections[0].error is not None
+    assert inspections[1].error is None
+    assert manifest.get(good) is not None
+    assert manifest.get(gone) is None
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["image_processing.py", *args])
+    try:
+        image_processing.main()
+    except SystemExit as e:
+        return e.code
+    return 0
+
+
+@pytest.mark.parametrize("mode", ["--check", "--dry-run"])
+def test_check_only_runs_write_nothing(tmp_path, monkeypatch, mode):
+    Image.new("RGB", (MAX_WIDTH * 2, 10)).save(tmp_path / "wide.png")
+    before = {path: path.stat().st_mtime_ns for path in tmp_path.iterdir()}
+    run_main(monkeypatch, "--directory", str(tmp_path), mode)
+    assert {path: path.stat().st_mtime_ns for path in tmp_path.iterdir()} == before
+
+
+def test_images_that_vanish_after_processing_are_not_recorded(tmp_path, monkeypatch):
+    for name in ("kept.png", "vanishing.png"):
+        Image.new("RGB", (MAX_WIDTH * 2, 10)).save(tmp_path / name)
+    process_inspection = image_processing.process_inspection
+
+    def process_then_delete(inspection, **kwargs):
+        success = process_inspection(inspection, **kwargs)
+        if inspection.path.name == "vanishing.png":
+            inspection.path.unlink()
+        return success
+
+    monkeypatch.setattr(image_processing, "process_inspection", process_then_delete)
+    assert run_main(monkeypatch, "--directory", str(tmp_path)) == 0
+
+    settings = {"max_width": MAX_WIDTH, "target_dpi": TARGET_DPI}
+    manifest = ImageManifest.load(tmp_path / DEFAULT_MANIFEST_NAME, tmp_path, settings)
+    assert manifest.get(tmp_path / "kept.png")["verdict"] == VERDICT_CLEAN
+    assert manifest.get(tmp_path / "vanishing.png")["verdict"] == VERDICT_NEEDS_PROCESSING
+
+
+def test_pixel_budget_counts_the_reduced_jpeg_size(tmp_path):
+    path = tmp_path / "photo.jpg"
+    Image.new("RGB", (4000, 3000), (10, 120, 200)).save(path, quality=80)
+    # Decoded at 1/2 scale (2000x1500) to stay twice above the 800 pixel target
+    budget = 2000 * 1500
+
+    with Image.open(path) as img:
+        resized = load_resized(img, budget)
+        assert resized.size == (MAX_WIDTH, 600)
+
+    assert process_image(path, max_pixels=budget)
+    with Image.open(path) as img:
+        assert img.size == (MAX_WIDTH, 600)
+
+
+def test_images_over_the_pixel_budget_are_refused(tmp_path):
+    path = tmp_path / "large.png"
+    Image.new("RGB", (2000, 1500)).save(path)
+    original = path.read_bytes()
+
+    with Image.open(path) as img, pytest.raises(ValueError, match="budget"):
+        load_resized(img, 2000 * 1500 - 1)
+
+    assert not process_image(path, max_pixels=2000 * 1500 - 1)
+    assert path.read_bytes() == original
+
+
+def logged_square(value):
+    # Later items finish first, so workers complete out of input order
+    time.sleep((5 - value) * 0.02)
+    logging.getLogger("image_processing").info(f"square of {value}")
+    return value * value
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+@pytest.mark.parametrize("as_generator", [False, True])
+def test_map_images_keeps_input_order(caplog, jobs, as_generator):
+    caplog.set_level(logging.INFO)
+    items = (value for value in range(6)) if as_generator else list(range(6))
+
+    assert map_images(logged_square, items, jobs) == [0, 1, 4, 9, 16, 25]
+    # Worker log records are replayed in the parent, in input order
+    assert caplog.messages == [f"square of {value}" for value in range(6)]
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Record every path Pillow opens and fail on any pixel decode."""
+    paths = []
+    open_image = Image.open
+
+    def record_open(fp, *args, **kwargs):
+        if not isinstance(fp, io.BytesIO):
+            paths.append(fp)
+        return open_image(fp, *args, **kwargs)
+
+    def refuse_load(self):
+        raise AssertionError("pixels decoded during inspection")
+
+    monkeypatch.setattr(Image, "open", record_open)
+    monkeypatch.setattr(ImageFile.ImageFile, "load", refuse_load)
+    return paths
+
+
+def test_inspection_reads_headers_only(tmp_path, opened):
+    png = tmp_path / "art.png"
+    info = PngImagePlugin.PngInfo()
+    info.add_text("Software", "Generator")
+    Image.new("RGB", (MAX_WIDTH + 1, 10)).save(png, exif=exif_bytes(), pnginfo=info, dpi=(300, 300))
+    jpeg = tmp_path / "clean.jpg"
+    Image.new("RGB", (10, 10)).save(jpeg, dpi=(TARGET_DPI, TARGET_DPI))
+
+    art = ImageMetadata(png)
+    assert art.metadata == {"EXIF_Make": "Camera maker", "Software": "Generator"}
+    assert art.needs_resize() and art.has_wrong_dpi()
+    assert not ImageMetadata(jpeg).needs_processing()
+    assert opened == [png, jpeg]
+
+
+def test_check_opens_each_image_once(tmp_path, opened):
+    paths = [tmp_path / "a.png", tmp_path / "b.png"]
+    Image.new("RGB", (MAX_WIDTH + 1, 10)).save(paths[0])
+    Image.new("RGB", (10, 10)).save(paths[1])
+
+    assert check_images(paths) == ([paths[0]], [paths[1]])
+    assert opened == paths
+
+
+def test_iter_image_files_walks_once_in_sorted_order(tmp_path):
+    for name in [
+        "b.PNG",
+        "a.Jpeg",
+        "notes.txt",
+        "z/deep/c.gif",
+        "m/d.tiff",
+        "m.bmp",
+        ".git/objects/e.png",
+        "site/assets/f.png",
+        "docs/node_modules/pkg/g.png",
+        "drafts/h.png",
+    ]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+    (tmp_path / "folder.png").mkdir()
+
+    found = iter_image_files(tmp_path)
+    assert next(found) == tmp_path / "a.Jpeg"
+    rest = [str(path.relative_to(tmp_path)) for path in found]
+    assert rest == ["b.PNG", "drafts/h.png", "m/d.tiff", "m.bmp", "z/deep/c.gif"]
+
+    found = iter_image_files(tmp_path, exclude={".git", "site", "drafts", "m"})
+    assert [path.name for path in found] == ["a.Jpeg", "b.PNG", "g.png", "m.bmp", "c.gif"]
+
+
+def test_processed_images_are_verified_in_memory(tmp_path, monkeypatch):
+    path = tmp_path / "wide.png"
+    Image.new("RGB", (MAX_WIDTH * 2, 10)).save(path)
+    original = path.read_bytes()
+    inspection = ImageMetadata(path)
+
+    verified = []
+    monkeypatch.setattr(
+        image_processing, "verify_image", lambda encoded: verified.append(encoded) or False
+    )
+    assert not process_inspection(inspection)
+    # The encoded result was inspected, but the failed verification left no trace
+    assert verified[0].path == path and verified[0].size == (MAX_WIDTH, 5)
+    assert path.read_bytes() == original
+    assert os.listdir(tmp_path) == ["wide.png"]
+
+
+def test_processing_reads_the_original_once(tmp_path, monkeypatch):
+    path = tmp_path / "wide.png"
+    Image.new("RGB", (MAX_WIDTH * 2, 10)).save(path, dpi=(300, 300))
+    inspection = ImageMetadata(path)
+
+    opened = []
+    open_image = Image.open
+    monkeypatch.setattr(Image, "open", lambda fp, *args: opened.append(fp) or open_image(fp, *args))
+    assert process_inspection(inspection)
+    assert [fp for fp in opened if not isinstance(fp, io.BytesIO)] == [path]
+    assert os.listdir(tmp_path) == ["wide.png"]
+    assert not ImageMetadata(path).needs_processing()
@@ -0,0 +1,55 @@
+"""Tests for responsive image variants."""
+
+import argparse
+
+import pytest
+from image_processing import MAX_WIDTH, build_variants, parse_variant_widths
+from image_variants import (
+    DEFAULT_VARIANT_WIDTHS,
+    VARIANT_INDEX_NAME,
+    load_variant_index,
+    plan_widths,
+)
+from PIL import Image
+
+
+def test_default_widths_are_produced_from_processed_images():
+    assert plan_widths(MAX_WIDTH, DEFAULT_VARIANT_WIDTHS) == list(DEFAULT_VARIANT_WIDTHS)
+
+
+def test_parse_variant_widths():
+    assert parse_variant_widths("400, 800,") == (400, 800)
+
+
+@pytest.mark.parametrize("value", ["400,abc", "0", str(MAX_WIDTH + 1), ","])
+def test_parse_variant_widths_rejects_invalid_values(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_variant_widths(value)
+
+
+def test_failed_sources_keep_their_previous_variants(tmp_path):
+    root = tmp_path / "docs"
+    root.mkdir()
+    images = [root / "a.png", root / "b.png"]
+    for color, path in zip(("red", "blue"), images):
+        Image.new("RGB", (600, 300), color).save(path)
+    variant_dir = root / "variants"
+
+    assert build_variants(images, root, variant_dir, (400,), "webp")
+    before = load_variant_index(variant_dir)
+
+    # a.png stops decoding; b.png changes, so its old variant is stale
+    images[0].write_bytes(b"not an image")
+    Image.new("RGB", (600, 300), "green").save(images[1])
+    assert not build_variants(images, root, variant_dir, (400,), "webp")
+
+    after = load_variant_index(variant_dir)
+    assert after["a.png"] == before["a.png"]
+    assert after["b.png"] != before["b.png"]
+    files = {path.name for path in variant_dir.iterdir()}
+    assert files == {
+        VARIANT_INDEX_NAME,
+        *(variant["file"] for entry in after.values() for variant in entry["variants"]),
+    }
+    assert before["a.png"]["variants"][0]["file"] in files
+    assert before["b.png"]["variants"][0]["file"] not in files
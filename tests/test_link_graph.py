@@ -0,0 +1,93 @@
+"""Tests for the link graph of documentation pages."""
+
+import sys
+
+from doc_validation import DocumentIndex
+from doc_validation.link_graph import LinkGraph, nav_pages
+from validate_docs import validate_docs
+
+PAGES = ["index.md", "a.md", "b.md", "c.md", "d.md", "e.md", "f.md", "nav.md"]
+LINKS = {
+    "index.md": {"a.md", "missing.md"},
+    "a.md": {"b.md", "a.md"},
+    "b.md": {"c.md"},
+    "c.md": {"a.md"},
+    "e.md": {"f.md"},
+    "f.md": {"e.md", "d.md"},
+    "missing.md": {"d.md"},
+}
+
+
+def test_links_and_inbound_counts():
+    graph = LinkGraph(PAGES, LINKS)
+    # Self links and links to or from unknown pages are dropped
+    assert graph.edge_count == 7
+    assert graph.links_from("a.md") == ["b.md"]
+    assert graph.links_to("a.md") == ["c.md", "index.md"]
+    assert graph.inbound_counts() == {
+        "a.md": 2,
+        "b.md": 1,
+        "c.md": 1,
+        "d.md": 1,
+        "e.md": 1,
+        "f.md": 1,
+        "index.md": 0,
+        "nav.md": 0,
+    }
+
+
+def test_orphans_and_reachability():
+    graph = LinkGraph(PAGES, LINKS)
+    assert graph.reachable(["index.md"]) == {"index.md", "a.md", "b.md", "c.md"}
+    assert graph.orphans(["index.md"]) == ["d.md", "e.md", "f.md", "nav.md"]
+    assert graph.orphans(["index.md", "nav.md", "f.md", "unknown.md"]) == []
+
+
+def test_clusters():
+    graph = LinkGraph(PAGES, LINKS)
+    assert graph.clusters() == [["a.md", "b.md", "c.md"], ["e.md", "f.md"]]
+    assert graph.clusters(min_size=3) == [["a.md", "b.md", "c.md"]]
+    assert len(graph.clusters(min_size=1)) == 5
+
+
+def test_long_chains_do_not_recurse():
+    pages = [f"page_{i:05d}.md" for i in range(sys.getrecursionlimit() * 2)]
+    links = {page: {target} for page, target in zip(pages, pages[1:] + pages[:1])}
+    graph = LinkGraph(pages, links)
+    assert graph.clusters() == [pages]
+    assert graph.orphans([pages[-1]]) == []
+
+
+def test_nav_pages(tmp_path):
+    mkdocs = tmp_path / "mkdocs.yml"
+    mkdocs.write_text(
+        "nav:\n"
+        "  - Home: index.md\n"
+        "  - Guide:\n"
+        "      - guide/./start.md\n"
+        "      - External: https://example.com/page.md\n"
+        "  - /abs.md\n"
+        "markdown_extensions:\n"
+        "  - pymdownx.emoji:\n"
+        "      emoji_index: !!python/name:material.extensions.emoji.twemoji\n"
+    )
+    assert nav_pages(mkdocs) == ["index.md", "guide/start.md", "abs.md"]
+    assert nav_pages(tmp_path / "missing.yml") == []
+
+
+def test_report_section(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (tmp_path / "mkdocs.yml").write_text("nav:\n  - nav.md\n")
+    (docs / "index.md").write_text("# Home\n\n[A](a.md)\n")
+    (docs / "a.md").write_text("# A\n\n[Home](index.md)\n")
+    (docs / "nav.md").write_text("# Nav\n")
+    (docs / "orphan.md").write_text("# Orphan\n")
+
+    result = validate_docs(str(docs), DocumentIndex.build(str(docs)))
+
+    links = result.sections["links"]
+    assert links["orphans"] == ["orphan.md"]
+    assert links["clusters"] == [["a.md", "index.md"]]
+    assert links["linked_from"]["index.md"] == ["a.md"]
+    assert result.stats["orphan_pages"] == 1 and result.stats["link_clusters"] == 1
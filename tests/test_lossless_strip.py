@@ -0,0 +1,72 @@
+"""Tests for container-level metadata removal."""
+
+import io
+import random
+
+import pytest
+from image_processing import TARGET_DPI, ImageMetadata
+from lossless_strip import strip_jpeg, strip_png
+from PIL import Image, PngImagePlugin
+
+
+def noise_image(mode="RGB", size=(64, 48)):
+    """Return an image with random pixels, so any re-encode would change them."""
+    rng = random.Random(0)
+    data = bytes(rng.randrange(256) for _ in range(size[0] * size[1] * len(mode)))
+    return Image.frombytes(mode, size, data)
+
+
+def exif_bytes():
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"  # Make
+    exif[0x0131] = "Some editor"  # Software
+    return exif.tobytes()
+
+
+def jpeg_with_metadata():
+    buffer = io.BytesIO()
+    noise_image().save(
+        buffer, format="JPEG", quality=90, dpi=(300, 300), exif=exif_bytes(), comment=b"secret"
+    )
+    return buffer.getvalue()
+
+
+def png_with_metadata():
+    info = PngImagePlugin.PngInfo()
+    info.add_text("Author", "someone")
+    info.add_itxt("Description", "compressed text", zip=True)
+    buffer = io.BytesIO()
+    noise_image("RGBA").save(buffer, format="PNG", pnginfo=info, dpi=(300, 300), exif=exif_bytes())
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    "make, strip", [(jpeg_with_metadata, strip_jpeg), (png_with_metadata, strip_png)]
+)
+def test_strip_keeps_pixels_and_removes_metadata(make, strip):
+    original = make()
+    assert ImageMetadata(None, data=original).has_metadata()
+
+    stripped = io.BytesIO()
+    strip(io.BytesIO(original), stripped, TARGET_DPI)
+    data = stripped.getvalue()
+
+    with Image.open(io.BytesIO(original)) as before, Image.open(io.BytesIO(data)) as after:
+        assert after.mode == before.mode
+        assert after.size == before.size
+        assert after.tobytes() == before.tobytes()
+
+    inspection = ImageMetadata(None, data=data)
+    assert inspection.error is None
+    assert not inspection.has_metadata()
+    assert not inspection.has_wrong_dpi()
+
+
+@pytest.mark.parametrize(
+    "make, strip", [(jpeg_with_metadata, strip_jpeg), (png_with_metadata, strip_png)]
+)
+def test_strip_rejects_truncated_headers(make, strip):
+    # Cut inside the metadata; image data after it is streamed without parsing
+    data = make()[:40]
+    with pytest.raises(ValueError):
+        strip(io.BytesIO(data), io.BytesIO(), TARGET_DPI)
@@ -0,0 +1,55 @@
+"""Tests for the code-aware markdown tokenizer."""
+
+from doc_validation.markdown_tokens import tokenize
+
+
+def link_targets(text):
+    return [link.target for link in tokenize(text).links]
+
+
+def heading_titles(text):
+    return [heading.title for heading in tokenize(text).headings]
+
+
+def test_fenced_code_yields_nothing():
+    text = "# Title\n\n```\n# Not a heading\n[a](not.md)\n```\n\n[b](b.md)\n"
+    assert heading_titles(text) == ["Title"]
+    assert link_targets(text) == ["b.md"]
+
+
+def test_indented_code_yields_nothing():
+    text = "Text\n\n    # Not a heading\n    [a](not.md)\n\n\tsee [c](tab.md)\n\n[b](b.md)\n"
+    assert heading_titles(text) == []
+    assert link_targets(text) == ["b.md"]
+
+
+def test_indented_code_after_heading():
+    text = "# Title\n    [a](not.md)\n"
+    assert heading_titles(text) == ["Title"]
+    assert link_targets(text) == []
+
+
+def test_indented_code_does_not_open_fences_or_comments():
+    text = "Intro\n\n    ```\n    <!--\n\n[b](b.md)\n"
+    assert link_targets(text) == ["b.md"]
+
+
+def test_indented_paragraph_continuation_is_not_code():
+    text = "Text that\n    continues [a](a.md)\n"
+    assert link_targets(text) == ["a.md"]
+
+
+def test_indented_list_content_is_not_code():
+    text = "- Item\n\n    More about [a](a.md)\n\n1. First\n\n    [b](b.md)\n"
+    assert link_targets(text) == ["a.md", "b.md"]
+
+
+def test_indented_admonition_content_is_not_code():
+    text = '!!! note\n\n    See [a](a.md)\n\n    And [b](b.md)\n\n=== "Tab"\n\n    [c](c.md)\n'
+    assert link_targets(text) == ["a.md", "b.md", "c.md"]
+
+
+def test_indented_code_after_list():
+    text = "- Item\n\nParagraph\n\n    [a](not.md)\n\n## After\n\n    [b](not.md)\n"
+    assert heading_titles(text) == ["After"]
+    assert link_targets(text) == []
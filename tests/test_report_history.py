@@ -0,0 +1,126 @@
+"""Tests for the validation report history."""
+
+import sqlite3
+
+import pytest
+from doc_validation import ReportHistory
+from doc_validation.report_history import SCHEMA, diff_issues
+from doc_validation.validation_types import Severity, ValidationIssue, ValidationResult
+
+
+def make_result(*issues, checkers=("health", "references")):
+    """Build a result from (file, checker, message) tuples."""
+    result = ValidationResult()
+    for file, checker, message in issues:
+        result.add_issue(message, file, Severity.ERROR, checker=checker)
+    result.add_stat("checkers", {name: {} for name in checkers})
+    return result
+
+
+def test_diff_only_compares_checkers_both_runs_ran(tmp_path):
+    with ReportHistory(tmp_path / "history.sqlite3") as history:
+        history.record(
+            "external",
+            make_result(
+                ("a.md", "references", "Broken reference"),
+                ("a.md", "external_links", "Broken external link"),
+                checkers=("health", "references", "external_links"),
+            ),
+        )
+        diff = history.diff(
+            make_result(("a.md", "references", "Broken reference"), ("b.md", "health", "No title"))
+        )
+        assert diff.not_compared == ["external_links"]
+        assert diff.fixed == []
+        assert [issue.file for issue in diff.new] == ["b.md"]
+
+        history.record("refs", make_result(checkers=("references",)))
+        diff = history.diff(make_result(("b.md", "health", "No title")), "external")
+        assert diff.not_compared == ["external_links"]
+        assert [issue.message for issue in diff.fixed] == ["Broken reference"]
+
+
+def test_runs_recorded_before_checkers_were_stored(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    connection = sqlite3.connect(str(path))
+    connection.executescript(SCHEMA.replace(",\n    checkers TEXT", ""))
+    connection.execute(
+        "INSERT INTO runs (id, timestamp, total_errors, total_warnings, stats) "
+        "VALUES ('old', '2024-01-01T00:00:00', 1, 0, '{}')"
+    )
+    connection.execute(
+        "INSERT INTO issues (run, file, checker, severity, message) "
+        "VALUES (1, 'a.md', 'external_links', 'error', 'Broken external link')"
+    )
+    connection.commit()
+    connection.close()
+
+    with ReportHistory(path) as history:
+        # Without a record of its checkers, the old run is compared in full
+        diff = history.diff(make_result())
+        assert diff.not_compared == []
+        assert [issue.checker for issue in diff.fixed] == ["external_links"]
+        history.record("new", make_result())
+        assert [run["id"] for run in history.runs()] == ["new", "old"]
+
+
+def test_record_and_load_runs(tmp_path):
+    with ReportHistory(tmp_path / "history.sqlite3") as history:
+        result = make_result(("a.md", "references", "Broken reference"))
+        result.add_issue("No title", "b.md", Severity.WARNING, 3, "Add one", checker="health")
+        history.record("20240101-aaaa", result)
+
+        (run,) = history.runs()
+        assert run["id"] == "20240101-aaaa"
+        assert (run["total_errors"], run["total_warnings"]) == (1, 1)
+        assert history.issues("last") == result.issues
+        assert history.issues("20240101-aaaa", file="b.md") == [result.issues[1]]
+        assert history.issues("20240101", checker="references") == [result.issues[0]]
+
+
+def test_run_references(tmp_path):
+    with ReportHistory(tmp_path / "history.sqlite3") as history:
+        for run_id in ("20240101-aaaa", "20240101-aabb", "20240102-cccc", "2024"):
+            history.record(run_id, make_result((f"{run_id}.md", "health", "No title")))
+
+        assert history._find_run("last")[1] == "2024"
+        assert history._find_run("20240102")[1] == "20240102-cccc"
+        assert history._find_run("20240101-aab")[1] == "20240101-aabb"
+        # An exact id wins over the longer ids it is a prefix of
+        assert history._find_run("2024")[1] == "2024"
+        assert history._find_run("2023") is None
+        with pytest.raises(ValueError, match="ambiguous"):
+            history._find_run("20240101-aa")
+        with pytest.raises(KeyError):
+            history.issues("2023")
+        with pytest.raises(KeyError):
+            history.diff(make_result(), "2023")
+
+
+def test_prune_keeps_the_latest_runs(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    with ReportHistory(path) as history:
+        for i in range(5):
+            history.record(f"run-{i}", make_result(("a.md", "health", "No title")))
+        assert history.prune(keep=2) == 3
+        assert [run["id"] for run in history.runs()] == ["run-4", "run-3"]
+        assert history.prune(keep=2) == 0
+
+    # Issues of pruned runs go with them
+    connection = sqlite3.connect(str(path))
+    assert connection.execute("SELECT COUNT(*) FROM issues").fetchone() == (2,)
+    connection.close()
+
+
+def test_diff_counts_repeated_issues():
+    def issue(line):
+        return ValidationIssue("Broken link", "a.md", line, checker="references")
+
+    other = ValidationIssue("No title", "b.md", checker="health")
+    # Lines shift between runs without making an issue new
+    new, fixed = diff_issues([issue(1), issue(5), other], [issue(2)])
+    assert new == []
+    assert fixed == [issue(1), other]
+
+    new, fixed = diff_issues([issue(1)], [issue(1), issue(9)])
+    assert new == [issue(9)] and fixed == []
@@ -0,0 +1,100 @@
+"""Tests for the streaming report formats."""
+
+import io
+import json
+
+import pytest
+from doc_validation import DocumentIndex
+from doc_validation.reporters import SARIF_VERSION, JsonLinesReporter, SarifReporter
+from doc_validation.validation_types import Severity, ValidationResult
+from validate_docs import validate_docs
+
+
+def report(reporter_class, result, docs_root="docs"):
+    """Stream a result through a reporter, returning the output after each issue and at the end."""
+    stream = io.StringIO()
+    reporter = reporter_class(stream, docs_root)
+    reporter.start()
+    partial = []
+    for issue in result.issues:
+        reporter.issue(issue)
+        partial.append(stream.getvalue())
+    reporter.finish(result)
+    return partial, stream.getvalue()
+
+
+@pytest.fixture
+def result():
+    result = ValidationResult()
+    result.add_issue("Broken reference", "guide/a.md", Severity.ERROR, 3, "b.md", "references")
+    result.add_issue("No title", "b.md", Severity.WARNING, checker="health")
+    result.add_issue("Long page", "b.md", Severity.INFO, checker="custom")
+    result.add_stat("total_files", 2)
+    return result
+
+
+def test_json_lines(result):
+    partial, output = report(JsonLinesReporter, result)
+
+    # Each issue is written as soon as it is reported
+    assert json.loads(partial[0].splitlines()[-1])["message"] == "Broken reference"
+    records = [json.loads(line) for line in output.splitlines()]
+    assert [record["type"] for record in records] == ["issue", "issue", "issue", "summary"]
+    assert records[0] == {"type": "issue", **result.issues[0].to_dict()}
+    summary = records[-1]
+    assert (summary["total_errors"], summary["total_warnings"]) == (1, 1)
+    assert summary["stats"] == {"total_files": 2}
+
+
+def test_sarif(result):
+    partial, output = report(SarifReporter, result)
+
+    assert '"Broken reference' in partial[0]
+    log = json.loads(output)
+    assert log["version"] == SARIF_VERSION
+    (run,) = log["runs"]
+    rules = run["tool"]["driver"]["rules"]
+    assert [rule["id"] for rule in rules] == ["references", "health", "custom"]
+    assert rules[0]["shortDescription"]["text"]
+    assert rules[2]["shortDescription"]["text"] == "custom"
+
+    first, second, third = run["results"]
+    assert first["ruleId"] == "references" and first["level"] == "error"
+    assert first["message"]["text"] == "Broken reference (b.md)"
+    location = first["locations"][0]["physicalLocation"]
+    assert location == {"artifactLocation": {"uri": "docs/guide/a.md"}, "region": {"startLine": 3}}
+    assert "region" not in second["locations"][0]["physicalLocation"]
+    assert (second["level"], third["level"]) == ("warning", "note")
+
+
+def test_sarif_locations_under_an_absolute_root(result, tmp_path):
+    _, output = report(SarifReporter, result, str(tmp_path))
+    uri = json.loads(output)["runs"][0]["results"][0]["locations"][0]["physicalLocation"]
+    assert uri["artifactLocation"]["uri"] == (tmp_path / "guide" / "a.md").as_uri()
+
+
+@pytest.mark.parametrize("reporter_class", [JsonLinesReporter, SarifReporter])
+def test_reports_of_a_validation_run_parse(tmp_path, reporter_class):
+    (tmp_path / "index.md").write_text("# Home\n\n[gone](gone.md)\n")
+    stream = io.StringIO()
+    reporter = reporter_class(stream, str(tmp_path))
+    reporter.start()
+    result = validate_docs(
+        str(tmp_path), DocumentIndex.build(str(tmp_path)), on_issue=reporter.issue
+    )
+    reporter.finish(result)
+
+    output = stream.getvalue()
+    if reporter_class is SarifReporter:
+        assert len(json.loads(output)["runs"][0]["results"]) == len(result.issues)
+    else:
+        assert len([json.loads(line) for line in output.splitlines()]) == len(result.issues) + 1
+
+
+def test_empty_reports_parse():
+    _, output = report(JsonLinesReporter, ValidationResult())
+    assert [json.loads(line)["type"] for line in output.splitlines()] == ["summary"]
+
+    _, output = report(SarifReporter, ValidationResult())
+    (run,) = json.loads(output)["runs"]
+    assert run["results"] == [] and run["tool"]["driver"]["rules"] == []
@@ -0,0 +1,28 @@
+"""Tests for the text output of the validation runner."""
+
+from doc_validation import DocumentIndex
+from doc_validation.validation_types import Severity, ValidationIssue
+from validate_docs import print_issues, validate_docs
+
+
+def test_print_issues_includes_context(capsys):
+    print_issues(
+        [
+            ValidationIssue("Broken link", "a.md", 3, Severity.ERROR, "Did you mean 'b.md'?"),
+            ValidationIssue("Missing title", "b.md", severity=Severity.WARNING),
+        ]
+    )
+    assert capsys.readouterr().out.splitlines() == [
+        f"[{Severity.ERROR}] a.md:3",
+        "  Broken link",
+        "  Did you mean 'b.md'?",
+        f"[{Severity.WARNING}] b.md",
+        "  Missing title",
+    ]
+
+
+def test_suggestions_are_printed(tmp_path, capsys):
+    (tmp_path / "a.md").write_text("# A\n\n## Getting Started\n\n[start](#Getting%20Started)\n")
+    result = validate_docs(str(tmp_path), DocumentIndex.build(str(tmp_path)))
+    print_issues(result.issues)
+    assert "  Did you mean '#getting-started'?" in capsys.readouterr().out.splitlines()
@@ -0,0 +1,78 @@
+"""Tests for the incremental validation cache."""
+
+from datetime import date
+
+from doc_validation import DocumentIndex, ValidationCache
+from doc_validation.validation_cache import json_safe
+from validate_docs import validate_docs
+
+CHECKERS = ["health", "references"]
+
+
+def run(docs_root, cache_path):
+    """Validate with the cache at cache_path and save it, like validate_docs.py."""
+    cache = ValidationCache.load(cache_path, CHECKERS)
+    index = DocumentIndex.build(str(docs_root), cache=cache)
+    result = validate_docs(str(docs_root), index, cache)
+    cache.save(index)
+    return result
+
+
+def test_json_safe_stringifies_keys():
+    data = json_safe({"title": "t", 3: [1, {True: None}], "date": date(2024, 1, 1)})
+    assert data == {"title": "t", "3": [1, {"True": None}], "date": "2024-01-01"}
+
+
+def test_front_matter_with_non_string_keys_is_cached(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "index.md").write_text(
+        "---\ntitle: t\ndescription: d\n2024-01-01: launched\n3: three\nnested:\n  5: x\n---\n# Hi\n"
+    )
+    cache_path = tmp_path / "cache.json"
+
+    first = run(docs, cache_path)
+    second = run(docs, cache_path)
+
+    assert second.stats["cached_documents"] == 1
+    assert [i.to_dict() for i in second.issues] == [i.to_dict() for i in first.issues]
+
+
+def test_self_referencing_front_matter_is_not_cached(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "index.md").write_text("---\ntitle: t\ndescription: d\n---\n# Hi\n")
+    (docs / "loop.md").write_text("---\nloop: &a [1, *a]\n---\n# Loop\n")
+    cache_path = tmp_path / "cache.json"
+
+    run(docs, cache_path)
+    second = run(docs, cache_path)
+
+    assert second.stats["checked_documents"] == 1
+    assert second.stats["cached_documents"] == 1
+    assert [i.file for i in second.issues] == ["loop.md"]
+
+
+def test_targets_outside_docs_root_invalidate_cache(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "index.md").write_text(
+        "---\ntitle: t\ndescription: d\n---\n# Hi\n\n[Readme](../README.md)\n"
+    )
+    (docs / "other.md").write_text("---\ntitle: t\ndescription: d\n---\n# Other\n")
+    cache_path = tmp_path / "cache.json"
+
+    assert [i.file for i in run(docs, cache_path).issues] == ["index.md"]
+
+    (tmp_path / "README.md").write_text("# Readme\n")
+    created = run(docs, cache_path)
+    assert created.stats["checked_documents"] == 1
+    assert created.issues == []
+
+    unchanged = run(docs, cache_path)
+    assert unchanged.stats["checked_documents"] == 0
+
+    (tmp_path / "README.md").unlink()
+    deleted = run(docs, cache_path)
+    assert deleted.stats["checked_documents"] == 1
+    assert [i.file for i in deleted.issues] == ["index.md"]
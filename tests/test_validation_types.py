@@ -0,0 +1,68 @@
+"""Tests for validation issues and results."""
+
+import pytest
+from doc_validation.validation_types import Severity, ValidationIssue, ValidationResult
+
+ERROR, WARNING, INFO = Severity.ERROR, Severity.WARNING, Severity.INFO
+
+
+@pytest.fixture
+def result():
+    result = ValidationResult()
+    result.add_issue("Broken link", "b.md", ERROR, 4, checker="references")
+    result.add_issue("Missing title", "a.md", WARNING, checker="health")
+    result.add_issue("Broken anchor", "a.md", ERROR, 2, checker="references")
+    result.add_issue("Long page", "c.md", INFO, checker="health")
+    return result
+
+
+def test_counts_and_buckets(result):
+    assert (result.error_count, result.warning_count, result.info_count) == (2, 1, 1)
+    assert result.has_errors
+    assert result.count() == 4
+    assert result.count(checker="references") == 2
+    assert result.count(WARNING, "health") == 1
+    assert result.count(WARNING, "references") == 0
+    assert result.count(checker="unknown") == 0
+    assert result.checkers == ["references", "health"]
+
+    assert [i.message for i in result.issues_for(ERROR)] == ["Broken link", "Broken anchor"]
+    assert [i.message for i in result.issues_for(checker="health")] == [
+        "Missing title",
+        "Long page",
+    ]
+    assert result.issues_for(INFO, "references") == []
+    assert result.issues_for() is result.issues
+
+
+def test_buckets_follow_sort_merge_and_extend(result):
+    result.sort()
+    assert [i.message for i in result.issues_for(ERROR)] == ["Broken anchor", "Broken link"]
+
+    other = ValidationResult(issues=[ValidationIssue("Bad front matter", "d.md", 1)])
+    other.add_stat("documents", 4)
+    assert other.error_count == 1
+    result.merge(other)
+    assert result.error_count == 3 and result.count(checker="unknown") == 1
+    assert result.stats == {"documents": 4}
+
+    streamed = []
+    copy = ValidationResult(on_issue=streamed.append)
+    copy.extend(result.issues)
+    assert streamed == result.issues
+    assert copy.count(ERROR, "references") == 2
+
+
+def test_no_errors():
+    result = ValidationResult()
+    result.add_issue("Long page", "c.md", WARNING)
+    assert not result.has_errors and result.error_count == 0
+
+
+def test_issues_are_slotted_and_round_trip():
+    issue = ValidationIssue("Broken link", "a.md", 3, WARNING, "Did you mean 'b.md'?", "refs")
+    with pytest.raises(AttributeError):
+        issue.extra = True
+    assert ValidationIssue.from_dict(issue.to_dict()) == issue
+    assert hash(ValidationIssue.from_dict(issue.to_dict())) == hash(issue)
+    assert issue != ValidationIssue("Broken link", "a.md", 3, ERROR, "Did you mean 'b.md'?", "refs")
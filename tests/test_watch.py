@@ -0,0 +1,100 @@
+"""Tests for refreshing the document index from watcher changes."""
+
+import pytest
+from doc_validation import DocumentIndex
+from doc_validation.watcher import InotifyWatcher, PollingWatcher
+from validate_docs import validate_docs
+
+FRONT_MATTER = "---\ntitle: t\ndescription: d\n---\n"
+
+
+def edit(root):
+    (root / "a.md").write_text(FRONT_MATTER + "# A\n\n## Renamed\n\n[b](b.md#section)\n")
+
+
+def add(root):
+    (root / "guide" / "new.md").write_text(FRONT_MATTER + "# New\n\n[a](../a.md#renamed)\n")
+
+
+def delete(root):
+    (root / "b.md").unlink()
+
+
+def rename(root):
+    (root / "guide" / "intro.md").rename(root / "guide" / "start.md")
+
+
+def rename_directory(root):
+    (root / "guide").rename(root / "manual")
+
+
+def add_directory(root):
+    (root / "extra" / "deep").mkdir(parents=True)
+    (root / "extra" / "deep" / "index.md").write_text("# Deep\n\n[up](../../a.md)\n")
+
+
+def delete_directory(root):
+    for path in (root / "guide").iterdir():
+        path.unlink()
+    (root / "guide").rmdir()
+
+
+def make_docs(root):
+    (root / "guide").mkdir(parents=True)
+    (root / "a.md").write_text(FRONT_MATTER + "# A\n\n## Part\n\n[b](b.md#section)\n")
+    (root / "b.md").write_text(FRONT_MATTER + "# B\n\n## Section\n\n[i](guide/intro.md)\n")
+    (root / "guide" / "intro.md").write_text(FRONT_MATTER + "# Intro\n\n[a](../a.md#part)\n")
+    (root / "guide" / "image.png").write_bytes(b"png")
+
+
+def issues(root, index):
+    return [issue.to_dict() for issue in validate_docs(str(root), index).issues]
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def watcher_factory(request):
+    if request.param == "inotify":
+        return InotifyWatcher
+    return lambda root: PollingWatcher(root, interval=0.01)
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        [edit],
+        [add],
+        [delete],
+        [rename],
+        [rename_directory],
+        [add_directory],
+        [delete_directory],
+        [edit, add, delete, rename_directory],
+    ],
+    ids=lambda changes: "+".join(change.__name__ for change in changes),
+)
+def test_refresh_matches_build(tmp_path, watcher_factory, changes):
+    root = tmp_path / "docs"
+    make_docs(root)
+    index = DocumentIndex.build(str(root))
+    try:
+        watcher = watcher_factory(root)
+    except OSError as e:
+        pytest.skip(f"Watcher unavailable: {str(e)}")
+
+    with watcher:
+        for change in changes:
+            change(root)
+        changed = set()
+        while True:
+            batch = watcher.changes(timeout=0.2)
+            if not batch:
+                break
+            changed |= batch
+
+    index.refresh(changed)
+    fresh = DocumentIndex.build(str(root))
+    assert index.documents == fresh.documents
+    assert list(index.documents) == list(fresh.documents)
+    assert index.files == fresh.files
+    assert index.directories == fresh.directories
+    assert issues(root, index) == issues(root, fresh)